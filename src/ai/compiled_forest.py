@@ -0,0 +1,184 @@
+import json
+import os
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Arrays written by ``CompiledForest.save``, one ``.npy`` file each
+ARRAY_NAMES = ('feature', 'threshold', 'left', 'leaf_proba', 'roots',
+               'mean', 'scale', 'classes')
+# Rows per vectorized walk (keeps the working set cache-sized) and how
+# often finished (tree, row) pairs are dropped from it
+BATCH_CHUNK_ROWS = 1024
+COMPACT_EVERY = 4
+
+
+def _sibling_order(children_left: np.ndarray,
+                   children_right: np.ndarray) -> np.ndarray:
+    """Breadth-first node order in which every right child directly
+    follows its left sibling."""
+    order = [0]
+    for node in order:
+        if children_left[node] >= 0:
+            order.append(children_left[node])
+            order.append(children_right[node])
+    return np.array(order, dtype=np.intp)
+
+
+class CompiledForest:
+    """
+    A fitted ``RandomForestClassifier`` (plus its ``StandardScaler``)
+    flattened into contiguous NumPy arrays. All trees' nodes share one
+    index space, numbered so the right child is ``left[n] + 1``, and
+    leaves point to themselves with an infinite threshold. A batch thus
+    walks every tree at once with ``node = left[node] + (x > threshold)``
+    steps, periodically dropping finished (tree, row) pairs.
+
+    Results equal sklearn's: inputs are scaled in float64, cast to
+    float32 before the threshold tests, and per-tree probabilities are
+    accumulated in tree order before dividing by the tree count.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray,
+                 left: np.ndarray, leaf_proba: np.ndarray,
+                 roots: np.ndarray, mean: np.ndarray, scale: np.ndarray,
+                 classes: np.ndarray, max_depth: int,
+                 feature_names: Sequence[str]) -> None:
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.mean = mean
+        self.scale = scale
+        self.classes = classes
+        self.max_depth = max_depth
+        self.feature_names: List[str] = list(feature_names)
+
+    @classmethod
+    def from_sklearn(cls, forest: Any, scaler: Any,
+                     feature_names: Sequence[str]) -> 'CompiledForest':
+        """Exports a fitted forest and scaler."""
+        features, thresholds, lefts, probas, roots = [], [], [], [], []
+        offset, max_depth = 0, 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            order = _sibling_order(tree.children_left, tree.children_right)
+            new_id = np.empty_like(order)
+            new_id[order] = np.arange(len(order)) + offset
+            children_left = tree.children_left[order]
+            is_leaf = children_left < 0
+            lefts.append(np.where(is_leaf, new_id[order],
+                                  new_id[np.maximum(children_left, 0)]))
+            features.append(np.where(is_leaf, 0, tree.feature[order]))
+            thresholds.append(np.where(is_leaf, np.inf,
+                                       tree.threshold[order]))
+            value = tree.value[order, 0, :forest.n_classes_]
+            sums = value.sum(axis=1, keepdims=True)
+            if not np.allclose(sums[is_leaf], 1.0):
+                # Older sklearn stores class counts and normalizes them
+                # in ``predict_proba``
+                value = value / np.where(sums == 0.0, 1.0, sums)
+            probas.append(value)
+            roots.append(offset)
+            offset += len(order)
+            max_depth = max(max_depth, tree.max_depth)
+        return cls(feature=np.concatenate(features).astype(np.intp),
+                   threshold=np.concatenate(thresholds).astype(np.float64),
+                   left=np.concatenate(lefts).astype(np.intp),
+                   leaf_proba=np.ascontiguousarray(
+                       np.concatenate(probas), dtype=np.float64),
+                   roots=np.array(roots, dtype=np.intp),
+                   mean=np.asarray(scaler.mean_, dtype=np.float64),
+                   scale=np.asarray(scaler.scale_, dtype=np.float64),
+                   classes=np.asarray(forest.classes_),
+                   max_depth=int(max_depth),
+                   feature_names=feature_names)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        """Leaf node index per (tree, row) of float32-valued ``X``."""
+        feature, threshold, left = self.feature, self.threshold, self.left
+        if len(X) == 1:
+            row = X[0]
+            node = self.roots.copy()
+            for _ in range(self.max_depth):
+                node = left[node] + (row[feature[node]] > threshold[node])
+            return node[:, None]
+        if len(X) == 0:
+            return np.empty((self.n_trees, 0), dtype=np.intp)
+        return np.concatenate([self._walk(X[start:start + BATCH_CHUNK_ROWS])
+                               for start in range(0, len(X),
+                                                  BATCH_CHUNK_ROWS)],
+                              axis=1)
+
+    def _walk(self, X: np.ndarray) -> np.ndarray:
+        feature, threshold, left = self.feature, self.threshold, self.left
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        node = np.repeat(self.roots, n_rows)
+        out = node.copy()
+        # Active (tree, row) pairs: output slot and offset of the row
+        pos = np.arange(len(node))
+        row_base = np.tile(np.arange(n_rows) * n_features, self.n_trees)
+        step = 0
+        while len(node):
+            nxt = left[node] + (flat[row_base + feature[node]]
+                                > threshold[node])
+            step += 1
+            if step % COMPACT_EVERY == 0:
+                done = nxt == node
+                out[pos[done]] = node[done]
+                keep = ~done
+                pos, row_base, nxt = pos[keep], row_base[keep], nxt[keep]
+            node = nxt
+        return out.reshape(self.n_trees, n_rows)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities for a 2D array of unscaled features."""
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(self.mean))
+        # Same rounding as sklearn: float64 scaling, float32 tree inputs
+        X32 = ((X - self.mean) / self.scale).astype(np.float32)
+        leaves = self._leaves(X32.astype(np.float64))
+        # Trees are added one by one in order, like sklearn's forest
+        if len(X) < self.n_trees:
+            proba = np.cumsum(self.leaf_proba[leaves], axis=0)[-1]
+        else:
+            proba = np.zeros((len(X), self.leaf_proba.shape[1]))
+            for tree_leaves in leaves:
+                proba += self.leaf_proba[tree_leaves]
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """:return: (predicted class per row, class probabilities)"""
+        proba = self.predict_proba(X)
+        return self.classes[np.argmax(proba, axis=1)], proba
+
+    def save(self, directory: str) -> None:
+        """Writes one ``.npy`` per array plus ``meta.json``."""
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(directory, f"{name}.npy"),
+                    getattr(self, name), allow_pickle=False)
+        with open(os.path.join(directory, 'meta.json'), 'w') as f:
+            json.dump({'max_depth': self.max_depth,
+                       'feature_names': self.feature_names}, f)
+
+    @classmethod
+    def load(cls, directory: str,
+             mmap_mode: Optional[str] = None) -> 'CompiledForest':
+        """
+        Loads a saved forest without unpickling.
+        :param mmap_mode: e.g. ``'r'`` to memory-map the arrays
+        """
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"),
+                                mmap_mode=mmap_mode, allow_pickle=False)
+                  for name in ARRAY_NAMES}
+        return cls(max_depth=meta['max_depth'],
+                   feature_names=meta['feature_names'], **arrays)
@@ -0,0 +1,187 @@
+import copy
+from typing import (Any, Callable, Dict, Iterable, List, Mapping, NamedTuple,
+                    Optional)
+
+import numpy as np
+import pandas as pd
+
+from src.data_ingestion.indicators import (IncrementalIndicators,
+                                           compute_indicators)
+
+
+class FeatureSpec(NamedTuple):
+    """
+    One model input. ``inputs`` names the intermediate series it needs
+    (``close``, ``volume``, ``prev_close``, ``prev_volume``, an
+    indicator column or an order book metric) and ``compute`` combines
+    them. The same expression runs on whole arrays in batch mode and on
+    scalars in incremental mode, so both produce identical values.
+    """
+    name: str
+    inputs: tuple
+    compute: Callable[..., Any]
+
+
+def _ratio_change(value: Any, prev: Any) -> Any:
+    return value / prev - 1.0
+
+
+# Registry of known features; a pipeline keeps the order it is given
+FEATURES: Dict[str, FeatureSpec] = {spec.name: spec for spec in (
+    FeatureSpec('price_change', ('close', 'prev_close'), _ratio_change),
+    FeatureSpec('volume_change', ('volume', 'prev_volume'), _ratio_change),
+    FeatureSpec('sma_ratio', ('close', 'sma_20'), _ratio_change),
+    FeatureSpec('rsi', ('rsi_14',), lambda r: r / 100.0),
+    FeatureSpec('macd_hist', ('macd_hist', 'close'), lambda h, c: h / c),
+    FeatureSpec('ob_spread', ('spread',), lambda s: s),
+    FeatureSpec('ob_imbalance', ('imbalance',), lambda i: i),
+)}
+DEFAULT_FEATURES = ('price_change', 'volume_change')
+ORDER_BOOK_INPUTS = ('spread', 'imbalance')
+INDICATOR_INPUTS = ('sma_20', 'rsi_14', 'macd', 'macd_signal', 'macd_hist')
+
+
+def _clean(value: Any) -> Any:
+    """Undefined values (warm-up, missing data) become 0.0."""
+    if isinstance(value, np.ndarray):
+        return np.where(np.isfinite(value), value, 0.0)
+    return float(value) if np.isfinite(value) else 0.0
+
+
+class FeaturePipeline:
+    """
+    Declarative feature pipeline shared by training and live inference.
+
+    Batch mode (``transform_batch``) turns a bar history into the
+    training matrix; incremental mode (``update_bar`` for each closed
+    bar, ``transform_tick`` for the still-open one) yields the same
+    columns for one row. Intermediates such as indicators are computed
+    once per call and rows are cached per bar key, so the model,
+    strategy and monitor share one computation per bar.
+    """
+
+    def __init__(self, features: Iterable[str] = DEFAULT_FEATURES) -> None:
+        self.columns: List[str] = list(features)
+        unknown = [f for f in self.columns if f not in FEATURES]
+        if unknown:
+            raise ValueError(f"Unknown features: {unknown}")
+        self.specs = [FEATURES[f] for f in self.columns]
+        inputs = {i for spec in self.specs for i in spec.inputs}
+        self._needs_indicators = bool(inputs & set(INDICATOR_INPUTS))
+        self._indicators: Optional[IncrementalIndicators] = None
+        self._last_close = float('nan')
+        self._last_volume = float('nan')
+        self._row_key: Any = None
+        self._row: Optional[Dict[str, float]] = None
+        self._batch_source: Optional[pd.DataFrame] = None
+        self._batch_key: Any = None
+        self._batch: Optional[pd.DataFrame] = None
+
+    @staticmethod
+    def supports(features: Iterable[str]) -> bool:
+        return all(f in FEATURES for f in features)
+
+    def _evaluate(self, values: Mapping[str, Any]) -> Dict[str, Any]:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return {spec.name: _clean(spec.compute(
+                *(values[i] for i in spec.inputs))) for spec in self.specs}
+
+    def transform_batch(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Batch mode: one feature row per bar of ``bars`` (``close`` and
+        ``volume`` columns; optional ``spread``/``imbalance`` columns for
+        order book features, 0.0 otherwise). The result for the most
+        recent history is cached.
+        """
+        key = (len(bars), bars.index[-1] if len(bars) else None)
+        if bars is self._batch_source and key == self._batch_key and \
+                self._batch is not None:
+            return self._batch
+        close = bars['close'].to_numpy(dtype=np.float64)
+        volume = bars['volume'].to_numpy(dtype=np.float64)
+        values: Dict[str, Any] = {
+            'close': close, 'volume': volume,
+            'prev_close': np.concatenate(([np.nan], close[:-1])),
+            'prev_volume': np.concatenate(([np.nan], volume[:-1])),
+        }
+        if self._needs_indicators:
+            values.update(compute_indicators(close))
+        for name in ORDER_BOOK_INPUTS:
+            values[name] = bars[name].to_numpy(dtype=np.float64) \
+                if name in bars else np.zeros(len(bars))
+        frame = pd.DataFrame(self._evaluate(values), index=bars.index,
+                             columns=self.columns)
+        self._batch_source, self._batch_key, self._batch = bars, key, frame
+        return frame
+
+    def warm_start(self, bars: pd.DataFrame) -> None:
+        """Primes incremental mode with the closed bars of ``bars``."""
+        close = bars['close'].to_numpy(dtype=np.float64)
+        if self._needs_indicators:
+            self._indicators = IncrementalIndicators.from_history(close)
+        if len(bars):
+            self._last_close = float(close[-1])
+            self._last_volume = float(bars['volume'].iloc[-1])
+        self._row_key = self._row = None
+
+    def _values(self, close: float, volume: float,
+                order_book_metrics: Optional[Mapping[str, Any]],
+                indicators: Optional[Dict[str, float]]) -> Dict[str, Any]:
+        values: Dict[str, Any] = {
+            'close': float(close), 'volume': float(volume),
+            'prev_close': self._last_close,
+            'prev_volume': self._last_volume,
+        }
+        if indicators is not None:
+            values.update(indicators)
+        metrics = order_book_metrics or {}
+        for name in ORDER_BOOK_INPUTS:
+            value = metrics.get(name)
+            values[name] = float(value) if value is not None else 0.0
+        # NumPy scalars follow the batch arithmetic (x / 0 -> inf, not an
+        # exception), keeping both modes identical
+        return {k: np.float64(v) for k, v in values.items()}
+
+    def transform_tick(self, close: float, volume: float,
+                       order_book_metrics: Optional[
+                           Mapping[str, Any]] = None,
+                       key: Any = None) -> Dict[str, float]:
+        """
+        Incremental mode for the open bar: features as if the current
+        bar closed at ``close``, without advancing the state.
+        :param key: Cache key (e.g. a cycle id or tick timestamp); later
+                    calls with the same key return the cached row
+        """
+        if key is not None and key == self._row_key and self._row:
+            return self._row
+        indicators = None
+        if self._needs_indicators:
+            state = copy.deepcopy(self._indicators or IncrementalIndicators())
+            indicators = state.update(close)
+        row = self._evaluate(self._values(close, volume,
+                                          order_book_metrics, indicators))
+        self._row_key, self._row = key, row
+        return row
+
+    def update_bar(self, close: float, volume: float,
+                   order_book_metrics: Optional[Mapping[str, Any]] = None
+                   ) -> Dict[str, float]:
+        """
+        Incremental mode for a closed bar: returns its features (equal
+        to the last ``transform_batch`` row over the same history) and
+        advances the state.
+        """
+        indicators = None
+        if self._needs_indicators:
+            if self._indicators is None:
+                self._indicators = IncrementalIndicators()
+            indicators = self._indicators.update(close)
+        row = self._evaluate(self._values(close, volume,
+                                          order_book_metrics, indicators))
+        self._last_close, self._last_volume = float(close), float(volume)
+        self._row_key = self._row = None
+        return row
+
+    def to_array(self, row: Mapping[str, float]) -> np.ndarray:
+        """One row as a 1 x n array in column order (``predict_batch``)."""
+        return np.array([[row[c] for c in self.columns]])
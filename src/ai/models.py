@@ -1,58 +1,195 @@
-from typing import Dict
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-import joblib   # type: ignore
-from src.data_ingestion import get_order_book_metrics
+from src.ai.compiled_forest import CompiledForest
+
+# Order book enrichment columns -> key in ``get_order_book_metrics``
+ORDER_BOOK_FEATURES = {'ob_spread': 'spread', 'ob_imbalance': 'imbalance'}
+
+OrderBookMetrics = Union[Mapping[str, Any], Sequence[Mapping[str, Any]]]
 
 
 class AIModel:
-    def __init__(self):
-        self.model = RandomForestClassifier(n_estimators=100, random_state=42)
-        self.scaler = StandardScaler()
+    def __init__(self, model_params: Optional[Mapping[str, Any]] = None):
+        """
+        :param model_params: ``RandomForestClassifier`` overrides, e.g.
+                             ``best_params`` from ``src.ai.training.search``
+        """
+        # scikit-learn is imported on first use, so serving a compiled
+        # model never loads it
+        self._model_params = {'n_estimators': 100, 'random_state': 42,
+                              **(model_params or {})}
+        self._model: Any = None
+        self._scaler: Any = None
+        self.feature_names: List[str] = []
+        self.compiled: Optional[CompiledForest] = None
         self.is_trained = False
+        # Guards swaps of the fitted state against concurrent predictions
+        self._swap_lock = threading.Lock()
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            from sklearn.ensemble import RandomForestClassifier
+            self._model = RandomForestClassifier(**self._model_params)
+        return self._model
+
+    @model.setter
+    def model(self, value: Any) -> None:
+        self._model = value
+
+    @property
+    def scaler(self) -> Any:
+        if self._scaler is None:
+            from sklearn.preprocessing import StandardScaler
+            self._scaler = StandardScaler()
+        return self._scaler
+
+    @scaler.setter
+    def scaler(self, value: Any) -> None:
+        self._scaler = value
 
     def train(self, X_train: pd.DataFrame,
-              y_train: pd.Series) -> None:  # type: ignore
-        """Trains the AI Model"""
+              y_train: pd.Series,  # type: ignore
+              feature_names: Optional[Sequence[str]] = None) -> None:
+        """
+        Trains the AI Model
+        :param feature_names: Column names when ``X_train`` is an array
+        """
         print("Training AI model...")
-        X_scaled = self.scaler.fit_transform(X_train)  # type: ignore
+        if feature_names is not None:
+            self.feature_names = list(feature_names)
+        elif isinstance(X_train, pd.DataFrame):
+            self.feature_names = [str(c) for c in X_train.columns]
+        else:
+            self.feature_names = [f"f{i}" for i in
+                                  range(np.shape(X_train)[1])]
+        X = np.asarray(X_train, dtype=np.float64)
+        X_scaled = self.scaler.fit_transform(X)  # type: ignore
         self.model.fit(X_scaled, y_train)  # type: ignore[arg-type]
+        self.compile()
         self.is_trained = True  # Model is now trained
         print("AI model training complete.")
 
-    def predict(self, feat: Dict[str, float],
-                symbol: str = 'BTCUSDT') -> int:
+    def _feature_matrix(self, X: Any,
+                        order_book_metrics: Optional[OrderBookMetrics]
+                        ) -> np.ndarray:
+        if isinstance(X, np.ndarray):
+            return np.asarray(X, dtype=np.float64).reshape(
+                -1, len(self.feature_names))
+        # DataFrame or columnar mapping of feature name -> values
+        columns = {name: X[name] for name in self.feature_names
+                   if name not in ORDER_BOOK_FEATURES or name in X}
+        n_rows = len(next(iter(columns.values()))) if columns else 1
+        if isinstance(order_book_metrics, Mapping):
+            order_book_metrics = [order_book_metrics] * n_rows
+        out = np.empty((n_rows, len(self.feature_names)))
+        for j, name in enumerate(self.feature_names):
+            if name in columns:
+                out[:, j] = np.asarray(columns[name], dtype=np.float64)
+            elif order_book_metrics is not None:
+                key = ORDER_BOOK_FEATURES[name]
+                out[:, j] = [m.get(key) or 0.0 for m in order_book_metrics]
+            else:
+                out[:, j] = 0.0
+        return out
+
+    def predict_batch(self, X: Any,
+                      order_book_metrics: Optional[OrderBookMetrics] = None
+                      ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predicts many rows (or symbols) in one call, without building
+        DataFrames or fetching data.
+        :param X: 2D array with columns in ``feature_names`` order, or a
+                  DataFrame / mapping of feature name -> column
+        :param order_book_metrics: Caller-supplied metrics (one dict for
+                                   all rows or one per row) for models
+                                   trained with ``ob_*`` features
+        :return: (predicted class per row, class probabilities per row)
         """
-        Makes a prediction based on input features
-        and order book analytics."""
         if not self.is_trained:
             raise Exception("Model is not trained yet.  \
                 Please train the model before prediction.")
-        # Optionally enrich features with order book metrics
-        ob_mets = get_order_book_metrics(symbol)
-        feat = {
-            **feat,
-            'ob_spread': (ob_mets['spread'] or 0.0),
-            'ob_imbalance': (ob_mets['imbalance'] or 0.0)
-        }
-        X = pd.DataFrame([feat])
-        X_scaled = self.scaler.transform(X)  # type: ignore
-        prediction = self.model.predict(X_scaled)  # type: ignore
+        with self._swap_lock:
+            compiled, model, scaler = self.compiled, self.model, self.scaler
+            X = self._feature_matrix(X, order_book_metrics)
+        if compiled is not None:
+            return compiled.predict(X)
+        X_scaled = (X - scaler.mean_) / scaler.scale_
+        proba = model.predict_proba(X_scaled)  # type: ignore
+        return model.classes_[np.argmax(proba, axis=1)], proba
+
+    def swap_from(self, other: 'AIModel') -> None:
+        """
+        Atomically replaces this model's fitted state with ``other``'s;
+        predictions in flight finish on the previous version.
+        """
+        with self._swap_lock:
+            self._model_params = dict(other._model_params)
+            self._model = other._model
+            self._scaler = other._scaler
+            self.feature_names = list(other.feature_names)
+            self.compiled = other.compiled
+            self.is_trained = other.is_trained
+
+    def predict(self, feat: Dict[str, float],
+                order_book_metrics: Optional[Mapping[str, Any]] = None
+                ) -> int:
+        """
+        Makes a prediction based on input features
+        and caller-supplied order book analytics."""
+        row = {name: [feat[name]] for name in self.feature_names
+               if name in feat}
+        prediction, _ = self.predict_batch(row, order_book_metrics)
         return int(prediction[0])  # Return the single prediction
 
+    def compile(self) -> CompiledForest:
+        """
+        Flattens the fitted forest and scaler into a ``CompiledForest``,
+        which then serves ``predict``/``predict_batch`` with identical
+        results and far less per-call overhead.
+        """
+        self.compiled = CompiledForest.from_sklearn(
+            self.model, self.scaler, self.feature_names)
+        return self.compiled
+
+    def export_compiled(self, directory: str = 'ai_model_compiled') -> None:
+        """Saves the compiled model as plain ``.npy`` arrays."""
+        (self.compiled or self.compile()).save(directory)
+        print(f"Compiled AI model exported to {directory}")
+
+    def load_compiled(self, directory: str = 'ai_model_compiled',
+                      mmap_mode: Optional[str] = None) -> None:
+        """
+        Loads an exported compiled model for inference only, without
+        unpickling the sklearn objects.
+        :param mmap_mode: e.g. ``'r'`` to memory-map the arrays
+        """
+        self.compiled = CompiledForest.load(directory, mmap_mode=mmap_mode)
+        self.feature_names = list(self.compiled.feature_names)
+        self.is_trained = True
+        print(f"Compiled AI model loaded from {directory}")
+
     def save_model(self, path: str = 'ai_model.joblib') -> None:
         """Save the trained model."""
+        import joblib  # type: ignore
         joblib.dump({'model': self.model,  # type: ignore
-                     'scaler': self.scaler}, path)
+                     'scaler': self.scaler,
+                     'feature_names': self.feature_names}, path)
         print(f"AI model saved to {path}")  # Model saved
 
     def load_model(self, path: str = 'ai_model.joblib') -> None:
         """Loads a pre-trained model."""
         try:
+            import joblib  # type: ignore
             data = joblib.load(path)  # type: ignore[no-untyped-call]
             self.model = data['model']
             self.scaler = data['scaler']
+            self.feature_names = list(data.get('feature_names') or getattr(
+                self.scaler, 'feature_names_in_',
+                [f"f{i}" for i in range(self.scaler.n_features_in_)]))
+            self.compile()
             self.is_trained = True
             print(f"AI model loaded from {path}")  # Model loaded
         except Exception:
@@ -0,0 +1,123 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Mapping, Optional, Sequence
+
+import numpy as np
+
+from src.ai.models import AIModel
+
+
+class OnlineTrainer:
+    """
+    Keeps an ``AIModel`` current with rolling-window refits.
+
+    Closed-bar samples go into a fixed-size ring buffer (the newest
+    ``window`` rows), so memory is bounded and every refit trains on at
+    most ``window`` rows. Every ``refit_every`` samples a fresh model is
+    fitted on a background thread and swapped into the live model
+    atomically with ``AIModel.swap_from``. Predictions keep using the
+    previous version until then, so the trading loop never waits.
+    """
+
+    def __init__(self, model: AIModel, window: int = 1000,
+                 refit_every: int = 24, min_samples: int = 100,
+                 model_params: Optional[Mapping[str, Any]] = None) -> None:
+        if not model.feature_names:
+            raise ValueError("OnlineTrainer needs a trained model "
+                             "(feature schema)")
+        self.model = model
+        self.window = window
+        self.refit_every = refit_every
+        self.min_samples = min_samples
+        self.model_params = dict(model_params) if model_params is not None \
+            else model.model.get_params()
+        self.feature_names = list(model.feature_names)
+        n = len(self.feature_names)
+        self._X = np.zeros((window, n))
+        self._y = np.zeros(window, dtype=np.int64)
+        self._head = 0
+        self._count = 0
+        self._since_refit = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix='OnlineRefit')
+        self._pending: Optional['Future[None]'] = None
+        self.version = 0
+        self.last_refit_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _row(self, features: Any) -> np.ndarray:
+        if isinstance(features, Mapping):
+            return np.array([features[name] for name in self.feature_names],
+                            dtype=np.float64)
+        return np.asarray(features, dtype=np.float64).reshape(-1)
+
+    def _push(self, row: np.ndarray, label: int) -> None:
+        self._X[self._head] = row
+        self._y[self._head] = label
+        self._head = (self._head + 1) % self.window
+        self._count = min(self._count + 1, self.window)
+
+    def seed(self, X: Any, y: Sequence[int]) -> None:
+        """Fills the window with historical samples (newest last)."""
+        X = np.asarray(X, dtype=np.float64)[-self.window:]
+        y = np.asarray(y)[-self.window:]
+        with self._lock:
+            for row, label in zip(X, y):
+                self._push(row, int(label))
+
+    def add_sample(self, features: Any, label: int) -> bool:
+        """
+        Adds one closed-bar sample (feature dict or row in schema order).
+        :return: True if this sample scheduled a background refit
+        """
+        with self._lock:
+            self._push(self._row(features), int(label))
+            self._since_refit += 1
+            due = self._since_refit >= self.refit_every
+        return self.refit() is not None if due else False
+
+    def _window(self):  # type: ignore
+        with self._lock:
+            order = (np.arange(self._count) + self._head - self._count) \
+                % self.window
+            return self._X[order].copy(), self._y[order].copy()
+
+    def _refit(self) -> None:
+        started = time.perf_counter()
+        try:
+            X, y = self._window()
+            candidate = AIModel(model_params=self.model_params)
+            candidate.train(X, y, feature_names=self.feature_names)
+            self.model.swap_from(candidate)
+            self.version += 1
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Online refit failed: {e}")
+        finally:
+            self.last_refit_seconds = time.perf_counter() - started
+
+    def refit(self) -> Optional['Future[None]']:
+        """
+        Schedules a refit on the current window unless one is running,
+        there are too few samples or only one class.
+        :return: the refit future, or None when nothing was scheduled
+        """
+        with self._lock:
+            if self._pending is not None and not self._pending.done():
+                return None
+            labels = self._y[:self._count]
+            if self._count < self.min_samples or \
+                    len(np.unique(labels)) < 2:
+                return None
+            self._since_refit = 0
+            self._pending = self._executor.submit(self._refit)
+            return self._pending
+
+    def close(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
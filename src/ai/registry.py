@@ -0,0 +1,223 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional
+
+if TYPE_CHECKING:
+    from src.ai.models import AIModel
+
+MANIFEST_FILE = 'manifest.json'
+ACTIVE_FILE = 'ACTIVE'
+COMPILED_DIR = 'compiled'
+SKLEARN_FILE = 'model.joblib'
+
+
+class ModelRegistryError(Exception):
+    """A model version is missing, corrupt or incompatible."""
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Versioned model artifacts under ``root``: ``v<N>/`` holds the
+    compiled forest as ``.npy`` arrays, the sklearn model (for
+    retraining) and ``manifest.json`` with the feature schema, training
+    range, metrics and a SHA-256 checksum per file. Versions are
+    immutable once published; ``ACTIVE`` names the one processes load.
+
+    Loading memory-maps the compiled arrays read-only, so every bot
+    process serving a version shares one physical copy through the page
+    cache. ``swap`` hot-swaps the model attached with ``serve``.
+    """
+
+    def __init__(self, root: str = 'models') -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        self._served: Optional['AIModel'] = None
+        self.served_version: Optional[int] = None
+
+    def _dir(self, version: int) -> str:
+        return os.path.join(self.root, f"v{version}")
+
+    def versions(self) -> List[int]:
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return sorted(int(name[1:]) for name in names
+                      if name.startswith('v') and name[1:].isdigit())
+
+    def register(self, model: 'AIModel',
+                 training_range: Optional[Mapping[str, Any]] = None,
+                 metrics: Optional[Mapping[str, float]] = None,
+                 activate: bool = True) -> int:
+        """
+        Publishes a trained model as the next version.
+        :param training_range: e.g. ``{'start': ..., 'end': ..., 'rows': n}``
+        :return: the new version number
+        """
+        if not model.is_trained:
+            raise ModelRegistryError("Cannot register an untrained model")
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=self.root)
+        try:
+            (model.compiled or model.compile()).save(
+                os.path.join(staging, COMPILED_DIR))
+            if hasattr(model.model, 'estimators_'):  # fitted sklearn model
+                import joblib  # type: ignore
+                joblib.dump({'model': model.model,  # type: ignore
+                             'scaler': model.scaler,
+                             'feature_names': model.feature_names},
+                            os.path.join(staging, SKLEARN_FILE))
+            files = {}
+            for dirpath, _, filenames in os.walk(staging):
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    rel = os.path.relpath(path, staging).replace(os.sep, '/')
+                    files[rel] = _sha256(path)
+            params = {k: v for k, v in model.model.get_params().items()
+                      if isinstance(v, (bool, int, float, str, type(None)))}
+            manifest = {
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ',
+                                            time.gmtime()),
+                'feature_names': list(model.feature_names),
+                'training_range': dict(training_range or {}),
+                'metrics': dict(metrics or {}),
+                'params': params,
+                'files': files,
+            }
+            with open(os.path.join(staging, MANIFEST_FILE), 'w') as f:
+                json.dump(manifest, f, indent=2, default=str)
+            # Renaming onto an existing version fails, so concurrent
+            # writers each get their own number
+            while True:
+                version = max(self.versions(), default=0) + 1
+                try:
+                    os.rename(staging, self._dir(version))
+                    break
+                except OSError:
+                    if not os.path.exists(self._dir(version)):
+                        raise
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        print(f"AI model registered as version {version} in {self.root}")
+        if activate:
+            self.activate(version)
+        return version
+
+    def manifest(self, version: int) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self._dir(version), MANIFEST_FILE)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ModelRegistryError(
+                f"Model version {version} has no readable manifest: {e}"
+            ) from e
+        return {'version': version, **manifest}
+
+    def verify(self, version: int) -> Dict[str, Any]:
+        """Checks every file against its manifest checksum."""
+        manifest = self.manifest(version)
+        for name, expected in manifest['files'].items():
+            path = os.path.join(self._dir(version), name)
+            if not os.path.isfile(path) or _sha256(path) != expected:
+                raise ModelRegistryError(
+                    f"Checksum mismatch for {name} in model version "
+                    f"{version}")
+        return manifest
+
+    def active_version(self) -> Optional[int]:
+        try:
+            with open(os.path.join(self.root, ACTIVE_FILE)) as f:
+                return int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def activate(self, version: int) -> None:
+        """Points ``ACTIVE`` at ``version`` (atomic replace)."""
+        self.manifest(version)
+        path = os.path.join(self.root, ACTIVE_FILE)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(f"{version}\n")
+        os.replace(tmp, path)
+
+    def load(self, version: Optional[int] = None, verify: bool = True,
+             mmap_mode: Optional[str] = 'r') -> 'AIModel':
+        """
+        Loads a version (default: the active one) for inference from the
+        compiled arrays, without unpickling the sklearn model.
+        :param mmap_mode: ``None`` to read the arrays into private memory
+        """
+        if version is None:
+            version = self.active_version()
+            if version is None:
+                raise ModelRegistryError(
+                    f"No active model version in {self.root}")
+        from src.ai.models import AIModel
+        manifest = self.verify(version) if verify \
+            else self.manifest(version)
+        model = AIModel(model_params=manifest.get('params'))
+        try:
+            model.load_compiled(os.path.join(self._dir(version),
+                                             COMPILED_DIR),
+                                mmap_mode=mmap_mode)
+        except (OSError, ValueError, KeyError) as e:
+            raise ModelRegistryError(
+                f"Could not load model version {version}: {e}") from e
+        if model.feature_names != manifest['feature_names']:
+            raise ModelRegistryError(
+                f"Model version {version} does not match its manifest "
+                "feature schema")
+        return model
+
+    def serve(self, model: Optional['AIModel'],
+              version: Optional[int] = None) -> None:
+        """Attaches the live model that ``swap`` updates in place."""
+        with self._lock:
+            self._served = model
+            self.served_version = version
+
+    def swap(self, version: Optional[int] = None,
+             verify: bool = True) -> Dict[str, Any]:
+        """
+        Hot-swaps the served model to ``version`` (default: the active
+        one) and makes it active. Predictions in flight finish on the
+        previous version; the feature schema must not change.
+        :return: the manifest of the version now served
+        """
+        with self._lock:
+            if self._served is None:
+                raise ModelRegistryError("No running model to swap")
+            if version is None:
+                version = self.active_version()
+                if version is None:
+                    raise ModelRegistryError(
+                        f"No active model version in {self.root}")
+            loaded = self.load(version, verify=verify)
+            if self._served.feature_names and \
+                    loaded.feature_names != self._served.feature_names:
+                raise ModelRegistryError(
+                    f"Model version {version} uses features "
+                    f"{loaded.feature_names}, the running model "
+                    f"{self._served.feature_names}")
+            self._served.swap_from(loaded)
+            self.served_version = version
+            self.activate(version)
+        return self.manifest(version)
+
+
+# Registry shared by the trading loop and the API server
+model_registry = ModelRegistry(os.getenv('MODEL_REGISTRY_DIR', 'models'))
@@ -0,0 +1,234 @@
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, \
+    Tuple
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, log_loss
+
+# A split is (train ranges, test range) of [start, end) row positions,
+# so tasks carry a few integers instead of index arrays.
+Range = Tuple[int, int]
+Split = Tuple[List[Range], Range]
+
+DEFAULT_PARAM_GRID: Dict[str, List[Any]] = {
+    'n_estimators': [100, 200],
+    'max_depth': [None, 8, 16],
+    'min_samples_leaf': [1, 5],
+}
+
+
+def walk_forward_splits(n_samples: int, n_splits: int = 5,
+                        min_train: Optional[int] = None,
+                        embargo: int = 0) -> List[Split]:
+    """
+    Expanding-window walk-forward splits: each fold trains on all rows
+    before its test block (minus ``embargo`` rows next to it) and tests
+    on the following block.
+    """
+    min_train = min_train or n_samples // (n_splits + 1)
+    test_size = (n_samples - min_train) // n_splits
+    if test_size < 1:
+        raise ValueError("Not enough samples for the requested splits")
+    splits = []
+    for k in range(n_splits):
+        test_start = min_train + k * test_size
+        test_end = n_samples if k == n_splits - 1 \
+            else test_start + test_size
+        splits.append(([(0, max(test_start - embargo, 0))],
+                       (test_start, test_end)))
+    return splits
+
+
+def purged_kfold_splits(n_samples: int, n_splits: int = 5, purge: int = 0,
+                        embargo: int = 0) -> List[Split]:
+    """
+    Purged K-fold for time series: contiguous test blocks; training rows
+    within ``purge`` rows before a block (overlapping labels) and
+    ``embargo`` rows after it (serial correlation) are dropped.
+    """
+    bounds = np.linspace(0, n_samples, n_splits + 1).astype(int)
+    splits = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        train = [(0, max(int(start) - purge, 0)),
+                 (min(int(end) + embargo, n_samples), n_samples)]
+        splits.append(([r for r in train if r[1] > r[0]],
+                       (int(start), int(end))))
+    return splits
+
+
+def grid_candidates(grid: Mapping[str, Sequence[Any]]
+                    ) -> List[Dict[str, Any]]:
+    keys = list(grid)
+    return [dict(zip(keys, values))
+            for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def random_candidates(space: Mapping[str, Sequence[Any]], n_iter: int,
+                      seed: int = 0) -> List[Dict[str, Any]]:
+    """Samples ``n_iter`` distinct candidates from a parameter grid."""
+    candidates = grid_candidates(space)
+    return random.Random(seed).sample(candidates,
+                                      min(n_iter, len(candidates)))
+
+
+class SharedArray:
+    """
+    A NumPy array in ``multiprocessing.shared_memory`` that workers
+    attach to by name, so the matrix is never pickled per task.
+    """
+
+    def __init__(self, array: np.ndarray) -> None:
+        array = np.ascontiguousarray(array)
+        self.shm = shared_memory.SharedMemory(create=True,
+                                              size=max(array.nbytes, 1))
+        self.spec = (self.shm.name, array.shape, array.dtype.str)
+        np.ndarray(array.shape, array.dtype, buffer=self.shm.buf)[:] = array
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> 'SharedArray':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+# Worker-side attachments, set up once per process by ``_attach``
+_worker_arrays: Dict[str, np.ndarray] = {}
+_worker_shms: List[shared_memory.SharedMemory] = []
+
+
+def _attach(specs: Dict[str, Tuple[str, tuple, str]]) -> None:
+    for key, (name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _worker_shms.append(shm)
+        _worker_arrays[key] = np.ndarray(shape, np.dtype(dtype),
+                                         buffer=shm.buf)
+
+
+def _rows(ranges: Iterable[Range]) -> np.ndarray:
+    return np.concatenate([np.arange(s, e) for s, e in ranges])
+
+
+def _evaluate(task: Tuple[int, Dict[str, Any], int, Split, int]
+              ) -> Dict[str, Any]:
+    """Fits one candidate on one fold inside a worker."""
+    candidate, params, fold, (train_ranges, test_range), seed = task
+    X, y = _worker_arrays['X'], _worker_arrays['y']
+    train_idx = _rows(train_ranges)
+    test = slice(*test_range)
+    started = time.perf_counter()
+    model = RandomForestClassifier(random_state=seed, n_jobs=1, **params)
+    model.fit(X[train_idx], y[train_idx])
+    proba = model.predict_proba(X[test])
+    labels = np.unique(y)
+    full = np.zeros((len(proba), len(labels)))
+    full[:, np.searchsorted(labels, model.classes_)] = proba
+    return {'candidate': candidate, 'fold': fold,
+            'train_size': int(len(train_idx)),
+            'test_size': int(test_range[1] - test_range[0]),
+            'accuracy': float(accuracy_score(
+                y[test], labels[np.argmax(full, axis=1)])),
+            'log_loss': float(log_loss(y[test], full, labels=labels)),
+            'fit_seconds': time.perf_counter() - started}
+
+
+def search(X: Any, y: Any,
+           param_grid: Optional[Mapping[str, Sequence[Any]]] = None,
+           n_iter: Optional[int] = None,
+           cv: str = 'walk_forward', n_splits: int = 5,
+           purge: int = 0, embargo: int = 0,
+           max_workers: Optional[int] = None, seed: int = 42,
+           report_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Cross-validated hyperparameter search for the AI model's forest.
+    Every (candidate, fold) pair is an independent task on a process
+    pool; ``X`` and ``y`` are placed in shared memory once.
+
+    :param param_grid: Values per ``RandomForestClassifier`` parameter
+    :param n_iter: Random search over ``n_iter`` grid points instead of
+                   the full grid
+    :param cv: ``'walk_forward'`` or ``'purged_kfold'``
+    :param report_path: Optional JSON file for the report
+    :return: report with per-candidate scores and the best parameters
+             (highest mean out-of-sample accuracy, then lowest log loss)
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    grid = param_grid or DEFAULT_PARAM_GRID
+    candidates = random_candidates(grid, n_iter, seed) if n_iter \
+        else grid_candidates(grid)
+    if cv == 'walk_forward':
+        splits = walk_forward_splits(len(X), n_splits, embargo=embargo)
+    elif cv == 'purged_kfold':
+        splits = purged_kfold_splits(len(X), n_splits, purge, embargo)
+    else:
+        raise ValueError(f"Unknown cv scheme: {cv}")
+    tasks = [(c, params, f, split, seed)
+             for c, params in enumerate(candidates)
+             for f, split in enumerate(splits)]
+    max_workers = max_workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    with SharedArray(X) as shared_X, SharedArray(y) as shared_y:
+        specs = {'X': shared_X.spec, 'y': shared_y.spec}
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_attach,
+                                 initargs=(specs,)) as pool:
+            results = list(pool.map(_evaluate, tasks))
+    report_candidates = []
+    for c, params in enumerate(candidates):
+        folds = [r for r in results if r['candidate'] == c]
+        accuracy = np.array([r['accuracy'] for r in folds])
+        losses = np.array([r['log_loss'] for r in folds])
+        report_candidates.append({
+            'params': params,
+            'mean_accuracy': float(accuracy.mean()),
+            'std_accuracy': float(accuracy.std()),
+            'mean_log_loss': float(losses.mean()),
+            'folds': folds,
+        })
+    best = max(report_candidates,
+               key=lambda r: (r['mean_accuracy'], -r['mean_log_loss']))
+    report = {
+        'cv': cv, 'n_splits': n_splits, 'purge': purge,
+        'embargo': embargo, 'n_samples': int(len(X)),
+        'n_workers': max_workers,
+        'elapsed_seconds': time.perf_counter() - started,
+        'best_params': best['params'],
+        'best_mean_accuracy': best['mean_accuracy'],
+        'candidates': report_candidates,
+    }
+    if report_path:
+        directory = os.path.dirname(report_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+    return report
+
+
+if __name__ == "__main__":
+    # Example: search on the stored BTCUSD history with the live features
+    from src.ai.features import FeaturePipeline
+    from src.data_ingestion.kline_store import KlineStore
+
+    bars = KlineStore(os.getenv('KLINE_STORE_DIR', 'data/klines')).read(
+        'BTCUSD', '1h')
+    features = FeaturePipeline().transform_batch(bars)
+    # Target: next bar closes higher
+    target = (bars['close'].shift(-1) > bars['close']).astype(int)
+    result = search(features.iloc[:-1], target.iloc[:-1], cv='purged_kfold',
+                    purge=1, embargo=1,
+                    report_path='reports/training_report.json')
+    print(f"Best params: {result['best_params']} "
+          f"(accuracy {result['best_mean_accuracy']:.3f}, "
+          f"{result['elapsed_seconds']:.1f}s)")
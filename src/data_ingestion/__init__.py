@@ -1,109 +1,105 @@
-import pandas as pd
+import asyncio
+import os
 import requests
-from typing import Dict, Any, List
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+
+from src.data_ingestion.http_client import AsyncBinanceClient, get_json
+from src.data_ingestion.local_book import OrderBookEngine
+from src.data_ingestion.recorder import active_recorder
+from src.data_ingestion.snapshot_cache import OrderBookSnapshotCache
+
+# pandas and the NumPy/SciPy analytics are imported where they are used,
+# so importing this package (e.g. for ``rate_limiter``) stays cheap
+if TYPE_CHECKING:
+    import pandas as pd
 
 # --- Advanced Data Sources and Features Scaffold ---
 
+
+async def _async_get_json(client: Optional[AsyncBinanceClient], path: str,
+                          params: Dict[str, Any]) -> Any:
+    if client is not None:
+        return await client.get_json(path, params)
+    async with AsyncBinanceClient() as own_client:
+        return await own_client.get_json(path, params)
+
+
 # 1. Order Book Data
 
+# Shared by the AI model, strategy and monitor so one trading cycle
+# performs a single depth fetch and every stage sees the same book.
+# The trading loop invalidates a symbol at the start of each cycle.
+order_book_cache = OrderBookSnapshotCache(
+    max_entries=int(os.getenv('ORDER_BOOK_CACHE_SIZE', 64)),
+    ttl_seconds=float(os.getenv('ORDER_BOOK_CACHE_TTL_SECONDS', 30.0))
+)
+
+# Locally maintained books; populated once ``start_background`` or ``run``
+# is called for a set of symbols. Until then reads fall back to REST.
+local_order_books = OrderBookEngine()
+
+
+def _parse_order_book(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'bids': data.get('bids', []),
+        'asks': data.get('asks', []),
+        'lastUpdateId': data.get('lastUpdateId')
+    }
+
 
 def get_order_book(symbol: str = 'BTCUSDT',
-                   limit: int = 100) -> Dict[str, Any]:
-    """Fetches order book (depth) data from Binance REST API."""
-    api_url = \
-        f"https://api.binance.com/api/v3/depth?symbol={symbol}&limit={limit}"
+                   limit: int = 100,
+                   use_local_book: bool = True) -> Dict[str, Any]:
+    """
+    Returns order book (depth) data, read from the in-memory book when
+    ``local_order_books`` keeps ``symbol`` in sync and from the Binance
+    REST API otherwise.
+    """
+    if use_local_book:
+        book = local_order_books.get_book(symbol)
+        if book is not None:
+            return book.snapshot(limit)
     try:
-        response = requests.get(api_url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        return {
-            'bids': data.get('bids', []),
-            'asks': data.get('asks', []),
-            'lastUpdateId': data.get('lastUpdateId')
-        }
+        data = get_json('/api/v3/depth',
+                        {'symbol': symbol, 'limit': limit}, timeout=5)
+        return _parse_order_book(data)
     except Exception as e:
         print(f"Error fetching order book: {e}")
         return {'bids': [], 'asks': [], 'lastUpdateId': None}
 
 
-def get_order_book_spread(symbol: str = 'BTCUSDT',
-                          limit: int = 10) -> Dict[str, Any]:
-    """Fetches order book and computes spread and top-of-book liquidity."""
-    ord_b = get_order_book(symbol, limit)
+async def async_get_order_book(symbol: str = 'BTCUSDT',
+                               limit: int = 100,
+                               client: Optional[AsyncBinanceClient] = None
+                               ) -> Dict[str, Any]:
+    """Async variant of ``get_order_book`` (REST only)."""
     try:
-        b_bid = float(ord_b['bids'][0][0]) if ord_b['bids'] else None
-        b_ask = float(ord_b['asks'][0][0]) if ord_b['asks'] else None
-        spread = (b_ask - b_bid) if (b_bid is not None and b_ask is not None) \
-            else None
-        bid_qty = float(ord_b['bids'][0][1]) if ord_b['bids'] else None
-        ask_qty = float(ord_b['asks'][0][1]) if ord_b['asks'] else None
-        return {
-            'best_bid': b_bid,
-            'best_ask': b_ask,
-            'spread': spread,
-            'bid_qty': bid_qty,
-            'ask_qty': ask_qty,
-            'bids': ord_b['bids'],
-            'asks': ord_b['asks'],
-            'lastUpdateId': ord_b['lastUpdateId']
-        }
+        data = await _async_get_json(client, '/api/v3/depth',
+                                     {'symbol': symbol, 'limit': limit})
+        return _parse_order_book(data)
     except Exception as e:
-        print(f"Error computing order book spread: {e}")
-        return {
-            'best_bid': None, 'best_ask': None,
-            'spread': None, 'bid_qty': None,
-            'ask_qty': None, 'bids': [],
-            'asks': [], 'lastUpdateId': None
-        }
+        print(f"Error fetching order book: {e}")
+        return {'bids': [], 'asks': [], 'lastUpdateId': None}
 
 
-def get_order_book_metrics(symbol: str = 'BTCUSDT',
-                           limit: int = 10) -> Dict[str, Any]:
-    """
-    Compute advanced order book metrics:
-        spread, imbalance,
-        depth-weighted price, liquidity.
-    """
-    ob = get_order_book(symbol, limit)
+def get_order_book_spread(symbol: str = 'BTCUSDT',
+                          limit: int = 10,
+                          use_cache: bool = True) -> Dict[str, Any]:
+    """Fetches order book and computes spread and top-of-book liquidity."""
+    metrics = get_order_book_metrics(symbol, limit, use_cache=use_cache)
+    return {key: metrics[key] for key in (
+        'best_bid', 'best_ask', 'spread', 'bid_qty', 'ask_qty',
+        'bids', 'asks', 'lastUpdateId'
+    )}
+
+
+def _compute_order_book_metrics(ob: Dict[str, Any]) -> Dict[str, Any]:
+    """Parses a raw depth snapshot into the order book metrics dict."""
+    from src.data_ingestion.order_book_analytics import (
+        compute_order_book_metrics
+    )
     try:
-        b_bid = float(ob['bids'][0][0]) if ob['bids'] else None
-        b_ask = float(ob['asks'][0][0]) if ob['asks'] else None
-        spread = (b_ask - b_bid) if (b_bid is not None and b_ask is not None) \
-            else None
-        bid_qty = float(ob['bids'][0][1]) if ob['bids'] else None
-        ask_qty = float(ob['asks'][0][1]) if ob['asks'] else None
-        total_bid_qty = sum(float(bid[1]) for bid in ob['bids']) \
-            if ob['bids'] else 0.0
-        total_ask_qty = sum(float(ask[1]) for ask in ob['asks']) \
-            if ob['asks'] else 0.0
-        imbalance = (
-            (total_bid_qty - total_ask_qty) /
-            (total_bid_qty + total_ask_qty)
-        ) if (total_bid_qty + total_ask_qty) > 0 else None
-
-        def vwap(levels: List[Any]) -> float | None:
-            total_qty = sum(float(level[1]) for level in levels)
-            if total_qty == 0:
-                return None
-            return sum(
-                float(level[0]) * float(level[1]) for level in levels
-            ) / total_qty
-
-        vwap_bid = vwap(ob['bids']) if ob['bids'] else None
-        vwap_ask = vwap(ob['asks']) if ob['asks'] else None
-        return {
-            'best_bid': b_bid,
-            'best_ask': b_ask,
-            'spread': spread,
-            'bid_qty': bid_qty,
-            'ask_qty': ask_qty,
-            'imbalance': imbalance,
-            'vwap_bid': vwap_bid,
-            'vwap_ask': vwap_ask,
-            'bids': ob['bids'],
-            'asks': ob['asks'],
-            'lastUpdateId': ob['lastUpdateId']
-        }
+        return compute_order_book_metrics(ob)
     except Exception as e:
         print(f"Error computing order book metrics: {e}")
         return {
@@ -111,10 +107,29 @@ def get_order_book_metrics(symbol: str = 'BTCUSDT',
             'spread': None, 'bid_qty': None,
             'ask_qty': None, 'imbalance': None,
             'vwap_bid': None, 'vwap_ask': None,
+            'mid': None, 'microprice': None,
             'bids': [], 'asks': [], 'lastUpdateId': None
         }
 
 
+def get_order_book_metrics(symbol: str = 'BTCUSDT',
+                           limit: int = 10,
+                           use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Compute advanced order book metrics:
+        spread, imbalance, microprice,
+        depth-weighted price, liquidity, depth within N bps.
+    Snapshots are shared through ``order_book_cache`` unless
+    ``use_cache`` is False.
+    """
+    def fetch() -> Dict[str, Any]:
+        return _compute_order_book_metrics(get_order_book(symbol, limit))
+
+    if not use_cache:
+        return fetch()
+    return order_book_cache.get_or_fetch(symbol, limit, fetch)
+
+
 async def binance_ws_ticker(symbol: str = 'btcusdt',
                             on_message=None):  # type: ignore
     """Connects to Binance WebSocket for real-time ticker updates."""
@@ -122,6 +137,9 @@ async def binance_ws_ticker(symbol: str = 'btcusdt',
     url = f"wss://stream.binance.com:9443/ws/{symbol.lower()}@ticker"
     async with websockets.connect(url) as ws:
         async for message in ws:
+            recorder = active_recorder()
+            if recorder is not None:
+                recorder.record_stream(url, message)
             if on_message:
                 on_message(message)
             else:
@@ -133,6 +151,7 @@ def get_crypto_news() -> List[Dict[str, Any]]:
     Stub for fetching crypto news headlines
     (integrate with CryptoPanic, etc.).
     """
+    import pandas as pd
     return [
         {
             "headline": "Bitcoin hits new high!",
@@ -147,6 +166,7 @@ def get_onchain_data(asset: str = 'BTC') -> Dict[str, Any]:
     Stub for fetching on-chain analytics
     (integrate with Glassnode, etc.).
     """
+    import pandas as pd
     return {
         "whale_alerts": 0,
         "large_transfers": 0,
@@ -154,28 +174,18 @@ def get_onchain_data(asset: str = 'BTC') -> Dict[str, Any]:
     }
 
 
-try:
-    import pandas_ta as ta  # type: ignore
-    has_ta = True
-except ImportError:
-    has_ta = False
-
-
-def add_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
+def add_technical_indicators(df: 'pd.DataFrame') -> 'pd.DataFrame':
     """
     Adds common technical indicators to a DataFrame:
                                     (SMA, RSI, MACD, etc.).
+    Uses the built-in batch engine in ``indicators``; live loops can
+    continue the same series with ``IncrementalIndicators``.
     """
-    if not has_ta:
-        print("pandas-ta not installed. Skipping technical indicators.")
-        return df
+    from src.data_ingestion.indicators import compute_indicators
     df = df.copy()
-    df['sma_20'] = ta.sma(df['close'], length=20)  # type: ignore
-    df['rsi_14'] = ta.rsi(df['close'], length=14)  # type: ignore
-    macd = ta.macd(df['close'])  # type: ignore
-    if macd is not None:
-        df['macd'] = macd['MACD_12_26_9']
-        df['macd_signal'] = macd['MACDs_12_26_9']
+    for column, values in compute_indicators(
+            df['close'].to_numpy(dtype=float)).items():
+        df[column] = values
     return df
 
 
@@ -184,6 +194,7 @@ def get_macro_data() -> Dict[str, Any]:
     Stub for macroeconomic indicators
     (integrate with FRED, etc.).
     """
+    import pandas as pd
     return {
         "vix": None,
         "sp500": None,
@@ -191,30 +202,53 @@ def get_macro_data() -> Dict[str, Any]:
     }
 
 
+KLINE_COLUMNS = [
+    'open_time', 'open', 'high', 'low', 'close', 'volume',
+    'close_time', 'quote_asset_volume', 'number_of_trades',
+    'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume',
+    'ignore'
+]
+
+
+def _parse_klines(data: List[List[Any]]) -> 'pd.DataFrame':
+    import pandas as pd
+    df = pd.DataFrame(data, columns=KLINE_COLUMNS)
+    df['open_time'] = pd.to_datetime(df['open_time'],  # type: ignore
+                                     unit='ms')
+    df['close_time'] = pd.to_datetime(df['close_time'],  # type: ignore
+                                      unit='ms')
+    for col in ['open', 'high', 'low', 'close', 'volume']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')  # type: ignore
+    return df.set_index('open_time')  # type: ignore
+
+
+def _klines_params(symbol: str, limit: int, interval: str,
+                   start_time: Optional[int],
+                   end_time: Optional[int]) -> Dict[str, Any]:
+    params: Dict[str, Any] = {'symbol': symbol, 'interval': interval,
+                              'limit': limit}
+    if start_time is not None:
+        params['startTime'] = int(start_time)
+    if end_time is not None:
+        params['endTime'] = int(end_time)
+    return params
+
+
 def get_market_data(symbol: str = 'BTCUSD',
-                    limit: int = 100) -> pd.DataFrame:
+                    limit: int = 100,
+                    interval: str = '1h',
+                    start_time: Optional[int] = None,
+                    end_time: Optional[int] = None) -> 'pd.DataFrame':
     """
     Fetches historical market data from Binance API.
+    :param start_time: Optional first bar open time (epoch ms)
+    :param end_time: Optional last bar open time (epoch ms)
     """
-    api_url = f"https://api.binance.com/api/v3/klines? \
-                symbol={symbol}&interval=1h&limit={limit}"
+    import pandas as pd
     try:
-        response = requests.get(api_url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        df = pd.DataFrame(data, columns=[
-            'open_time', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_asset_volume', 'number_of_trades',
-            'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume',
-            'ignore'
-        ])
-        df['open_time'] = pd.to_datetime(df['open_time'],  # type: ignore
-                                         unit='ms')
-        df['close_time'] = pd.to_datetime(df['close_time'],  # type: ignore
-                                          unit='ms')
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = pd.to_numeric(df[col], errors='coerce')  # type: ignore
-        df = df.set_index('open_time')  # type: ignore
+        data = get_json('/api/v3/klines', _klines_params(
+            symbol, limit, interval, start_time, end_time))
+        df = _parse_klines(data)
         print(f"Fetched {len(df)} data points for {symbol}")
         return df
     except requests.exceptions.RequestException as e:
@@ -222,26 +256,88 @@ def get_market_data(symbol: str = 'BTCUSD',
         return pd.DataFrame()
 
 
+async def async_get_market_data(symbol: str = 'BTCUSD',
+                                limit: int = 100,
+                                interval: str = '1h',
+                                start_time: Optional[int] = None,
+                                end_time: Optional[int] = None,
+                                client: Optional[AsyncBinanceClient] = None
+                                ) -> 'pd.DataFrame':
+    """Async variant of ``get_market_data``."""
+    import pandas as pd
+    try:
+        data = await _async_get_json(client, '/api/v3/klines', _klines_params(
+            symbol, limit, interval, start_time, end_time))
+        return _parse_klines(data)
+    except Exception as e:
+        print(f"Error fetching market data: {e}")
+        return pd.DataFrame()
+
+
+def _parse_ticker(data: Dict[str, Any]) -> Dict[str, Any]:
+    import pandas as pd
+    return {
+        'price': float(data['lastPrice']),
+        'volume': float(data['volume']),
+        'timestamp': pd.Timestamp.now()
+    }
+
+
 def get_realtime_data(symbol: str = 'BTCUSD') -> Dict[str, Any]:
     """
     Fetches current real-time market data from Binance API.
     """
-    api_url = f"https://api.binance.com/api/v3/ticker/24hr?symbol={symbol}"
+    import pandas as pd
     try:
-        response = requests.get(api_url, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        return {
-            'price': float(data['lastPrice']),
-            'volume': float(data['volume']),
-            'timestamp': pd.Timestamp.now()
-        }
+        data = get_json('/api/v3/ticker/24hr', {'symbol': symbol},
+                        timeout=5)
+        return _parse_ticker(data)
+    except Exception as e:
+        print(f"Error fetching real-time data: {e}")
+        return {'price': None, 'volume': None,
+                'timestamp': pd.Timestamp.now()}
+
+
+async def async_get_realtime_data(symbol: str = 'BTCUSD',
+                                  client: Optional[AsyncBinanceClient] = None
+                                  ) -> Dict[str, Any]:
+    """Async variant of ``get_realtime_data``."""
+    import pandas as pd
+    try:
+        data = await _async_get_json(client, '/api/v3/ticker/24hr',
+                                     {'symbol': symbol})
+        return _parse_ticker(data)
     except Exception as e:
         print(f"Error fetching real-time data: {e}")
         return {'price': None, 'volume': None,
                 'timestamp': pd.Timestamp.now()}
 
 
+async def fetch_cycle_data(symbol: str = 'BTCUSD',
+                           book_symbol: str = 'BTCUSDT',
+                           book_limit: int = 10,
+                           client: Optional[AsyncBinanceClient] = None
+                           ) -> Dict[str, Any]:
+    """
+    Fetches the ticker and order book for one trading cycle concurrently
+    and seeds ``order_book_cache`` with the parsed book, so the AI model,
+    strategy and monitor read it without another request.
+    :return: dict with ``market_data`` and ``order_book_metrics``
+    """
+    if client is None:
+        async with AsyncBinanceClient() as own_client:
+            return await fetch_cycle_data(symbol, book_symbol,
+                                          book_limit, own_client)
+    market_data, book = await asyncio.gather(
+        async_get_realtime_data(symbol, client=client),
+        async_get_order_book(book_symbol, book_limit, client=client)
+    )
+    metrics = _compute_order_book_metrics(book)
+    if metrics['lastUpdateId'] is not None:
+        metrics = order_book_cache.put(book_symbol, book_limit, metrics)
+    return {'market_data': market_data, 'order_book_metrics': metrics}
+
+
 if __name__ == "__main__":
     # Example usage
     historical_df = get_market_data(symbol='ETHUSDT', limit=5)
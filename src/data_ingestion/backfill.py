@@ -0,0 +1,114 @@
+import asyncio
+import os
+import time
+from typing import Any, List, Optional, Tuple
+
+import pandas as pd
+
+from src.data_ingestion import KLINE_COLUMNS, _parse_klines
+from src.data_ingestion.http_client import AsyncBinanceClient
+from src.data_ingestion.kline_store import (MAX_KLINES_PER_REQUEST,
+                                            interval_to_ms)
+
+KLINES_REQUEST_WEIGHT = 2
+BACKFILL_WEIGHT_PER_MINUTE = int(os.getenv('BACKFILL_WEIGHT_PER_MINUTE',
+                                           1200))
+BACKFILL_CONCURRENCY = int(os.getenv('BACKFILL_CONCURRENCY', 8))
+
+
+def kline_pages(start_ms: int, end_ms: int, interval: str,
+                page_size: int = MAX_KLINES_PER_REQUEST
+                ) -> List[Tuple[int, int]]:
+    """
+    Splits ``[start_ms, end_ms]`` into ``(startTime, endTime)`` windows of
+    at most ``page_size`` bars, aligned to the interval.
+    """
+    step = interval_to_ms(interval)
+    first = -(-int(start_ms) // step) * step
+    span = page_size * step
+    return [(page_start, min(page_start + span - step, int(end_ms)))
+            for page_start in range(first, int(end_ms) + 1, span)]
+
+
+class _WeightBudget:
+    """Token bucket refilled continuously at ``per_minute`` weight."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, weight: int) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens +
+                                  (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                await asyncio.sleep((weight - self.tokens) / self.rate)
+
+
+async def async_backfill_klines(symbol: str, interval: str,
+                                start_ms: int, end_ms: int,
+                                client: Optional[AsyncBinanceClient] = None,
+                                concurrency: int = BACKFILL_CONCURRENCY,
+                                weight_per_minute: int =
+                                BACKFILL_WEIGHT_PER_MINUTE,
+                                page_size: int = MAX_KLINES_PER_REQUEST
+                                ) -> pd.DataFrame:
+    """
+    Downloads every kline with ``start_ms <= open_time <= end_ms``,
+    fetching pages concurrently while staying within a request-weight
+    budget, then merges and de-duplicates them by ``open_time``.
+    Pages that still fail after the client's retries are skipped and
+    listed in ``df.attrs['failed_pages']``.
+    """
+    if client is None:
+        async with AsyncBinanceClient(pool_size=concurrency) as own_client:
+            return await async_backfill_klines(
+                symbol, interval, start_ms, end_ms, own_client,
+                concurrency, weight_per_minute, page_size)
+    pages = kline_pages(start_ms, end_ms, interval, page_size)
+    budget = _WeightBudget(weight_per_minute)
+    semaphore = asyncio.Semaphore(concurrency)
+    failed: List[Tuple[int, int]] = []
+
+    async def fetch(page: Tuple[int, int]) -> List[Any]:
+        async with semaphore:
+            await budget.acquire(KLINES_REQUEST_WEIGHT)
+            try:
+                return await client.get_json('/api/v3/klines', {
+                    'symbol': symbol, 'interval': interval,
+                    'startTime': page[0], 'endTime': page[1],
+                    'limit': page_size
+                })
+            except Exception as e:
+                print(f"Error backfilling {symbol} {interval} page "
+                      f"{page[0]}-{page[1]}: {e}")
+                failed.append(page)
+                return []
+
+    results = await asyncio.gather(*(fetch(page) for page in pages))
+    rows = [row for page_rows in results for row in page_rows
+            if start_ms <= row[0] <= end_ms]
+    if not rows:
+        df = pd.DataFrame(columns=KLINE_COLUMNS).set_index('open_time')
+    else:
+        df = _parse_klines(rows)
+        df = df[~df.index.duplicated(keep='last')].sort_index()
+    df.attrs['failed_pages'] = sorted(failed)
+    print(f"Backfilled {len(df)} {interval} bars for {symbol} "
+          f"from {len(pages)} pages")
+    return df
+
+
+def backfill_klines(symbol: str, interval: str, start_ms: int, end_ms: int,
+                    **kwargs: Any) -> pd.DataFrame:
+    """Blocking wrapper around ``async_backfill_klines``."""
+    return asyncio.run(async_backfill_klines(symbol, interval, start_ms,
+                                             end_ms, **kwargs))
@@ -0,0 +1,317 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import (Any, Callable, Deque, Dict, Iterable, List, Optional,
+                    Tuple)
+
+import pandas as pd
+
+from src.data_ingestion.kline_store import interval_to_ms
+from src.data_ingestion.recorder import active_recorder
+
+Bar = Dict[str, Any]
+BarCallback = Callable[[str, Bar], None]
+TradeCallback = Callable[[float, float, int], None]
+
+
+class _BarBuilder(ABC):
+    """Accumulates trades into one open bar; subclasses decide closing."""
+
+    def __init__(self) -> None:
+        self.bar: Optional[Bar] = None
+
+    def _open(self, open_time: int, price: float, qty: float,
+              ts_ms: int) -> None:
+        self.bar = {'open_time': open_time, 'open': price, 'high': price,
+                    'low': price, 'close': price, 'volume': qty,
+                    'close_time': ts_ms,
+                    'quote_asset_volume': price * qty,
+                    'number_of_trades': 1, 'closed': False}
+
+    def _add(self, price: float, qty: float, ts_ms: int) -> None:
+        bar = self.bar
+        assert bar is not None
+        if price > bar['high']:
+            bar['high'] = price
+        elif price < bar['low']:
+            bar['low'] = price
+        bar['close'] = price
+        bar['volume'] += qty
+        bar['quote_asset_volume'] += price * qty
+        bar['number_of_trades'] += 1
+        bar['close_time'] = max(bar['close_time'], ts_ms)
+
+    def _close(self) -> Bar:
+        bar = self.bar
+        assert bar is not None
+        bar['closed'] = True
+        self.bar = None
+        return bar
+
+    @abstractmethod
+    def add(self, price: float, qty: float, ts_ms: int) -> Optional[Bar]:
+        """Adds one trade; returns the bar it closed, if any."""
+
+    def flush(self, now_ms: int) -> Optional[Bar]:
+        return None
+
+
+class TimeBarBuilder(_BarBuilder):
+    """Bars aligned to a kline interval; quiet intervals emit no bar."""
+
+    def __init__(self, interval: str) -> None:
+        super().__init__()
+        self.interval_ms = interval_to_ms(interval)
+
+    def _finish(self) -> Bar:
+        assert self.bar is not None
+        self.bar['close_time'] = self.bar['open_time'] + self.interval_ms - 1
+        return self._close()
+
+    def add(self, price: float, qty: float, ts_ms: int) -> Optional[Bar]:
+        bucket = ts_ms - ts_ms % self.interval_ms
+        closed = None
+        if self.bar is not None and bucket > self.bar['open_time']:
+            closed = self._finish()
+        if self.bar is None:
+            self._open(bucket, price, qty, ts_ms)
+        else:
+            self._add(price, qty, ts_ms)
+        return closed
+
+    def flush(self, now_ms: int) -> Optional[Bar]:
+        """Closes the open bar once its interval has elapsed."""
+        if self.bar is not None and \
+                now_ms >= self.bar['open_time'] + self.interval_ms:
+            return self._finish()
+        return None
+
+
+class VolumeBarBuilder(_BarBuilder):
+    """Closes a bar once its base volume reaches ``threshold``; the
+    closing trade is not split, so bars may overshoot slightly."""
+
+    def __init__(self, threshold: float) -> None:
+        super().__init__()
+        self.threshold = threshold
+
+    def add(self, price: float, qty: float, ts_ms: int) -> Optional[Bar]:
+        if self.bar is None:
+            self._open(ts_ms, price, qty, ts_ms)
+        else:
+            self._add(price, qty, ts_ms)
+        if self.bar is not None and self.bar['volume'] >= self.threshold:
+            return self._close()
+        return None
+
+
+class TickBarBuilder(_BarBuilder):
+    """Closes a bar every ``count`` trades."""
+
+    def __init__(self, count: int) -> None:
+        super().__init__()
+        self.count = count
+
+    def add(self, price: float, qty: float, ts_ms: int) -> Optional[Bar]:
+        if self.bar is None:
+            self._open(ts_ms, price, qty, ts_ms)
+        else:
+            self._add(price, qty, ts_ms)
+        if self.bar is not None and \
+                self.bar['number_of_trades'] >= self.count:
+            return self._close()
+        return None
+
+
+class BarAggregator:
+    """
+    Builds time, volume and tick bars for one symbol from individual
+    trades, for several bar specs at once. Bars are keyed by spec:
+    ``'1m'``/``'1h'`` (time), ``'volume:10'`` and ``'tick:100'``. Only
+    the newest ``max_bars`` closed bars per key are kept.
+
+    :param on_bar: Called as ``on_bar(key, bar)`` for every closed bar
+    :param on_trade: Called as ``on_trade(price, qty, ts_ms)`` for every
+                     accepted trade
+    """
+
+    def __init__(self, intervals: Iterable[str] = ('1m',),
+                 volume_bars: Iterable[float] = (),
+                 tick_bars: Iterable[int] = (),
+                 max_bars: int = 500,
+                 on_bar: Optional[BarCallback] = None,
+                 on_trade: Optional[TradeCallback] = None) -> None:
+        self.builders: Dict[str, _BarBuilder] = {}
+        for interval in intervals:
+            self.builders[interval] = TimeBarBuilder(interval)
+        for threshold in volume_bars:
+            self.builders[f"volume:{threshold:g}"] = \
+                VolumeBarBuilder(threshold)
+        for count in tick_bars:
+            self.builders[f"tick:{count}"] = TickBarBuilder(count)
+        self.closed: Dict[str, Deque[Bar]] = {
+            key: deque(maxlen=max_bars) for key in self.builders}
+        self.on_bar = on_bar
+        self.on_trade = on_trade
+        self.last_trade_id: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _emit(self, key: str, bar: Bar,
+              out: List[Tuple[str, Bar]]) -> None:
+        self.closed[key].append(bar)
+        out.append((key, bar))
+
+    def add_trade(self, price: float, qty: float, ts_ms: int,
+                  trade_id: Optional[int] = None) -> List[Tuple[str, Bar]]:
+        """
+        Adds one trade to every bar spec.
+        :param trade_id: Trades with an id not above the last one seen
+                         (replays after a reconnect) are ignored
+        :return: the (key, bar) pairs closed by this trade
+        """
+        out: List[Tuple[str, Bar]] = []
+        with self._lock:
+            if trade_id is not None:
+                if self.last_trade_id is not None and \
+                        trade_id <= self.last_trade_id:
+                    return out
+                self.last_trade_id = trade_id
+            for key, builder in self.builders.items():
+                bar = builder.add(price, qty, ts_ms)
+                if bar is not None:
+                    self._emit(key, bar, out)
+        if self.on_bar:
+            for key, bar in out:
+                self.on_bar(key, bar)
+        if self.on_trade:
+            self.on_trade(price, qty, ts_ms)
+        return out
+
+    def add_message(self, message: Any) -> List[Tuple[str, Bar]]:
+        """Applies a raw or decoded ``@trade``/``@aggTrade`` message."""
+        if isinstance(message, (str, bytes)):
+            message = json.loads(message)
+        event = message.get('data', message)
+        trade_id = event.get('a', event.get('t'))
+        return self.add_trade(float(event['p']), float(event['q']),
+                              int(event['T']), trade_id)
+
+    def flush(self, now_ms: Optional[int] = None) -> List[Tuple[str, Bar]]:
+        """Closes time bars whose interval ended without a new trade."""
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        out: List[Tuple[str, Bar]] = []
+        with self._lock:
+            for key, builder in self.builders.items():
+                bar = builder.flush(now_ms)
+                if bar is not None:
+                    self._emit(key, bar, out)
+        if self.on_bar:
+            for key, bar in out:
+                self.on_bar(key, bar)
+        return out
+
+    def partial(self, key: str) -> Optional[Bar]:
+        """Copy of the still-open bar for ``key``, if any."""
+        with self._lock:
+            bar = self.builders[key].bar
+            return dict(bar) if bar is not None else None
+
+    def last_closed(self, key: str) -> Optional[Bar]:
+        with self._lock:
+            bars = self.closed[key]
+            return dict(bars[-1]) if bars else None
+
+    def bars(self, key: str, include_partial: bool = False) -> pd.DataFrame:
+        """Closed bars (plus the open one) in ``get_market_data`` layout."""
+        with self._lock:
+            rows = list(self.closed[key])
+            bar = self.builders[key].bar
+            if include_partial and bar is not None:
+                rows.append(dict(bar))
+        df = pd.DataFrame(rows, columns=[
+            'open_time', 'open', 'high', 'low', 'close', 'volume',
+            'close_time', 'quote_asset_volume', 'number_of_trades',
+            'closed'])
+        df['open_time'] = pd.to_datetime(df['open_time'], unit='ms')
+        df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
+        return df.set_index('open_time')
+
+
+class TradeBarStream:
+    """
+    Feeds a ``BarAggregator`` from the Binance ``@aggTrade`` (or
+    ``@trade``) WebSocket stream, reconnecting on errors and closing
+    time bars on schedule while the market is quiet.
+    """
+
+    def __init__(self, aggregator: BarAggregator, symbol: str,
+                 stream: str = 'aggTrade',
+                 ws_base_url: Optional[str] = None,
+                 reconnect_delay: float = 1.0,
+                 flush_interval: float = 1.0) -> None:
+        self.aggregator = aggregator
+        self.symbol = symbol.upper()
+        self.stream = stream
+        self.ws_base_url = ws_base_url or os.getenv(
+            'BINANCE_WS_URL', 'wss://stream.binance.com:9443')
+        self.reconnect_delay = reconnect_delay
+        self.flush_interval = flush_interval
+        self._stopping = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional['asyncio.Task[None]'] = None
+
+    def stream_url(self) -> str:
+        return f"{self.ws_base_url}/ws/{self.symbol.lower()}@{self.stream}"
+
+    async def _flush_periodically(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(self.flush_interval)
+            self.aggregator.flush()
+
+    async def _stream(self) -> None:
+        import websockets
+        url = self.stream_url()
+        while not self._stopping:
+            try:
+                async with websockets.connect(url) as ws:
+                    async for message in ws:
+                        recorder = active_recorder()
+                        if recorder is not None:
+                            recorder.record_stream(url, message)
+                        self.aggregator.add_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Trade stream error for {self.symbol}: {e}")
+            if not self._stopping:
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def run(self) -> None:
+        """Streams trades until ``stop`` is called."""
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        flusher = asyncio.create_task(self._flush_periodically())
+        try:
+            await self._stream()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            flusher.cancel()
+
+    def stop(self) -> None:
+        """Stops the stream; safe to call from another thread."""
+        self._stopping = True
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+
+    def start_background(self) -> threading.Thread:
+        """Runs the stream on its own event loop in a daemon thread."""
+        thread = threading.Thread(target=lambda: asyncio.run(self.run()),
+                                  name='TradeBarStream', daemon=True)
+        thread.start()
+        return thread
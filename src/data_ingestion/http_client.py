@@ -0,0 +1,172 @@
+import asyncio
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.data_ingestion.rate_limiter import (PRIORITY_MARKET_DATA,
+                                             binance_rate_limiter,
+                                             request_weight)
+from src.data_ingestion.recorder import active_recorder
+
+BINANCE_API_URL = os.getenv('BINANCE_API_URL', 'https://api.binance.com')
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 20))
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 3))
+HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', 0.5))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# 429s are left to the rate limiter so it can pause all callers
+SYNC_RETRY_STATUSES = (500, 502, 503, 504)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+# Set by ``ReplayEngine.install``: REST requests are answered from a log
+replay_source: Optional[Any] = None
+
+
+def _build_session() -> requests.Session:
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=SYNC_RETRY_STATUSES,
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE,
+                          pool_maxsize=HTTP_POOL_SIZE,
+                          max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide pooled ``requests.Session`` (keep-alive,
+    retries with exponential backoff on 5xx).
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def close_session() -> None:
+    """Closes the pooled session; the next call opens a new one."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_json(path: str, params: Optional[Dict[str, Any]] = None,
+             timeout: float = 10,
+             priority: int = PRIORITY_MARKET_DATA) -> Any:
+    """
+    GETs ``path`` from the Binance REST API over the pooled session,
+    after admission by ``binance_rate_limiter``. Responses are recorded
+    when a recorder is active and served from the log during a replay.
+    :raises requests.exceptions.RequestException: on transport errors
+                                                  or a non-2xx status
+    """
+    if replay_source is not None:
+        return replay_source.next_rest(path, params)
+    binance_rate_limiter.acquire(request_weight(path, params), priority)
+    response = get_session().get(f"{BINANCE_API_URL}{path}",
+                                 params=params, timeout=timeout)
+    binance_rate_limiter.observe_response(response.status_code,
+                                          response.headers)
+    response.raise_for_status()
+    data = response.json()
+    recorder = active_recorder()
+    if recorder is not None:
+        recorder.record_rest(path, params, data)
+    return data
+
+
+class AsyncBinanceClient:
+    """
+    Pooled ``aiohttp`` client for the Binance REST API. Use one instance
+    per event loop (``async with AsyncBinanceClient() as client``) so all
+    concurrent fetches share its connections.
+    """
+
+    def __init__(self, base_url: Optional[str] = None,
+                 pool_size: int = HTTP_POOL_SIZE,
+                 timeout: float = 10,
+                 max_retries: int = HTTP_MAX_RETRIES,
+                 backoff_factor: float = HTTP_BACKOFF_FACTOR) -> None:
+        self.base_url = base_url or BINANCE_API_URL
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._session: Optional[Any] = None
+
+    async def __aenter__(self) -> 'AsyncBinanceClient':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _get_session(self) -> Any:
+        import aiohttp
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size,
+                                               ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def get_json(self, path: str,
+                       params: Optional[Dict[str, Any]] = None,
+                       priority: int = PRIORITY_MARKET_DATA) -> Any:
+        """
+        GETs ``path`` with retries and exponential backoff on transport
+        errors and 429/5xx responses (honouring ``Retry-After``). Every
+        attempt is admitted by ``binance_rate_limiter``.
+        :raises aiohttp.ClientError: once retries are exhausted
+        """
+        import aiohttp
+        if replay_source is not None:
+            return replay_source.next_rest(path, params)
+        session = self._get_session()
+        url = f"{self.base_url}{path}"
+        weight = request_weight(path, params)
+        for attempt in range(self.max_retries + 1):
+            delay = self.backoff_factor * (2 ** attempt)
+            await binance_rate_limiter.acquire_async(weight, priority)
+            try:
+                async with session.get(url, params=params) as response:
+                    binance_rate_limiter.observe_response(
+                        response.status, response.headers)
+                    if (response.status in RETRY_STATUSES and
+                            attempt < self.max_retries):
+                        retry_after = response.headers.get('Retry-After')
+                        if retry_after and retry_after.isdigit():
+                            delay = float(retry_after)
+                    else:
+                        response.raise_for_status()
+                        data = await response.json(content_type=None)
+                        recorder = active_recorder()
+                        if recorder is not None:
+                            recorder.record_rest(path, params, data)
+                        return data
+            except (aiohttp.ClientConnectionError,
+                    asyncio.TimeoutError):
+                if attempt >= self.max_retries:
+                    raise
+            await asyncio.sleep(delay)
@@ -0,0 +1,189 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+SMA_LENGTH = 20
+RSI_LENGTH = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+INDICATOR_COLUMNS = ('sma_20', 'rsi_14', 'macd', 'macd_signal', 'macd_hist')
+
+# Both modes evaluate exactly the same floating point expressions
+# (EMA: ``alpha * x + (1 - alpha) * prev``, seeds: ``np.mean`` of the
+# first ``length`` values, SMA: ``np.mean`` of a contiguous window), so
+# incremental results are bit-for-bit equal to the batch ones.
+
+
+def sma(close: np.ndarray, length: int = SMA_LENGTH) -> np.ndarray:
+    """Simple moving average; NaN until ``length`` values are seen."""
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(len(close), np.nan)
+    if len(close) >= length:
+        out[length - 1:] = sliding_window_view(close, length).mean(axis=1)
+    return out
+
+
+def ema(values: np.ndarray, length: int,
+        alpha: Optional[float] = None) -> np.ndarray:
+    """
+    Exponential moving average seeded with the SMA of the first
+    ``length`` values; ``alpha`` defaults to ``2 / (length + 1)``.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    alpha = 2.0 / (length + 1) if alpha is None else alpha
+    out = np.full(len(values), np.nan)
+    if len(values) < length:
+        return out
+    seed = np.mean(values[:length])
+    out[length - 1] = seed
+    if len(values) > length:
+        out[length:], _ = lfilter([alpha], [1.0, -(1.0 - alpha)],
+                                  values[length:],
+                                  zi=[(1.0 - alpha) * seed])
+    return out
+
+
+def _rsi_averages(close: np.ndarray, length: int):  # type: ignore
+    delta = np.diff(np.asarray(close, dtype=np.float64))
+    gains = np.maximum(delta, 0.0)
+    losses = np.maximum(-delta, 0.0)
+    return (ema(gains, length, alpha=1.0 / length),
+            ema(losses, length, alpha=1.0 / length))
+
+
+def _rsi_value(avg_gain, avg_loss):  # type: ignore
+    total = avg_gain + avg_loss
+    return np.where(total > 0, 100.0 * avg_gain / np.where(
+        total > 0, total, 1.0), 50.0)
+
+
+def rsi(close: np.ndarray, length: int = RSI_LENGTH) -> np.ndarray:
+    """Wilder RSI; 50 when the window had no price movement."""
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(len(close), np.nan)
+    if len(close) > length:
+        avg_gain, avg_loss = _rsi_averages(close, length)
+        out[1:] = _rsi_value(avg_gain, avg_loss)
+        out[:length] = np.nan
+    return out
+
+
+def macd(close: np.ndarray, fast: int = MACD_FAST, slow: int = MACD_SLOW,
+         signal: int = MACD_SIGNAL) -> Dict[str, np.ndarray]:
+    """MACD line, signal line and histogram."""
+    close = np.asarray(close, dtype=np.float64)
+    line = ema(close, fast) - ema(close, slow)
+    sig = np.full(len(close), np.nan)
+    if len(close) >= slow:
+        sig[slow - 1:] = ema(line[slow - 1:], signal)
+    return {'macd': line, 'macd_signal': sig, 'macd_hist': line - sig}
+
+
+def compute_indicators(close: np.ndarray) -> Dict[str, np.ndarray]:
+    """Batch mode: all indicators over a whole close history."""
+    return {'sma_20': sma(close, SMA_LENGTH),
+            'rsi_14': rsi(close, RSI_LENGTH),
+            **macd(close)}
+
+
+class _StreamingEMA:
+    def __init__(self, length: int, alpha: Optional[float] = None) -> None:
+        self.length = length
+        self.alpha = 2.0 / (length + 1) if alpha is None else alpha
+        self.value = float('nan')
+        self._warmup: Optional[List[float]] = []
+
+    def update(self, x: float) -> float:
+        if self._warmup is None:
+            self.value = float(self.alpha * x + (1.0 - self.alpha)
+                               * self.value)
+        else:
+            self._warmup.append(x)
+            if len(self._warmup) == self.length:
+                self.value = float(np.mean(np.array(self._warmup)))
+                self._warmup = None
+        return self.value
+
+    def seed(self, value: float) -> None:
+        self.value = value
+        self._warmup = None
+
+
+class IncrementalIndicators:
+    """
+    Live mode: updates SMA-20, RSI-14 and MACD(12, 26, 9) in O(1) per
+    closed bar from running state (EMA accumulators, Wilder averages and
+    a mirrored 20-value window), matching ``compute_indicators``.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._window = np.zeros(2 * SMA_LENGTH)
+        self._head = 0
+        self._prev_close: Optional[float] = None
+        self._fast = _StreamingEMA(MACD_FAST)
+        self._slow = _StreamingEMA(MACD_SLOW)
+        self._signal = _StreamingEMA(MACD_SIGNAL)
+        self._gain = _StreamingEMA(RSI_LENGTH, alpha=1.0 / RSI_LENGTH)
+        self._loss = _StreamingEMA(RSI_LENGTH, alpha=1.0 / RSI_LENGTH)
+        self.values: Dict[str, float] = {c: float('nan')
+                                         for c in INDICATOR_COLUMNS}
+
+    def _push_window(self, close: float) -> None:
+        self._window[self._head] = close
+        self._window[self._head + SMA_LENGTH] = close
+        self._head = (self._head + 1) % SMA_LENGTH
+
+    def update(self, close: float) -> Dict[str, float]:
+        """Consumes one closed bar and returns the current indicators."""
+        close = float(close)
+        self.count += 1
+        self._push_window(close)
+        if self.count >= SMA_LENGTH:
+            end = self._head + SMA_LENGTH
+            self.values['sma_20'] = float(
+                np.mean(self._window[end - SMA_LENGTH:end]))
+        if self._prev_close is not None:
+            delta = close - self._prev_close
+            gain = self._gain.update(max(delta, 0.0))
+            loss = self._loss.update(max(-delta, 0.0))
+            if self.count > RSI_LENGTH:
+                self.values['rsi_14'] = float(_rsi_value(gain, loss))
+        self._prev_close = close
+        fast = self._fast.update(close)
+        slow = self._slow.update(close)
+        if self.count >= MACD_SLOW:
+            line = fast - slow
+            sig = self._signal.update(line)
+            self.values['macd'] = line
+            self.values['macd_signal'] = sig
+            self.values['macd_hist'] = line - sig
+        return dict(self.values)
+
+    @classmethod
+    def from_history(cls, close: np.ndarray) -> 'IncrementalIndicators':
+        """
+        Warm-starts from a close history with one batch computation,
+        so later ``update`` calls continue the batch series exactly.
+        """
+        close = np.asarray(close, dtype=np.float64)
+        state = cls()
+        if len(close) < MACD_SLOW + MACD_SIGNAL or \
+                len(close) <= RSI_LENGTH + 1:
+            for value in close:
+                state.update(value)
+            return state
+        batch = compute_indicators(close)
+        state.count = len(close)
+        for value in close[-SMA_LENGTH:]:
+            state._push_window(float(value))
+        state._prev_close = float(close[-1])
+        avg_gain, avg_loss = _rsi_averages(close, RSI_LENGTH)
+        state._gain.seed(float(avg_gain[-1]))
+        state._loss.seed(float(avg_loss[-1]))
+        state._fast.seed(float(ema(close, MACD_FAST)[-1]))
+        state._slow.seed(float(ema(close, MACD_SLOW)[-1]))
+        state._signal.seed(float(batch['macd_signal'][-1]))
+        state.values = {c: float(batch[c][-1]) for c in INDICATOR_COLUMNS}
+        return state
@@ -0,0 +1,226 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Column name -> on-disk dtype. Times are epoch milliseconds.
+KLINE_STORE_COLUMNS: Dict[str, str] = {
+    'open_time': '<i8',
+    'open': '<f8',
+    'high': '<f8',
+    'low': '<f8',
+    'close': '<f8',
+    'volume': '<f8',
+    'close_time': '<i8',
+    'quote_asset_volume': '<f8',
+    'number_of_trades': '<i8',
+    'taker_buy_base_asset_volume': '<f8',
+    'taker_buy_quote_asset_volume': '<f8',
+}
+
+INTERVAL_MS: Dict[str, int] = {
+    '1s': 1_000,
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000,
+    '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000,
+    '1d': 86_400_000, '3d': 259_200_000, '1w': 604_800_000,
+}
+
+MAX_KLINES_PER_REQUEST = 1000
+
+KlineFetcher = Callable[..., pd.DataFrame]
+
+
+def interval_to_ms(interval: str) -> int:
+    """Returns the bar length of a Binance kline interval in ms."""
+    try:
+        return INTERVAL_MS[interval]
+    except KeyError:
+        raise ValueError(f"Unsupported kline interval: {interval}")
+
+
+def _to_epoch_ms(values: Any) -> np.ndarray:
+    arr = np.asarray(values)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        return arr.astype('datetime64[ms]').astype(np.int64)
+    return arr.astype(np.int64)
+
+
+def _default_fetcher(symbol: str, limit: int, interval: str,
+                     start_time: Optional[int]) -> pd.DataFrame:
+    from src.data_ingestion import get_market_data
+    return get_market_data(symbol, limit=limit, interval=interval,
+                           start_time=start_time)
+
+
+class KlineStore:
+    """
+    Append-only columnar store of closed OHLCV bars, one directory per
+    (symbol, interval) holding a raw little-endian file per column plus a
+    ``meta.json`` row count. Reads memory-map the column files, so range
+    queries cost a binary search and a copy of the selected rows.
+    """
+
+    def __init__(self, root: str = 'data/klines') -> None:
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _dir(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, symbol.upper(), interval)
+
+    def _meta_path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self._dir(symbol, interval), 'meta.json')
+
+    def rows(self, symbol: str, interval: str) -> int:
+        """Number of committed bars for (symbol, interval)."""
+        try:
+            with open(self._meta_path(symbol, interval)) as f:
+                return int(json.load(f)['rows'])
+        except FileNotFoundError:
+            return 0
+
+    def _column(self, symbol: str, interval: str, name: str,
+                rows: int) -> np.ndarray:
+        if rows == 0:
+            return np.empty(0, dtype=KLINE_STORE_COLUMNS[name])
+        path = os.path.join(self._dir(symbol, interval), f'{name}.bin')
+        return np.memmap(path, dtype=KLINE_STORE_COLUMNS[name], mode='r',
+                         shape=(rows,))
+
+    def last_open_time(self, symbol: str, interval: str) -> Optional[int]:
+        """Open time (epoch ms) of the newest stored bar, if any."""
+        rows = self.rows(symbol, interval)
+        if rows == 0:
+            return None
+        return int(self._column(symbol, interval, 'open_time', rows)[-1])
+
+    def append(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """
+        Appends bars newer than the last stored ``open_time``.
+        :param df: Bars in ``get_market_data`` format (``open_time`` as
+                   index or column)
+        :return: number of bars written
+        """
+        if df.empty:
+            return 0
+        if 'open_time' not in df.columns:
+            df = df.reset_index()
+        df = df.sort_values('open_time')
+        columns: Dict[str, np.ndarray] = {}
+        for name, dtype in KLINE_STORE_COLUMNS.items():
+            if name in ('open_time', 'close_time'):
+                columns[name] = _to_epoch_ms(df[name].to_numpy())
+            else:
+                columns[name] = pd.to_numeric(
+                    df[name], errors='coerce').to_numpy(dtype=dtype)
+        with self._lock:
+            rows = self.rows(symbol, interval)
+            last = self.last_open_time(symbol, interval)
+            keep = np.ones(len(df), dtype=bool)
+            if last is not None:
+                keep &= columns['open_time'] > last
+            # Drop duplicate open times within the batch itself
+            keep[1:] &= np.diff(columns['open_time']) > 0
+            count = int(keep.sum())
+            if count == 0:
+                return 0
+            directory = self._dir(symbol, interval)
+            os.makedirs(directory, exist_ok=True)
+            for name, dtype in KLINE_STORE_COLUMNS.items():
+                path = os.path.join(directory, f'{name}.bin')
+                with open(path, 'ab') as f:
+                    # Discard bytes from an append that never committed
+                    f.truncate(rows * np.dtype(dtype).itemsize)
+                    f.write(np.ascontiguousarray(
+                        columns[name][keep], dtype=dtype).tobytes())
+            tmp_path = self._meta_path(symbol, interval) + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump({'rows': rows + count,
+                           'columns': KLINE_STORE_COLUMNS}, f)
+            os.replace(tmp_path, self._meta_path(symbol, interval))
+            return count
+
+    def read(self, symbol: str, interval: str,
+             start: Optional[Any] = None, end: Optional[Any] = None,
+             limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Reads bars with ``start <= open_time <= end`` into a DataFrame
+        indexed by ``open_time`` (same layout as ``get_market_data``).
+        :param start: Epoch ms, or anything ``pd.Timestamp`` accepts
+        :param limit: Keep only the newest ``limit`` bars of the range
+        """
+        rows = self.rows(symbol, interval)
+        open_time = self._column(symbol, interval, 'open_time', rows)
+        lo, hi = 0, rows
+        if start is not None:
+            lo = int(np.searchsorted(open_time, self._ms(start), 'left'))
+        if end is not None:
+            hi = int(np.searchsorted(open_time, self._ms(end), 'right'))
+        if limit is not None:
+            lo = max(lo, hi - limit)
+        data = {
+            name: np.array(self._column(symbol, interval, name, rows)[lo:hi])
+            for name in KLINE_STORE_COLUMNS
+        }
+        df = pd.DataFrame(data)
+        df['open_time'] = pd.to_datetime(df['open_time'], unit='ms')
+        df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
+        return df.set_index('open_time')
+
+    @staticmethod
+    def _ms(value: Any) -> int:
+        if isinstance(value, (int, np.integer)):
+            return int(value)
+        return int(pd.Timestamp(value).value // 1_000_000)
+
+    def sync(self, symbol: str, interval: str = '1h',
+             lookback_bars: int = 1000,
+             fetcher: Optional[KlineFetcher] = None,
+             now_ms: Optional[int] = None) -> int:
+        """
+        Fetches only bars newer than the last stored ``open_time`` (or the
+        last ``lookback_bars`` for an empty store) and appends the closed
+        ones. Gaps longer than one page go through the concurrent
+        backfill unless a custom ``fetcher`` is given. Network failures
+        leave the stored history untouched.
+        :return: number of bars appended
+        """
+        fetch = fetcher or _default_fetcher
+        step = interval_to_ms(interval)
+        now = int(time.time() * 1000) if now_ms is None else now_ms
+        last = self.last_open_time(symbol, interval)
+        start = last + step if last is not None \
+            else (now - lookback_bars * step) // step * step
+        added = 0
+        if fetcher is None and (now - start) // step > MAX_KLINES_PER_REQUEST:
+            # Long gaps are downloaded as concurrent pages
+            from src.data_ingestion.backfill import backfill_klines
+            df = backfill_klines(symbol, interval, start, now - step)
+            failed = df.attrs.get('failed_pages')
+            cutoff = failed[0][0] if failed else now
+            # Stop at the first missing page so the store has no holes
+            keep = ((_to_epoch_ms(df.index.to_numpy()) < cutoff) &
+                    (_to_epoch_ms(df['close_time'].to_numpy()) < now))
+            added += self.append(symbol, interval, df[keep])
+            last = self.last_open_time(symbol, interval)
+            if last is None or failed:
+                return added
+            start = last + step
+        while start + step <= now:
+            df = fetch(symbol, MAX_KLINES_PER_REQUEST, interval, start)
+            if df is None or df.empty:
+                break
+            close_ms = _to_epoch_ms(df['close_time'].to_numpy())
+            closed = df[close_ms < now]
+            written = self.append(symbol, interval, closed)
+            added += written
+            if (written == 0 or len(df) < MAX_KLINES_PER_REQUEST or
+                    len(closed) < len(df)):
+                break
+            start = int(self.last_open_time(symbol, interval) or 0) + step
+        return added
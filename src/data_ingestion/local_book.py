@@ -0,0 +1,249 @@
+import asyncio
+import json
+import os
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.data_ingestion.recorder import active_recorder
+
+Level = Tuple[str, str]
+SnapshotFetcher = Callable[[str, int], Dict[str, Any]]
+BookCallback = Callable[['LocalOrderBook'], None]
+
+
+class LocalOrderBook:
+    """
+    In-memory L2 order book for one symbol, seeded from a REST depth
+    snapshot and kept current with ``@depth`` diff events.
+
+    Price levels live in a dict keyed by float price next to a sorted
+    price list maintained with ``bisect``, so level lookups are O(log n)
+    and the top of book is a slice.
+    """
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol.upper()
+        self.last_update_id: Optional[int] = None
+        self.synced = False
+        self._bid_prices: List[float] = []  # ascending, best bid last
+        self._ask_prices: List[float] = []  # ascending, best ask first
+        self._bids: Dict[float, Level] = {}
+        self._asks: Dict[float, Level] = {}
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Marks the book as unsynced and drops all levels."""
+        with self._lock:
+            self.synced = False
+            self.last_update_id = None
+            self._bid_prices.clear()
+            self._ask_prices.clear()
+            self._bids.clear()
+            self._asks.clear()
+
+    def load_snapshot(self, snapshot: Dict[str, Any]) -> bool:
+        """
+        Replaces the book with a REST depth snapshot.
+        :return: True if the snapshot was usable
+        """
+        self.reset()
+        if snapshot.get('lastUpdateId') is None:
+            return False
+        with self._lock:
+            for price, qty in snapshot.get('bids', []):
+                self._set_level(self._bid_prices, self._bids, price, qty)
+            for price, qty in snapshot.get('asks', []):
+                self._set_level(self._ask_prices, self._asks, price, qty)
+            self.last_update_id = int(snapshot['lastUpdateId'])
+            self.synced = True
+        return True
+
+    def apply_diff(self, event: Dict[str, Any]) -> bool:
+        """
+        Applies one ``depthUpdate`` event.
+        Events already covered by the book are ignored.
+        :return: False if a sequence gap was detected and the book
+                 must be resynced from a new snapshot
+        """
+        first_id, final_id = int(event['U']), int(event['u'])
+        with self._lock:
+            if self.last_update_id is None:
+                return False
+            if final_id <= self.last_update_id:
+                return True
+            if first_id > self.last_update_id + 1:
+                self.synced = False
+                return False
+            for price, qty in event.get('b', []):
+                self._set_level(self._bid_prices, self._bids, price, qty)
+            for price, qty in event.get('a', []):
+                self._set_level(self._ask_prices, self._asks, price, qty)
+            self.last_update_id = final_id
+        return True
+
+    @staticmethod
+    def _set_level(prices: List[float], levels: Dict[float, Level],
+                   price: str, qty: str) -> None:
+        key = float(price)
+        if float(qty) == 0.0:
+            if levels.pop(key, None) is not None:
+                del prices[bisect_left(prices, key)]
+            return
+        if key not in levels:
+            insort(prices, key)
+        levels[key] = (price, qty)
+
+    def snapshot(self, limit: int = 100) -> Dict[str, Any]:
+        """Returns the top ``limit`` levels in ``get_order_book`` format."""
+        with self._lock:
+            bid_keys = self._bid_prices[:-limit - 1:-1] if limit > 0 else []
+            ask_keys = self._ask_prices[:limit]
+            return {
+                'bids': [list(self._bids[p]) for p in bid_keys],
+                'asks': [list(self._asks[p]) for p in ask_keys],
+                'lastUpdateId': self.last_update_id
+            }
+
+    def best_bid(self) -> Optional[float]:
+        with self._lock:
+            return self._bid_prices[-1] if self._bid_prices else None
+
+    def best_ask(self) -> Optional[float]:
+        with self._lock:
+            return self._ask_prices[0] if self._ask_prices else None
+
+    def __len__(self) -> int:
+        return len(self._bids) + len(self._asks)
+
+
+def _default_snapshot_fetcher(symbol: str, limit: int) -> Dict[str, Any]:
+    from src.data_ingestion import get_order_book
+    return get_order_book(symbol, limit, use_local_book=False)
+
+
+class OrderBookEngine:
+    """
+    Maintains a ``LocalOrderBook`` per symbol from the Binance diff-depth
+    WebSocket stream, resyncing from REST whenever a gap is detected.
+
+    :param on_update: Called with the book after every applied update
+    """
+
+    def __init__(self,
+                 snapshot_fetcher: Optional[SnapshotFetcher] = None,
+                 ws_base_url: Optional[str] = None,
+                 snapshot_depth: int = 1000,
+                 update_speed: str = '100ms',
+                 reconnect_delay: float = 1.0,
+                 on_update: Optional[BookCallback] = None) -> None:
+        self.snapshot_fetcher = snapshot_fetcher or _default_snapshot_fetcher
+        self.ws_base_url = ws_base_url or os.getenv(
+            'BINANCE_WS_URL', 'wss://stream.binance.com:9443')
+        self.snapshot_depth = snapshot_depth
+        self.update_speed = update_speed
+        self.reconnect_delay = reconnect_delay
+        self.on_update = on_update
+        self.books: Dict[str, LocalOrderBook] = {}
+        self.resyncs: Dict[str, int] = {}
+        self._stopping = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List['asyncio.Task[None]'] = []
+
+    def get_book(self, symbol: str) -> Optional[LocalOrderBook]:
+        """Returns the local book for ``symbol`` if it is in sync."""
+        book = self.books.get(symbol.upper())
+        if book is not None and book.synced:
+            return book
+        return None
+
+    def stream_url(self, symbol: str) -> str:
+        suffix = f"@{self.update_speed}" if self.update_speed else ''
+        return f"{self.ws_base_url}/ws/{symbol.lower()}@depth{suffix}"
+
+    async def run(self, symbols: Iterable[str]) -> None:
+        """Maintains books for ``symbols`` until ``stop`` is called."""
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        self._tasks = [asyncio.create_task(self._maintain(s.upper()))
+                       for s in symbols]
+        try:
+            await asyncio.gather(*self._tasks)
+        except asyncio.CancelledError:
+            pass
+
+    def stop(self) -> None:
+        """Stops all streams; safe to call from another thread."""
+        self._stopping = True
+        if self._loop is None:
+            return
+        for task in self._tasks:
+            self._loop.call_soon_threadsafe(task.cancel)
+
+    def start_background(self, symbols: Iterable[str]) -> threading.Thread:
+        """Runs the engine on its own event loop in a daemon thread."""
+        symbols = list(symbols)
+        thread = threading.Thread(target=lambda: asyncio.run(
+            self.run(symbols)), name='OrderBookEngine', daemon=True)
+        thread.start()
+        return thread
+
+    async def _maintain(self, symbol: str) -> None:
+        import websockets
+        book = self.books.setdefault(symbol, LocalOrderBook(symbol))
+        while not self._stopping:
+            try:
+                async with websockets.connect(self.stream_url(symbol)) as ws:
+                    await self._consume(book, ws)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Order book stream error for {symbol}: {e}")
+            book.reset()
+            if not self._stopping:
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def _consume(self, book: LocalOrderBook, ws: Any) -> None:
+        events: 'asyncio.Queue[Optional[Dict[str, Any]]]' = asyncio.Queue()
+
+        channel = self.stream_url(book.symbol)
+
+        async def reader() -> None:
+            try:
+                async for message in ws:
+                    recorder = active_recorder()
+                    if recorder is not None:
+                        recorder.record_stream(channel, message)
+                    events.put_nowait(json.loads(message))
+            finally:
+                events.put_nowait(None)
+
+        reader_task = asyncio.create_task(reader())
+        try:
+            while not self._stopping:
+                # Events keep buffering in the queue while the snapshot
+                # is fetched, as the Binance sync procedure requires.
+                if not await self._load_snapshot(book):
+                    await asyncio.sleep(self.reconnect_delay)
+                    continue
+                while True:
+                    event = await events.get()
+                    if event is None:
+                        return
+                    if not book.apply_diff(event):
+                        print(f"Order book gap for {book.symbol}: "
+                              f"U={event.get('U')} after "
+                              f"{book.last_update_id}. Resyncing.")
+                        self.resyncs[book.symbol] = \
+                            self.resyncs.get(book.symbol, 0) + 1
+                        break
+                    if self.on_update:
+                        self.on_update(book)
+        finally:
+            reader_task.cancel()
+
+    async def _load_snapshot(self, book: LocalOrderBook) -> bool:
+        loop = asyncio.get_running_loop()
+        snapshot = await loop.run_in_executor(
+            None, self.snapshot_fetcher, book.symbol, self.snapshot_depth)
+        return book.load_snapshot(snapshot)
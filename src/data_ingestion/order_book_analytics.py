@@ -0,0 +1,144 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_DEPTH_BPS: Tuple[float, ...] = (10.0, 50.0)
+
+
+def levels_to_arrays(levels: Sequence[Sequence[Any]],
+                     depth: Optional[int] = None
+                     ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parses ``[[price, qty], ...]`` levels (strings or numbers) once into
+    contiguous float64 price and quantity arrays.
+    """
+    if depth is not None:
+        levels = levels[:depth]
+    if len(levels) == 0:
+        return np.empty(0), np.empty(0)
+    arr = np.asarray(levels, dtype=np.float64)[:, :2]
+    return (np.ascontiguousarray(arr[:, 0]),
+            np.ascontiguousarray(arr[:, 1]))
+
+
+def stack_order_books(books: Iterable[Dict[str, Any]],
+                      depth: int) -> Dict[str, np.ndarray]:
+    """
+    Packs many order book snapshots into ``(n_books, depth)`` arrays.
+    Missing levels are padded with NaN prices and zero quantities.
+    """
+    books = list(books)
+    out = {
+        'bid_px': np.full((len(books), depth), np.nan),
+        'bid_qty': np.zeros((len(books), depth)),
+        'ask_px': np.full((len(books), depth), np.nan),
+        'ask_qty': np.zeros((len(books), depth)),
+    }
+    for i, book in enumerate(books):
+        for side in ('bid', 'ask'):
+            px, qty = levels_to_arrays(book.get(f'{side}s', []), depth)
+            out[f'{side}_px'][i, :len(px)] = px
+            out[f'{side}_qty'][i, :len(qty)] = qty
+    return out
+
+
+def compute_metrics_batch(bid_px: np.ndarray, bid_qty: np.ndarray,
+                          ask_px: np.ndarray, ask_qty: np.ndarray,
+                          depth_bps: Sequence[float] = DEFAULT_DEPTH_BPS
+                          ) -> Dict[str, np.ndarray]:
+    """
+    Computes order book metrics for many snapshots at once.
+    Inputs are ``(n_books, depth)`` arrays ordered best level first
+    (see ``stack_order_books``); a single book may be passed as 1-D
+    arrays. Undefined values (e.g. an empty side) are NaN.
+    :return: dict of ``(n_books,)`` arrays plus the ``(n_books, depth)``
+             cumulative depth curves ``cum_bid_qty``/``cum_ask_qty``
+    """
+    bid_px, bid_qty, ask_px, ask_qty = (
+        np.atleast_2d(np.asarray(a, dtype=np.float64))
+        for a in (bid_px, bid_qty, ask_px, ask_qty)
+    )
+    bid_valid = ~np.isnan(bid_px) & (bid_qty > 0)
+    ask_valid = ~np.isnan(ask_px) & (ask_qty > 0)
+    bid_qty = np.where(bid_valid, bid_qty, 0.0)
+    ask_qty = np.where(ask_valid, ask_qty, 0.0)
+    bid_notional = np.where(bid_valid, bid_px, 0.0) * bid_qty
+    ask_notional = np.where(ask_valid, ask_px, 0.0) * ask_qty
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        best_bid = np.where(bid_valid[:, 0], bid_px[:, 0], np.nan)
+        best_ask = np.where(ask_valid[:, 0], ask_px[:, 0], np.nan)
+        top_bid_qty = np.where(bid_valid[:, 0], bid_qty[:, 0], np.nan)
+        top_ask_qty = np.where(ask_valid[:, 0], ask_qty[:, 0], np.nan)
+        cum_bid_qty = np.cumsum(bid_qty, axis=1)
+        cum_ask_qty = np.cumsum(ask_qty, axis=1)
+        total_bid = cum_bid_qty[:, -1]
+        total_ask = cum_ask_qty[:, -1]
+        total = total_bid + total_ask
+        mid = (best_bid + best_ask) / 2.0
+        metrics = {
+            'best_bid': best_bid,
+            'best_ask': best_ask,
+            'spread': best_ask - best_bid,
+            'mid': mid,
+            'bid_qty': top_bid_qty,
+            'ask_qty': top_ask_qty,
+            'total_bid_qty': total_bid,
+            'total_ask_qty': total_ask,
+            'imbalance': np.where(total > 0,
+                                  (total_bid - total_ask) / total, np.nan),
+            'vwap_bid': np.where(total_bid > 0,
+                                 bid_notional.sum(axis=1) / total_bid,
+                                 np.nan),
+            'vwap_ask': np.where(total_ask > 0,
+                                 ask_notional.sum(axis=1) / total_ask,
+                                 np.nan),
+            'microprice': (best_bid * top_ask_qty + best_ask * top_bid_qty)
+            / (top_bid_qty + top_ask_qty),
+            'cum_bid_qty': cum_bid_qty,
+            'cum_ask_qty': cum_ask_qty,
+        }
+        for bps in depth_bps:
+            band = mid[:, None] * (bps / 10_000.0)
+            label = f"{bps:g}bps"
+            metrics[f'depth_bid_{label}'] = np.where(
+                bid_valid & (bid_px >= mid[:, None] - band), bid_qty, 0.0
+            ).sum(axis=1)
+            metrics[f'depth_ask_{label}'] = np.where(
+                ask_valid & (ask_px <= mid[:, None] + band), ask_qty, 0.0
+            ).sum(axis=1)
+    return metrics
+
+
+def _scalar(value: Any) -> Optional[float]:
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def compute_order_book_metrics(ob: Dict[str, Any],
+                               depth_bps: Sequence[float] = DEFAULT_DEPTH_BPS
+                               ) -> Dict[str, Any]:
+    """
+    Computes the metrics for a single ``get_order_book`` snapshot.
+    Undefined values are returned as None; the raw levels are passed
+    through under ``bids``/``asks``.
+    """
+    bid_px, bid_qty = levels_to_arrays(ob['bids'])
+    ask_px, ask_qty = levels_to_arrays(ob['asks'])
+    depth = max(len(bid_px), len(ask_px), 1)
+    padded: List[np.ndarray] = []
+    for px, qty in ((bid_px, bid_qty), (ask_px, ask_qty)):
+        padded.append(np.pad(px, (0, depth - len(px)),
+                             constant_values=np.nan))
+        padded.append(np.pad(qty, (0, depth - len(qty))))
+    batch = compute_metrics_batch(*padded, depth_bps=depth_bps)
+    metrics: Dict[str, Any] = {
+        key: _scalar(value[0]) for key, value in batch.items()
+        if value.ndim == 1
+    }
+    metrics.update({
+        'bids': ob['bids'],
+        'asks': ob['asks'],
+        'lastUpdateId': ob['lastUpdateId']
+    })
+    return metrics
@@ -0,0 +1,233 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+# Lower value = served first when the budget is contended.
+PRIORITY_ORDER = 0
+PRIORITY_ACCOUNT = 1
+PRIORITY_MARKET_DATA = 2
+
+DEFAULT_REQUEST_WEIGHT = 2
+_FIXED_WEIGHTS: Dict[str, int] = {
+    '/api/v3/klines': 2,
+    '/api/v3/ticker/price': 2,
+    '/api/v3/time': 1,
+    '/api/v3/order': 4,
+    '/api/v3/openOrders': 6,
+    '/api/v3/account': 20,
+}
+
+
+def request_weight(path: str,
+                   params: Optional[Mapping[str, Any]] = None) -> int:
+    """Binance spot request weight of a REST call."""
+    params = params or {}
+    if path == '/api/v3/depth':
+        limit = int(params.get('limit', 100))
+        if limit <= 100:
+            return 5
+        if limit <= 500:
+            return 25
+        return 50 if limit <= 1000 else 250
+    if path == '/api/v3/ticker/24hr':
+        if 'symbol' in params:
+            return 2
+        symbols = params.get('symbols')
+        if symbols is None:
+            return 80
+        count = len(symbols) if isinstance(symbols, (list, tuple)) \
+            else str(symbols).count(',') + 1
+        return 2 if count <= 20 else 40 if count <= 100 else 80
+    return _FIXED_WEIGHTS.get(path, DEFAULT_REQUEST_WEIGHT)
+
+
+class TokenBucket:
+    """Continuously refilled bucket of ``capacity`` per ``period`` s."""
+
+    def __init__(self, capacity: float, period: float) -> None:
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, floor: float = 0.0) -> float:
+        """Seconds until ``amount`` can be taken leaving ``floor``."""
+        missing = amount + floor - self.tokens
+        return 0.0 if missing <= 0 else missing / self.rate
+
+    def set_used(self, used: float) -> None:
+        self.tokens = max(0.0, self.capacity - used)
+
+    @property
+    def used(self) -> float:
+        return self.capacity - self.tokens
+
+
+class RateLimitScheduler:
+    """
+    Central admission control for Binance REST calls.
+
+    Keeps a token bucket per limit class (IP request weight per minute,
+    orders per 10 s and per day). Low-priority callers (market data)
+    may not dip into the share of the weight budget reserved for order
+    placement and yield to any higher-priority waiter. Server-reported
+    usage headers resynchronise the buckets, and 429/418 responses stop
+    all traffic until ``Retry-After`` has passed.
+    """
+
+    def __init__(self, weight_per_minute: int = 6000,
+                 orders_per_10s: int = 50,
+                 orders_per_day: int = 160000,
+                 order_reserve: float = 0.2) -> None:
+        self.buckets: Dict[str, TokenBucket] = {
+            'weight': TokenBucket(weight_per_minute, 60.0),
+            'orders_10s': TokenBucket(orders_per_10s, 10.0),
+            'orders_1d': TokenBucket(orders_per_day, 86400.0),
+        }
+        self.order_reserve = order_reserve
+        self.banned_until = 0.0
+        self.counters: Dict[str, int] = {
+            'requests': 0, 'throttled': 0, 'rate_limited': 0
+        }
+        self._waiting: Dict[int, int] = {}
+        self._cond = threading.Condition()
+
+    def _reserve_for(self, priority: int) -> float:
+        if priority <= PRIORITY_ORDER:
+            return 0.0
+        return self.buckets['weight'].capacity * self.order_reserve
+
+    def _try_acquire(self, weight: int, priority: int,
+                     is_order: bool) -> float:
+        """Takes the budget and returns 0, or returns seconds to wait."""
+        now = time.monotonic()
+        if now < self.banned_until:
+            return self.banned_until - now
+        if any(count for p, count in self._waiting.items() if p < priority):
+            return 0.05
+        for bucket in self.buckets.values():
+            bucket.refill(now)
+        waits = [self.buckets['weight'].wait_time(
+            weight, self._reserve_for(priority))]
+        if is_order:
+            waits += [self.buckets['orders_10s'].wait_time(1),
+                      self.buckets['orders_1d'].wait_time(1)]
+        wait = max(waits)
+        if wait > 0:
+            return wait
+        self.buckets['weight'].tokens -= weight
+        if is_order:
+            self.buckets['orders_10s'].tokens -= 1
+            self.buckets['orders_1d'].tokens -= 1
+        self.counters['requests'] += 1
+        return 0.0
+
+    def acquire(self, weight: int = DEFAULT_REQUEST_WEIGHT,
+                priority: int = PRIORITY_MARKET_DATA,
+                is_order: bool = False,
+                timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until the request fits the budget.
+        :return: False if ``timeout`` elapsed first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            wait = self._try_acquire(weight, priority, is_order)
+            if wait == 0:
+                return True
+            self.counters['throttled'] += 1
+            self._waiting[priority] = self._waiting.get(priority, 0) + 1
+            try:
+                while wait > 0:
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return False
+                        wait = min(wait, remaining)
+                    self._cond.wait(wait)
+                    wait = self._try_acquire(weight, priority, is_order)
+                return True
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    async def acquire_async(self, weight: int = DEFAULT_REQUEST_WEIGHT,
+                            priority: int = PRIORITY_MARKET_DATA,
+                            is_order: bool = False) -> None:
+        """Awaits until the request fits the budget."""
+        with self._cond:
+            wait = self._try_acquire(weight, priority, is_order)
+            if wait == 0:
+                return
+            self.counters['throttled'] += 1
+            self._waiting[priority] = self._waiting.get(priority, 0) + 1
+        try:
+            while wait > 0:
+                await asyncio.sleep(wait)
+                with self._cond:
+                    wait = self._try_acquire(weight, priority, is_order)
+        finally:
+            with self._cond:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Resynchronises buckets from ``X-MBX-*`` usage headers."""
+        lowered = {k.lower(): v for k, v in headers.items()}
+        mapping = {
+            'x-mbx-used-weight-1m': 'weight',
+            'x-mbx-order-count-10s': 'orders_10s',
+            'x-mbx-order-count-1d': 'orders_1d',
+        }
+        with self._cond:
+            for header, bucket in mapping.items():
+                value = lowered.get(header)
+                if value is not None and str(value).isdigit():
+                    self.buckets[bucket].refill(time.monotonic())
+                    self.buckets[bucket].set_used(float(value))
+
+    def on_rate_limited(self, status: int,
+                        retry_after: Optional[str] = None) -> None:
+        """Pauses all requests after a 429 (throttled) or 418 (banned)."""
+        delay = float(retry_after) if retry_after and \
+            str(retry_after).isdigit() else (120.0 if status == 418 else 60.0)
+        with self._cond:
+            self.counters['rate_limited'] += 1
+            self.banned_until = max(self.banned_until,
+                                    time.monotonic() + delay)
+
+    def observe_response(self, status: int,
+                         headers: Mapping[str, str]) -> None:
+        """Feeds a response's status and headers back into the budget."""
+        self.update_from_headers(headers)
+        if status in (418, 429):
+            self.on_rate_limited(status, headers.get('Retry-After'))
+
+    def stats(self) -> Dict[str, Any]:
+        """Used and remaining budget per limit class plus counters."""
+        with self._cond:
+            now = time.monotonic()
+            out: Dict[str, Any] = dict(self.counters)
+            for name, bucket in self.buckets.items():
+                bucket.refill(now)
+                out[f'{name}_used'] = round(bucket.used, 2)
+                out[f'{name}_remaining'] = round(bucket.tokens, 2)
+            out['banned_for_seconds'] = round(
+                max(0.0, self.banned_until - now), 2)
+            return out
+
+
+# Process-wide scheduler shared by data ingestion and trade execution
+binance_rate_limiter = RateLimitScheduler(
+    weight_per_minute=int(os.getenv('BINANCE_WEIGHT_PER_MINUTE', 6000)),
+    orders_per_10s=int(os.getenv('BINANCE_ORDERS_PER_10S', 50)),
+    orders_per_day=int(os.getenv('BINANCE_ORDERS_PER_DAY', 160000)),
+    order_reserve=float(os.getenv('BINANCE_ORDER_WEIGHT_RESERVE', 0.2))
+)
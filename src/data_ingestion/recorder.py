@@ -0,0 +1,257 @@
+import asyncio
+import json
+import os
+import struct
+import threading
+import time
+from collections import deque
+from typing import (Any, Callable, Deque, Dict, Iterator, Mapping,
+                    NamedTuple, Optional, Tuple)
+from urllib.parse import urlencode
+
+import requests
+
+LOG_MAGIC = b'AATLOG1\n'
+# recv_ts_ns, kind, channel length, payload length
+RECORD_HEADER = struct.Struct('<qBHI')
+KIND_STREAM = 1
+KIND_REST = 2
+
+
+class LogRecord(NamedTuple):
+    recv_ns: int
+    kind: int
+    channel: str
+    payload: bytes
+
+
+class ReplayMiss(requests.exceptions.RequestException):
+    """Raised when the replay log has no response for a REST request."""
+
+
+def rest_channel(path: str,
+                 params: Optional[Mapping[str, Any]] = None) -> str:
+    """Canonical channel name of a REST request (params sorted)."""
+    if not params:
+        return path
+    query = urlencode(sorted((k, str(v)) for k, v in params.items()))
+    return f"{path}?{query}"
+
+
+class MarketDataRecorder:
+    """
+    Appends raw stream messages and REST responses, with receive
+    timestamps, to a compact binary log: an 8-byte magic followed by
+    records of ``RECORD_HEADER`` + channel + payload bytes.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'ab', buffering=1 << 16)
+        if is_new:
+            self._file.write(LOG_MAGIC)
+        self._lock = threading.Lock()
+        self.records = 0
+
+    def _write(self, kind: int, channel: str, payload: bytes,
+               recv_ns: Optional[int]) -> None:
+        channel_bytes = channel.encode('utf-8')
+        header = RECORD_HEADER.pack(
+            time.time_ns() if recv_ns is None else recv_ns, kind,
+            len(channel_bytes), len(payload))
+        with self._lock:
+            self._file.write(header + channel_bytes + payload)
+            self.records += 1
+
+    def record_stream(self, channel: str, message: Any,
+                      recv_ns: Optional[int] = None) -> None:
+        """Records one raw WebSocket message for ``channel``."""
+        payload = message.encode('utf-8') if isinstance(message, str) \
+            else bytes(message)
+        self._write(KIND_STREAM, channel, payload, recv_ns)
+
+    def record_rest(self, path: str, params: Optional[Mapping[str, Any]],
+                    data: Any, recv_ns: Optional[int] = None) -> None:
+        """Records a decoded REST response."""
+        payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        self._write(KIND_REST, rest_channel(path, params), payload, recv_ns)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> 'MarketDataRecorder':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def read_log(path: str) -> Iterator[LogRecord]:
+    """Yields the records of a log written by ``MarketDataRecorder``."""
+    with open(path, 'rb') as f:
+        if f.read(len(LOG_MAGIC)) != LOG_MAGIC:
+            raise ValueError(f"{path} is not a market data log")
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            recv_ns, kind, channel_len, payload_len = \
+                RECORD_HEADER.unpack(header)
+            body = f.read(channel_len + payload_len)
+            if len(body) < channel_len + payload_len:
+                return  # truncated tail from an interrupted write
+            yield LogRecord(recv_ns, kind,
+                            body[:channel_len].decode('utf-8'),
+                            body[channel_len:])
+
+
+class ReplayEngine:
+    """
+    Feeds recorded data back through the ingestion interfaces. While
+    installed, ``http_client.get_json`` (and the async client) answer
+    REST requests from the log instead of the network, and ``stream``
+    re-delivers WebSocket messages.
+
+    :param speed: None replays as fast as possible, 1.0 in real time,
+                  10.0 ten times faster, etc.
+    :param strict: Only serve REST responses recorded with identical
+                   parameters; otherwise fall back to the next response
+                   recorded for the same path
+    :param on_exhausted: Called once when a recorded REST path runs out,
+                         e.g. to stop the trading loop
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = None,
+                 strict: bool = False,
+                 on_exhausted: Optional[Callable[[str], None]] = None
+                 ) -> None:
+        self.path = path
+        self.speed = speed
+        self.strict = strict
+        self.on_exhausted = on_exhausted
+        self._rest: Dict[str, Deque[Tuple[int, str, bytes]]] = {}
+        self.first_ns: Optional[int] = None
+        for record in read_log(path):
+            if self.first_ns is None:
+                self.first_ns = record.recv_ns
+            if record.kind == KIND_REST:
+                rest_path = record.channel.split('?', 1)[0]
+                self._rest.setdefault(rest_path, deque()).append(
+                    (record.recv_ns, record.channel, record.payload))
+        self.exhausted: Dict[str, bool] = {}
+        self.served = 0
+        self._started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _pace(self, recv_ns: int) -> None:
+        if self.speed is None or self.first_ns is None:
+            return
+        if self._started is None:
+            self._started = time.monotonic()
+        due = self._started + (recv_ns - self.first_ns) / 1e9 / self.speed
+        delay = due - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def next_rest(self, path: str,
+                  params: Optional[Mapping[str, Any]] = None) -> Any:
+        """
+        Returns the next recorded response for a REST request.
+        :raises ReplayMiss: when the log has no (more) matching response
+        """
+        channel = rest_channel(path, params)
+        with self._lock:
+            if self._started is None:
+                self._started = time.monotonic()
+            queue = self._rest.get(path)
+            found = None
+            if queue:
+                for i, entry in enumerate(queue):
+                    if entry[1] == channel:
+                        found = entry
+                        del queue[i]
+                        break
+                if found is None and not self.strict:
+                    found = queue.popleft()
+            if found is None:
+                fire = queue is not None and not self.exhausted.get(path)
+                if fire:
+                    self.exhausted[path] = True
+            else:
+                self.served += 1
+        if found is None:
+            if fire and self.on_exhausted:
+                self.on_exhausted(path)
+            raise ReplayMiss(f"No recorded response for {channel}")
+        self._pace(found[0])
+        return json.loads(found[2])
+
+    async def stream(self, on_message: Callable[[str, str], Any],
+                     channel_prefix: str = '') -> int:
+        """
+        Re-delivers recorded stream messages whose channel starts with
+        ``channel_prefix`` as ``on_message(channel, raw_message)``.
+        :return: number of messages delivered
+        """
+        started = time.monotonic()
+        delivered = 0
+        for record in read_log(self.path):
+            if record.kind != KIND_STREAM or \
+                    not record.channel.startswith(channel_prefix):
+                continue
+            if self.speed is not None and self.first_ns is not None:
+                due = started + (record.recv_ns - self.first_ns) \
+                    / 1e9 / self.speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            on_message(record.channel, record.payload.decode('utf-8'))
+            delivered += 1
+        return delivered
+
+    def install(self) -> 'ReplayEngine':
+        """Routes REST ingestion through this replay."""
+        from src.data_ingestion import http_client
+        http_client.replay_source = self
+        return self
+
+    def uninstall(self) -> None:
+        from src.data_ingestion import http_client
+        if http_client.replay_source is self:
+            http_client.replay_source = None
+
+    def __enter__(self) -> 'ReplayEngine':
+        return self.install()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.uninstall()
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        return {'served': self.served, 'elapsed_seconds': elapsed,
+                'requests_per_second': self.served / elapsed
+                if elapsed > 0 else None,
+                'remaining': {p: len(q) for p, q in self._rest.items()}}
+
+
+_active_recorder: Optional[MarketDataRecorder] = None
+
+
+def set_recorder(recorder: Optional[MarketDataRecorder]) -> None:
+    """Starts (or with None stops) recording all ingestion traffic."""
+    global _active_recorder
+    _active_recorder = recorder
+
+
+def active_recorder() -> Optional[MarketDataRecorder]:
+    return _active_recorder
@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+CacheKey = Tuple[str, int]
+
+
+class OrderBookSnapshotCache:
+    """
+    Bounded LRU cache of parsed order book snapshots keyed by
+    (symbol, depth). Entries expire after ``ttl_seconds`` and can also be
+    invalidated by an exchange ``lastUpdateId`` that is newer than the
+    cached one, so every consumer within a trading cycle reads the same
+    snapshot.
+    """
+
+    def __init__(self, max_entries: int = 64,
+                 ttl_seconds: float = 5.0) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]' \
+            = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0,
+                                      'evictions': 0}
+
+    @staticmethod
+    def _key(symbol: str, limit: int) -> CacheKey:
+        return (symbol.upper(), int(limit))
+
+    def get(self, symbol: str, limit: int,
+            min_update_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached snapshot for (symbol, limit) if it is still
+        fresh, otherwise None.
+        :param min_update_id: Treat the entry as stale if its
+                              lastUpdateId is older than this
+        """
+        key = self._key(symbol, limit)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, snapshot = entry
+                update_id = snapshot.get('lastUpdateId')
+                expired = now - stored_at > self.ttl_seconds
+                outdated = (min_update_id is not None and
+                            (update_id is None or update_id < min_update_id))
+                if not expired and not outdated:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return snapshot
+                del self._entries[key]
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, symbol: str, limit: int,
+            snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Stores a snapshot and returns the one consumers should use. A
+        fresh entry with a newer lastUpdateId is never replaced by an
+        older snapshot.
+        """
+        key = self._key(symbol, limit)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, current = entry
+                cur_id = current.get('lastUpdateId')
+                new_id = snapshot.get('lastUpdateId')
+                if (now - stored_at <= self.ttl_seconds and
+                        cur_id is not None and new_id is not None and
+                        cur_id > new_id):
+                    self._entries.move_to_end(key)
+                    return current
+            self._entries[key] = (now, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+            return snapshot
+
+    def get_or_fetch(self, symbol: str, limit: int,
+                     fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Returns the cached snapshot or calls ``fetch`` and caches its
+        result. Failed fetches (no lastUpdateId) are not cached.
+        """
+        snapshot = self.get(symbol, limit)
+        if snapshot is not None:
+            return snapshot
+        snapshot = fetch()
+        if snapshot.get('lastUpdateId') is None:
+            return snapshot
+        return self.put(symbol, limit, snapshot)
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drops all entries, or only those for ``symbol``."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0] == symbol.upper()]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
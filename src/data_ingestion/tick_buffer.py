@@ -0,0 +1,105 @@
+import time
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from src.data_ingestion.tickers import TickerTable
+
+
+class TickRingBuffer:
+    """
+    Fixed-capacity tick history with preallocated NumPy columns
+    (timestamp int64 ns, price, volume).
+
+    Every tick is written twice, at ``i`` and ``i + capacity``, so the
+    newest ``n`` ticks always form one contiguous slice. ``window``
+    therefore returns read-only views without copying, appends are O(1)
+    and memory never grows.
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._timestamp_ns = np.zeros(2 * capacity, dtype=np.int64)
+        self._price = np.zeros(2 * capacity, dtype=np.float64)
+        self._volume = np.zeros(2 * capacity, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+        self.total_appended = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, price: float, volume: float,
+               timestamp_ns: Optional[int] = None) -> None:
+        """Adds one tick, overwriting the oldest once full."""
+        ts = time.time_ns() if timestamp_ns is None else timestamp_ns
+        head, mirror = self._head, self._head + self.capacity
+        self._timestamp_ns[head] = self._timestamp_ns[mirror] = ts
+        self._price[head] = self._price[mirror] = price
+        self._volume[head] = self._volume[mirror] = volume
+        self._head = (head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        self.total_appended += 1
+
+    def _view(self, column: np.ndarray, n: Optional[int]) -> np.ndarray:
+        n = self._count if n is None else min(n, self._count)
+        end = self._head + self.capacity
+        view = column[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def window(self, n: Optional[int] = None
+               ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns zero-copy (timestamp_ns, price, volume) views of the
+        newest ``n`` ticks (all stored ticks by default), oldest first.
+        Views are only valid until the slots are overwritten.
+        """
+        return (self._view(self._timestamp_ns, n),
+                self._view(self._price, n),
+                self._view(self._volume, n))
+
+    def prices(self, n: Optional[int] = None) -> np.ndarray:
+        return self._view(self._price, n)
+
+    def latest(self) -> Optional[Tuple[int, float, float]]:
+        """Newest (timestamp_ns, price, volume), or None when empty."""
+        if self._count == 0:
+            return None
+        i = self._head - 1 + self.capacity
+        return (int(self._timestamp_ns[i]), float(self._price[i]),
+                float(self._volume[i]))
+
+
+class TickStore:
+    """One ``TickRingBuffer`` per symbol, created on first use."""
+
+    def __init__(self, capacity: int = 4096) -> None:
+        self.capacity = capacity
+        self.buffers: Dict[str, TickRingBuffer] = {}
+
+    def buffer(self, symbol: str) -> TickRingBuffer:
+        key = symbol.upper()
+        buf = self.buffers.get(key)
+        if buf is None:
+            buf = self.buffers[key] = TickRingBuffer(self.capacity)
+        return buf
+
+    def append(self, symbol: str, price: float, volume: float,
+               timestamp_ns: Optional[int] = None) -> None:
+        self.buffer(symbol).append(price, volume, timestamp_ns)
+
+    def append_table(self, table: 'TickerTable') -> None:
+        """Appends the current row of every symbol in a ``TickerTable``."""
+        n = len(table)
+        for i, symbol in enumerate(table.symbols[:n]):
+            self.buffer(symbol).append(float(table.price[i]),
+                                       float(table.volume[i]),
+                                       int(table.timestamp_ns[i]))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.buffers)
@@ -0,0 +1,203 @@
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data_ingestion.http_client import AsyncBinanceClient, get_json
+from src.data_ingestion.recorder import active_recorder
+
+# Binance accepts at most this many symbols in one ``symbols=[...]`` call
+MAX_SYMBOLS_PER_REQUEST = 100
+
+
+class TickerTable:
+    """
+    Columnar snapshot of the latest ticker per symbol: parallel NumPy
+    arrays for price, base/quote volume and event time (int64 ns), with
+    a symbol -> row index. Rows are updated in place.
+    """
+
+    FIELDS = ('price', 'volume', 'quote_volume')
+
+    def __init__(self, capacity: int = 64) -> None:
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.price = np.full(capacity, np.nan)
+        self.volume = np.full(capacity, np.nan)
+        self.quote_volume = np.full(capacity, np.nan)
+        self.timestamp_ns = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: object) -> bool:
+        return isinstance(symbol, str) and symbol.upper() in self.index
+
+    def _row(self, symbol: str) -> int:
+        row = self.index.get(symbol)
+        if row is not None:
+            return row
+        row = len(self.symbols)
+        if row == len(self.price):
+            grow = max(len(self.price), 1)
+            for name in self.FIELDS:
+                setattr(self, name, np.concatenate(
+                    [getattr(self, name), np.full(grow, np.nan)]))
+            self.timestamp_ns = np.concatenate(
+                [self.timestamp_ns, np.zeros(grow, dtype=np.int64)])
+        self.symbols.append(symbol)
+        self.index[symbol] = row
+        return row
+
+    def update(self, symbol: str, price: float, volume: float,
+               quote_volume: float = np.nan,
+               timestamp_ns: Optional[int] = None) -> None:
+        row = self._row(symbol.upper())
+        self.price[row] = price
+        self.volume[row] = volume
+        self.quote_volume[row] = quote_volume
+        self.timestamp_ns[row] = time.time_ns() if timestamp_ns is None \
+            else timestamp_ns
+
+    def get(self, symbol: str) -> Dict[str, Any]:
+        """Returns one symbol in ``get_realtime_data`` format."""
+        row = self.index.get(symbol.upper())
+        if row is None:
+            return {'price': None, 'volume': None,
+                    'timestamp': pd.Timestamp.now()}
+        return {'price': float(self.price[row]),
+                'volume': float(self.volume[row]),
+                'timestamp': pd.Timestamp(int(self.timestamp_ns[row]))}
+
+    def filter(self, symbols: Iterable[str]) -> 'TickerTable':
+        """Returns a new table holding only ``symbols`` that are present."""
+        rows = [self.index[s.upper()] for s in symbols
+                if s.upper() in self.index]
+        out = TickerTable(capacity=max(len(rows), 1))
+        out.symbols = [self.symbols[r] for r in rows]
+        out.index = {s: i for i, s in enumerate(out.symbols)}
+        for name in self.FIELDS + ('timestamp_ns',):
+            column = getattr(self, name)[rows]
+            getattr(out, name)[:len(rows)] = column
+        return out
+
+    def to_frame(self) -> pd.DataFrame:
+        n = len(self.symbols)
+        return pd.DataFrame({
+            'price': self.price[:n],
+            'volume': self.volume[:n],
+            'quote_volume': self.quote_volume[:n],
+            'timestamp': pd.to_datetime(self.timestamp_ns[:n]),
+        }, index=pd.Index(self.symbols, name='symbol'))
+
+    def update_from_rest(self, rows: Iterable[Dict[str, Any]],
+                         only: Optional[Iterable[str]] = None) -> None:
+        """Loads ``/ticker/24hr`` rows, optionally keeping ``only``."""
+        wanted = {s.upper() for s in only} if only is not None else None
+        for row in rows:
+            if wanted is not None and row['symbol'] not in wanted:
+                continue
+            close_ms = row.get('closeTime')
+            self.update(row['symbol'], float(row['lastPrice']),
+                        float(row['volume']),
+                        float(row.get('quoteVolume', 'nan')),
+                        int(close_ms) * 1_000_000 if close_ms else None)
+
+    def update_from_stream(self, message: Any) -> int:
+        """
+        Applies a (combined) ``miniTicker``/``ticker`` stream message.
+        :return: number of symbols updated
+        """
+        data = message.get('data', message) \
+            if isinstance(message, dict) else message
+        events = data if isinstance(data, list) else [data]
+        for event in events:
+            self.update(event['s'], float(event['c']), float(event['v']),
+                        float(event.get('q', 'nan')),
+                        int(event['E']) * 1_000_000)
+        return len(events)
+
+
+def _batch_params(symbols: List[str]) -> Dict[str, Any]:
+    return {'symbols': json.dumps(symbols, separators=(',', ':'))}
+
+
+def get_realtime_data_batch(symbols: Optional[Iterable[str]] = None,
+                            table: Optional[TickerTable] = None
+                            ) -> TickerTable:
+    """
+    Fetches 24h tickers for many symbols in one request: the
+    ``symbols=[...]`` form for up to 100 symbols, the all-symbols
+    endpoint (filtered) otherwise or when ``symbols`` is None.
+    :param table: Existing table to update in place
+    """
+    table = table if table is not None else TickerTable()
+    wanted = [s.upper() for s in symbols] if symbols is not None else None
+    try:
+        if wanted is not None and len(wanted) <= MAX_SYMBOLS_PER_REQUEST:
+            rows = get_json('/api/v3/ticker/24hr', _batch_params(wanted))
+        else:
+            rows = get_json('/api/v3/ticker/24hr')
+        table.update_from_rest(rows, only=wanted)
+    except Exception as e:
+        print(f"Error fetching batched tickers: {e}")
+    return table
+
+
+async def async_get_realtime_data_batch(
+        symbols: Optional[Iterable[str]] = None,
+        table: Optional[TickerTable] = None,
+        client: Optional[AsyncBinanceClient] = None) -> TickerTable:
+    """Async variant of ``get_realtime_data_batch``."""
+    if client is None:
+        async with AsyncBinanceClient() as own_client:
+            return await async_get_realtime_data_batch(symbols, table,
+                                                       own_client)
+    table = table if table is not None else TickerTable()
+    wanted = [s.upper() for s in symbols] if symbols is not None else None
+    try:
+        if wanted is not None and len(wanted) <= MAX_SYMBOLS_PER_REQUEST:
+            rows = await client.get_json('/api/v3/ticker/24hr',
+                                         _batch_params(wanted))
+        else:
+            rows = await client.get_json('/api/v3/ticker/24hr')
+        table.update_from_rest(rows, only=wanted)
+    except Exception as e:
+        print(f"Error fetching batched tickers: {e}")
+    return table
+
+
+def ticker_stream_url(symbols: Optional[Iterable[str]] = None,
+                      ws_base_url: Optional[str] = None) -> str:
+    """Combined mini-ticker stream URL for ``symbols`` (or all symbols)."""
+    base = ws_base_url or os.getenv('BINANCE_WS_URL',
+                                    'wss://stream.binance.com:9443')
+    if symbols is None:
+        return f"{base}/ws/!miniTicker@arr"
+    streams = '/'.join(f"{s.lower()}@miniTicker" for s in symbols)
+    return f"{base}/stream?streams={streams}"
+
+
+async def binance_ws_tickers(table: TickerTable,
+                             symbols: Optional[Iterable[str]] = None,
+                             on_update: Optional[
+                                 Callable[[TickerTable], None]] = None,
+                             ws_base_url: Optional[str] = None) -> None:
+    """
+    Keeps ``table`` current from one combined WebSocket stream covering
+    all ``symbols``. Messages for symbols outside ``symbols`` (from the
+    all-market stream) are applied too; use ``TickerTable.filter``.
+    """
+    import websockets
+    url = ticker_stream_url(symbols, ws_base_url)
+    async with websockets.connect(url) as ws:
+        async for message in ws:
+            recorder = active_recorder()
+            if recorder is not None:
+                recorder.record_stream(url, message)
+            table.update_from_stream(json.loads(message))
+            if on_update:
+                on_update(table)
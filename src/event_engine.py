@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import (Any, Callable, Deque, Dict, Hashable, Iterable, List,
+                    NamedTuple, Optional)
+
+# Market-data event kinds; ``tick`` and ``book`` carry state, so only the
+# newest pending event per (kind, key) matters
+TICK = 'tick'
+BOOK = 'book'
+BAR = 'bar'
+DEFAULT_COALESCED = (TICK, BOOK)
+
+
+class Event(NamedTuple):
+    kind: str
+    key: str
+    payload: Any
+    # ``time.perf_counter()`` when the source data arrived; derived
+    # events keep it so latency is measured end to end
+    ts: float
+
+
+Handler = Callable[[Event], None]
+
+
+class EventEngine:
+    """
+    Single-consumer event loop for the trading pipeline. Producers
+    (stream threads) ``publish`` market-data events onto a bounded queue;
+    ``run`` dispatches them in arrival order to the handlers subscribed
+    to their kind. Handlers chain stages (features -> prediction ->
+    decision -> execution) by ``emit``-ting derived events, which are
+    dispatched immediately on the engine thread.
+
+    Coalescing: a pending ``tick``/``book`` event is replaced in place by
+    a newer one with the same key, so a slow consumer always sees the
+    latest state and the queue holds at most one per key. Backpressure:
+    other events (bar closes) are never merged; once ``max_pending``
+    are queued, ``publish`` blocks for up to ``publish_timeout`` and then
+    drops the event.
+
+    ``record_latency`` tracks source-to-order latency against
+    ``latency_target`` seconds.
+    """
+
+    def __init__(self, max_pending: int = 1024,
+                 coalesce: Iterable[str] = DEFAULT_COALESCED,
+                 publish_timeout: float = 1.0,
+                 latency_target: Optional[float] = None,
+                 latency_window: int = 1024) -> None:
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.max_pending = max_pending
+        self.coalesce = frozenset(coalesce)
+        self.publish_timeout = publish_timeout
+        self.latency_target = latency_target
+        self._pending: 'OrderedDict[Hashable, Event]' = OrderedDict()
+        self._queued = 0  # pending events that are not coalesced
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self.stats: Dict[str, int] = {
+            'published': 0, 'coalesced': 0, 'dropped': 0,
+            'processed': 0, 'errors': 0, 'orders': 0, 'over_target': 0}
+
+    def subscribe(self, kind: str, handler: Handler) -> None:
+        self._handlers.setdefault(kind, []).append(handler)
+
+    def publish(self, kind: str, key: str, payload: Any,
+                ts: Optional[float] = None,
+                block: bool = True) -> bool:
+        """
+        Queues a market-data event; safe to call from any thread.
+        :return: False if the event was dropped because the queue is full
+        """
+        event = Event(kind, key, payload,
+                      time.perf_counter() if ts is None else ts)
+        with self._cond:
+            if kind in self.coalesce:
+                slot: Hashable = (kind, key)
+                if slot in self._pending:
+                    self.stats['coalesced'] += 1
+                self._pending[slot] = event
+            else:
+                if self._queued >= self.max_pending:
+                    if not block or not self._cond.wait_for(
+                            lambda: self._queued < self.max_pending,
+                            self.publish_timeout):
+                        self.stats['dropped'] += 1
+                        return False
+                self._seq += 1
+                self._pending[(kind, key, self._seq)] = event
+                self._queued += 1
+            self.stats['published'] += 1
+            self._cond.notify_all()
+        return True
+
+    def emit(self, kind: str, key: str, payload: Any,
+             source: Event) -> None:
+        """Dispatches a derived event now, keeping ``source``'s time."""
+        self._dispatch(Event(kind, key, payload, source.ts))
+
+    def _dispatch(self, event: Event) -> None:
+        for handler in self._handlers.get(event.kind, ()):
+            try:
+                handler(event)
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"Event handler error for {event.kind} "
+                      f"{event.key}: {e}")
+
+    def _next(self, timeout: Optional[float]) -> Optional[Event]:
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._pending, timeout):
+                return None
+            slot, event = self._pending.popitem(last=False)
+            if len(slot) == 3:
+                self._queued -= 1
+                self._cond.notify_all()
+            return event
+
+    def run_once(self, timeout: Optional[float] = 0.0) -> bool:
+        """Dispatches the oldest pending event, waiting up to ``timeout``."""
+        event = self._next(timeout)
+        if event is None:
+            return False
+        self._dispatch(event)
+        self.stats['processed'] += 1
+        return True
+
+    def run(self, stop_event: threading.Event,
+            poll_interval: float = 0.5) -> None:
+        """Dispatches events until ``stop_event`` is set."""
+        while not stop_event.is_set():
+            self.run_once(poll_interval)
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def record_latency(self, event: Event) -> float:
+        """Records the source-to-now latency of an order's event."""
+        latency = time.perf_counter() - event.ts
+        with self._cond:
+            self._latencies.append(latency)
+            self.stats['orders'] += 1
+            if self.latency_target is not None and \
+                    latency > self.latency_target:
+                self.stats['over_target'] += 1
+        return latency
+
+    def latency_stats(self) -> Dict[str, Optional[float]]:
+        """Percentiles (seconds) over the recent latency window."""
+        with self._cond:
+            values = sorted(self._latencies)
+        if not values:
+            return {'count': 0, 'p50': None, 'p99': None, 'max': None}
+
+        def pct(q: float) -> float:
+            return values[min(len(values) - 1, int(q * len(values)))]
+        return {'count': len(values), 'p50': pct(0.5), 'p99': pct(0.99),
+                'max': values[-1]}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters, queue depth and latency for monitoring."""
+        with self._cond:
+            stats: Dict[str, Any] = dict(self.stats)
+        stats['pending'] = self.pending()
+        stats['latency'] = self.latency_stats()
+        stats['latency_target'] = self.latency_target
+        return stats
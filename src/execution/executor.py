@@ -1,29 +1,55 @@
 import os
-import time
 import pandas as pd
 import logging
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
+from src.data_ingestion.rate_limiter import (PRIORITY_ACCOUNT,
+                                             PRIORITY_ORDER,
+                                             binance_rate_limiter)
+from src.execution.order_manager import (OrderHandle, OrderManager,
+                                         UserDataStream)
+
+
+# python-binance is imported on first use in live mode, so paper trading
+# and the API server never load it
+BinanceClient: Any = None
+SIDE_BUY: Any = None
+SIDE_SELL: Any = None
+ORDER_TYPE_LIMIT: Any = None
+TIME_IN_FORCE_GTC: Any = None
+ORDER_TYPE_MARKET: Any = None
+BinanceAPIException = BinanceRequestException = Exception  # type: ignore
+_binance_imported = False
+
+
+def _import_binance() -> None:
+    global BinanceClient, SIDE_BUY, SIDE_SELL, ORDER_TYPE_LIMIT, \
+        TIME_IN_FORCE_GTC, ORDER_TYPE_MARKET, BinanceAPIException, \
+        BinanceRequestException, _binance_imported
+    if _binance_imported:
+        return
+    _binance_imported = True
+    try:
+        from binance.client import Client  # type: ignore
+        from binance.enums import (SIDE_BUY as buy,  # type: ignore
+                                   SIDE_SELL as sell,
+                                   ORDER_TYPE_LIMIT as limit,
+                                   TIME_IN_FORCE_GTC as gtc,
+                                   ORDER_TYPE_MARKET as market)
+        from binance.exceptions import (BinanceAPIException as api_error,
+                                        BinanceRequestException
+                                        as request_error)  # type: ignore
+    except ImportError:
+        print("Warning: 'python-binance' library not found."
+              "Live trading functionality will be simulated.")
+        return
+    BinanceClient = Client
+    SIDE_BUY, SIDE_SELL = buy, sell
+    ORDER_TYPE_LIMIT, TIME_IN_FORCE_GTC, ORDER_TYPE_MARKET = \
+        limit, gtc, market
+    BinanceAPIException, BinanceRequestException = api_error, request_error
 
-try:
-    from binance.client import Client as BinanceClient  # type: ignore
-    from binance.enums import (SIDE_BUY,  # type: ignore
-                               SIDE_SELL, ORDER_TYPE_LIMIT,
-                               TIME_IN_FORCE_GTC, ORDER_TYPE_MARKET
-                               )
-    from binance.exceptions import (BinanceAPIException,  # type: ignore
-                                    BinanceRequestException)
-except ImportError:
-    print("Warning: 'python-binance' library not found."
-          "Live trading functionality will be simulated.")
-    BinanceClient = None
-    SIDE_BUY = None  # type: ignore
-    SIDE_SELL = None  # type: ignore
-    ORDER_TYPE_LIMIT = None  # type: ignore
-    TIME_IN_FORCE_GTC = None  # type: ignore
-    ORDER_TYPE_MARKET = None  # type: ignore
-    BinanceAPIException = BinanceRequestException = Exception  # type: ignore
 
 load_dotenv()  # Load environment variables from .env file
 
@@ -45,6 +71,9 @@ class TradeExecutor:
         self.paper_cash: float = float(os.getenv('PAPER_STARTING_CASH',
                                                  100000.0))
         self.paper_holdings: Dict[str, float] = {}
+        # Open live orders, polled with backoff until final
+        self.orders = OrderManager(fetch_order=self._fetch_order)
+        self.user_stream: Optional[UserDataStream] = None
         self.logger = logging.getLogger('TradeExecutor')
         self.logger.setLevel(logging.INFO)
         if not self.logger.hasHandlers():
@@ -57,10 +86,12 @@ class TradeExecutor:
             self.logger.addHandler(ch)
         self.logger.info(f"TradeExecutor initialized in {self.mode} mode.")
         if self.mode == 'live':
+            _import_binance()
             if BinanceClient:
                 try:
                     self.broker_client = BinanceClient(api_key, api_secret)
-                    server_time = self.broker_client.get_server_time()
+                    server_time = self._call_broker(
+                        'get_server_time', 1, PRIORITY_ACCOUNT)
                     self.logger.info(
                         f"Connected to Binance API. Server time: \
                                             {server_time['serverTime']}"
@@ -83,6 +114,21 @@ class TradeExecutor:
                 self.logger.warning("Falling back to paper trading mode.")
                 self.mode = 'paper'
 
+    def _call_broker(self, method: str, weight: int, priority: int,
+                     is_order: bool = False, **kwargs: Any) -> Any:
+        """
+        Calls a Binance client method through ``binance_rate_limiter`` and
+        feeds the response's usage headers back into it.
+        """
+        binance_rate_limiter.acquire(weight, priority, is_order=is_order)
+        try:
+            return getattr(self.broker_client, method)(**kwargs)
+        finally:
+            response = getattr(self.broker_client, 'response', None)
+            if response is not None:
+                binance_rate_limiter.observe_response(
+                    response.status_code, response.headers)
+
     def _simulate_trade(self, symbol: str, order_type: str,
                         quantity: float, price: float) -> Dict[str, Any]:
         """
@@ -154,16 +200,40 @@ class TradeExecutor:
             'message': message
         }
 
-    def execute_trade(self, symbol: str, order_type: str,
-                      quantity: float,
-                      price: Optional[float] = None) -> Dict[str, Any]:
+    def _fetch_order(self, symbol: str, order_id: Any) -> Dict[str, Any]:
+        return self._call_broker('get_order', 4, PRIORITY_ACCOUNT,
+                                 symbol=symbol, orderId=order_id)
+
+    def start_user_stream(self) -> Optional[UserDataStream]:
         """
-        Executes a trade (buy/sell) for the given symbol and quantity.
+        Streams live order updates into ``orders`` from the user data
+        stream; polling remains the fallback for missed events.
+        """
+        if self.mode != 'live' or not self.broker_client:
+            return None
+        if self.user_stream is None:
+            self.user_stream = UserDataStream(self.orders, self._call_broker)
+            self.user_stream.start_background()
+        return self.user_stream
+
+    def close(self) -> None:
+        """Stops the user data stream and the order poller."""
+        if self.user_stream is not None:
+            self.user_stream.stop()
+            self.user_stream = None
+        self.orders.close()
+
+    def submit_order(self, symbol: str, order_type: str, quantity: float,
+                     price: Optional[float] = None) -> OrderHandle:
+        """
+        Places a trade (buy/sell) without waiting for it to fill.
         :param symbol: Trading pair symbol (e.g., 'BTCUSD')
         :param order_type: 'buy' or 'sell'
         :param quantity: Amount to trade
         :param price: Optional limit price for the order or (market price)
-        :return: dict with trade result/status
+        :return: handle of the order; paper and failed orders come back
+                 resolved, live ones resolve once ``orders`` sees them
+                 reach a final status
         """
         self.logger.info(f"Attempting to execute {order_type} \
                          order for {quantity} of {symbol} \
@@ -173,20 +243,22 @@ class TradeExecutor:
                                       else (65000.0
                                             if order_type == 'buy'
                                             else 64950.0)
-            return self._simulate_trade(symbol, order_type,
-                                        quantity, mock_price)
+            return OrderHandle.from_result(self._simulate_trade(
+                symbol, order_type, quantity, mock_price))
         elif self.mode == 'live':
             if not self.broker_client:
                 self.logger.error("Live trading client not initialized. "
                                   "Falling back to paper mode.")
-                return self._simulate_trade(symbol, order_type,
-                                            quantity, price or 65000.0)
+                return OrderHandle.from_result(self._simulate_trade(
+                    symbol, order_type, quantity, price or 65000.0))
             try:
                 ord_prms: Dict[str, Any] = {
                     'symbol': symbol,
                     'side': SIDE_BUY if order_type == 'buy'
                     else SIDE_SELL,  # type: ignore
-                    'quantity': quantity
+                    'quantity': quantity,
+                    # FULL responses list the fills of an immediate match
+                    'newOrderRespType': 'FULL'
                 }
                 if price is not None:
                     ord_prms['type'] = ORDER_TYPE_LIMIT  # type: ignore
@@ -196,64 +268,43 @@ class TradeExecutor:
                         f"Placing LIVE LIMIT {order_type.upper()} order "
                         f"for {quantity} {symbol}..."
                     )
-                    order = self.broker_client.create_order(**ord_prms)
                 else:
                     ord_prms['type'] = ORDER_TYPE_MARKET  # type: ignore
                     self.logger.info(
                         f"Placing LIVE MARKET {order_type.upper()} order "
                         f"for {quantity} {symbol}..."
                     )
-                    order = self.broker_client.create_order(**ord_prms)
+                order = self._call_broker('create_order', 1,
+                                          PRIORITY_ORDER, is_order=True,
+                                          **ord_prms)
                 self.logger.info(
                     f"LIVE TRADE: Order {order['orderId']} placed "
                     f"Status: {order['status']}"
                 )
-                if order['type'] == 'MARKET' and order['status'] == 'NEW':
-                    time.sleep(2)
-                    filled_order = self.broker_client.get_order(
-                        symbol=symbol,
-                        orderId=order['orderId']
-                    )
-                    filled_price: float = (
-                        float(filled_order['fills'][0]['price'])
-                        if filled_order['fills'] else 0.0
-                    )
-                    self.logger.info(f"LIVE TRADE: Market order \
-                                     {order['orderId']} filled at approx. \
-                                     {filled_price:.2f}")
-                    return {
-                        'status': 'success',
-                        'order_id': order['orderId'],
-                        'symbol': order['symbol'],
-                        'type': order_type,
-                        'quantity': float(order['executedQty']),
-                        'price': filled_price,
-                        'timestamp': pd.to_datetime(  # type: ignore
-                            order['updateTime'],
-                            unit='ms'
-                        ).isoformat(),
-                        'raw_response': filled_order
-                    }
-                else:
-                    return {
-                        'status': 'success',
-                        'order_id': order['orderId'],
-                        'symbol': order['symbol'],
-                        'type': order_type,
-                        'quantity': float(order['origQty']),
-                        'price': float(order.get('price', '0.0')),
-                        'timestamp': pd.to_datetime(  # type: ignore
-                            order['transactTime'],
-                            unit='ms'
-                        ).isoformat(),
-                        'raw_response': order
-                    }
+                return self.orders.track(order, side=order_type)
             except Exception as e:
                 self.logger.error(f"Error executing live trade: {e}")
-                return {'status': 'failed', 'error': str(e)}
+                return OrderHandle.from_result({'status': 'failed',
+                                                'error': str(e)})
         else:
             self.logger.error(f"Invalid execution mode: {self.mode}")
-            return {'status': 'failed', 'error': 'Invalid execution mode'}
+            return OrderHandle.from_result(
+                {'status': 'failed', 'error': 'Invalid execution mode'})
+
+    def execute_trade(self, symbol: str, order_type: str,
+                      quantity: float,
+                      price: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Executes a trade (buy/sell) for the given symbol and quantity.
+        :param symbol: Trading pair symbol (e.g., 'BTCUSD')
+        :param order_type: 'buy' or 'sell'
+        :param quantity: Amount to trade
+        :param price: Optional limit price for the order or (market price)
+        :return: dict with trade result/status; a live order that is not
+                 final yet has status 'pending' and its ``handle``
+        """
+        return self.submit_order(symbol, order_type, quantity,
+                                 price).to_result()
 
     def get_account_balance(self) -> Dict[str, Any]:
         """
@@ -272,8 +323,8 @@ class TradeExecutor:
                 return {'cash': 0.0, 'asset_holdings': {},
                         'error': 'Client not initialized'}
             try:
-                account_info: Dict[str, Any] = \
-                            self.broker_client.get_account()
+                account_info: Dict[str, Any] = self._call_broker(
+                    'get_account', 20, PRIORITY_ACCOUNT)
                 balances: Dict[str, float] = {}
                 cash_balance: float = 0.0
                 for asset in account_info['balances']:
@@ -0,0 +1,449 @@
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import (Any, Callable, Dict, Iterable, List, Mapping, Optional,
+                    Set, Tuple)
+
+# Binance order statuses that can still change; all others are final
+OPEN_STATUSES = frozenset({'NEW', 'PENDING_NEW', 'PARTIALLY_FILLED',
+                           'PENDING_CANCEL'})
+# Stream reports for orders not tracked yet (the report can arrive
+# before ``create_order`` returns), kept until ``track`` picks them up
+MAX_EARLY_REPORTS = 1000
+
+
+def _iso(ms: Optional[int]) -> str:
+    moment = datetime.now(timezone.utc) if ms is None else \
+        datetime.fromtimestamp(ms / 1000, timezone.utc)
+    return moment.replace(tzinfo=None).isoformat()
+
+
+class OrderHandle:
+    """
+    Live state of one order. ``future`` resolves with the ``execute_trade``
+    style result dict once the order reaches a final status; the price
+    in it is the VWAP over all fills.
+    """
+
+    def __init__(self, order_id: Any, symbol: str, side: str,
+                 order_type: str = 'MARKET', quantity: float = 0.0,
+                 client_order_id: Optional[str] = None) -> None:
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = side  # 'buy' or 'sell'
+        self.order_type = order_type
+        self.quantity = quantity
+        self.client_order_id = client_order_id
+        self.status = 'NEW'
+        self.executed_qty = 0.0
+        self.quote_qty = 0.0
+        self.fills: List[Dict[str, Any]] = []
+        self.update_time: Optional[int] = None
+        self.raw_response: Optional[Dict[str, Any]] = None
+        self.future: 'Future[Dict[str, Any]]' = Future()
+        self._trade_ids: Set[Any] = set()
+        self._result: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> 'OrderHandle':
+        """An already resolved handle for a paper or failed order."""
+        handle = cls(result.get('order_id'), result.get('symbol', ''),
+                     result.get('type', ''),
+                     quantity=float(result.get('quantity') or 0.0))
+        handle.status = 'FILLED' if result.get('status') == 'success' \
+            else 'REJECTED'
+        if handle.status == 'FILLED':
+            handle.executed_qty = handle.quantity
+            handle.quote_qty = handle.quantity * float(result['price'])
+        handle._result = result
+        handle.future.set_result(result)
+        return handle
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in OPEN_STATUSES
+
+    @property
+    def vwap(self) -> Optional[float]:
+        """Volume-weighted average price over all fills so far."""
+        return self.quote_qty / self.executed_qty \
+            if self.executed_qty > 0 else None
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Waits for the final result; only use off the trading loop."""
+        return self.future.result(timeout)
+
+    def add_done_callback(
+            self, fn: Callable[[Dict[str, Any]], Any]) -> None:
+        """Calls ``fn(result)`` once final (at once if already final)."""
+        self.future.add_done_callback(lambda future: fn(future.result()))
+
+    def to_result(self) -> Dict[str, Any]:
+        """
+        The order as an ``execute_trade`` result: ``'pending'`` while it
+        is open, ``'success'`` once final with any quantity filled and
+        ``'failed'`` otherwise.
+        """
+        if self._result is not None:
+            return self._result
+        if self.is_open:
+            status = 'pending'
+        else:
+            status = 'success' if self.executed_qty > 0 else 'failed'
+        return {
+            'status': status,
+            'order_id': self.order_id,
+            'symbol': self.symbol,
+            'type': self.side,
+            'quantity': self.executed_qty,
+            'price': self.vwap or 0.0,
+            'order_status': self.status,
+            'fills': len(self.fills),
+            'timestamp': _iso(self.update_time),
+            'raw_response': self.raw_response,
+            'handle': self,
+        }
+
+    def _apply(self, status: Optional[str], executed_qty: Optional[float],
+               quote_qty: Optional[float], update_time: Optional[int],
+               fills: Iterable[Dict[str, Any]] = ()) -> bool:
+        """
+        Merges one update. Polls and stream reports carry cumulative
+        quantities, so an update older than the current state is ignored
+        and a final status never reverts.
+        :return: True if the order just became final
+        """
+        for fill in fills:
+            trade_id = fill.get('tradeId')
+            if trade_id is not None:
+                if trade_id in self._trade_ids:
+                    continue
+                self._trade_ids.add(trade_id)
+            self.fills.append(fill)
+        if executed_qty is None:
+            # Only fills are known (e.g. a FULL order response)
+            executed_qty = sum(float(f['qty']) for f in self.fills)
+            quote_qty = sum(float(f['price']) * float(f['qty'])
+                            for f in self.fills)
+        if executed_qty >= self.executed_qty:
+            self.executed_qty = executed_qty
+            if quote_qty is not None:
+                self.quote_qty = quote_qty
+        if update_time is not None:
+            self.update_time = max(update_time, self.update_time or 0)
+        if status is None or not self.is_open:
+            return False
+        self.status = status
+        return not self.is_open
+
+
+def _order_update(order: Mapping[str, Any]
+                  ) -> Tuple[Optional[float], Optional[float]]:
+    """Cumulative filled and quote quantities of an order response."""
+    executed = order.get('executedQty')
+    quote = order.get('cummulativeQuoteQty')
+    if executed is None:
+        return None, None
+    quote = float(quote) if quote is not None and float(quote) >= 0 \
+        else None
+    return float(executed), quote
+
+
+class OrderManager:
+    """
+    Tracks submitted orders until they are final, without blocking the
+    caller: ``track`` returns an ``OrderHandle`` at once and updates
+    arrive from ``on_execution_report`` (user data stream) or from a
+    background poller that re-queries open orders with exponential
+    backoff. Open orders are indexed by id and by symbol.
+    """
+
+    def __init__(self,
+                 fetch_order: Optional[Callable[[str, Any],
+                                                Mapping[str, Any]]] = None,
+                 poll_interval: float = 0.5,
+                 max_poll_interval: float = 10.0,
+                 backoff: float = 2.0) -> None:
+        """
+        :param fetch_order: ``fetch_order(symbol, order_id)`` returning
+                            the exchange's order; no polling if None
+        :param poll_interval: Delay before the first poll of an open order
+        :param max_poll_interval: Cap of the backed-off poll delay
+        """
+        self.fetch_order = fetch_order
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.logger = logging.getLogger('OrderManager')
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._open: Dict[Any, OrderHandle] = {}
+        self._by_symbol: Dict[str, Set[Any]] = {}
+        self._early: 'OrderedDict[Any, Mapping[str, Any]]' = OrderedDict()
+        # Poll schedule as (due, sequence, order id, delay)
+        self._schedule: List[Tuple[float, int, Any, float]] = []
+        self._sequence = itertools.count()
+        self._poller: Optional[threading.Thread] = None
+        self._closed = False
+
+    def get(self, order_id: Any) -> Optional[OrderHandle]:
+        """The open order with this id, if any."""
+        with self._lock:
+            return self._open.get(order_id)
+
+    def open_orders(self, symbol: Optional[str] = None
+                    ) -> List[OrderHandle]:
+        """Open orders, optionally only those of ``symbol``."""
+        with self._lock:
+            if symbol is None:
+                return list(self._open.values())
+            return [self._open[i] for i in self._by_symbol.get(symbol, ())]
+
+    def track(self, order: Mapping[str, Any],
+              side: Optional[str] = None) -> OrderHandle:
+        """
+        Starts tracking an order from its ``create_order`` response.
+        Fills in a FULL response are applied at once, so a market order
+        that filled immediately comes back resolved.
+        """
+        handle = OrderHandle(
+            order['orderId'], order['symbol'],
+            side or str(order.get('side', '')).lower(),
+            order.get('type', 'MARKET'), float(order.get('origQty', 0.0)),
+            order.get('clientOrderId'))
+        handle.raw_response = dict(order)
+        executed, quote = _order_update(order)
+        if quote is None and order.get('fills'):
+            executed = None
+        with self._lock:
+            final = handle._apply(
+                order.get('status', 'NEW'), executed, quote,
+                order.get('transactTime') or order.get('updateTime'),
+                order.get('fills') or ())
+            early = self._early.pop(handle.order_id, None)
+            if early is not None and not final:
+                final = handle._apply(*self._report_update(early))
+            if not final:
+                self._open[handle.order_id] = handle
+                self._by_symbol.setdefault(handle.symbol, set()).add(
+                    handle.order_id)
+                self._push(handle.order_id, self.poll_interval)
+        if final:
+            self._resolve(handle)
+        return handle
+
+    def update(self, order: Mapping[str, Any]) -> Optional[OrderHandle]:
+        """Applies a polled order (``get_order`` response)."""
+        executed, quote = _order_update(order)
+        with self._lock:
+            handle = self._open.get(order['orderId'])
+            if handle is None:
+                return None
+            handle.raw_response = dict(order)
+            final = handle._apply(order.get('status'), executed, quote,
+                                  order.get('updateTime'))
+            if final:
+                self._forget(handle)
+        if final:
+            self._resolve(handle)
+        return handle
+
+    @staticmethod
+    def _report_update(event: Mapping[str, Any]) -> Tuple[
+            str, float, float, Optional[int], List[Dict[str, Any]]]:
+        fills = []
+        if event.get('x') == 'TRADE':
+            fills.append({'price': event['L'], 'qty': event['l'],
+                          'commission': event.get('n'),
+                          'commissionAsset': event.get('N'),
+                          'tradeId': event.get('t')})
+        return (event['X'], float(event['z']), float(event['Z']),
+                event.get('T') or event.get('E'), fills)
+
+    def on_execution_report(self, event: Mapping[str, Any]
+                            ) -> Optional[OrderHandle]:
+        """Applies a user data stream ``executionReport`` event."""
+        with self._lock:
+            handle = self._open.get(event['i'])
+            if handle is None:
+                self._early[event['i']] = event
+                while len(self._early) > MAX_EARLY_REPORTS:
+                    self._early.popitem(last=False)
+                return None
+            final = handle._apply(*self._report_update(event))
+            if final:
+                self._forget(handle)
+        if final:
+            self._resolve(handle)
+        return handle
+
+    def resync(self) -> None:
+        """Polls every open order now (e.g. after a stream reconnect)."""
+        with self._lock:
+            for order_id in self._open:
+                self._push(order_id, 0.0)
+
+    def close(self) -> None:
+        """Stops the poller; open orders stay in the index."""
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify_all()
+
+    def _forget(self, handle: OrderHandle) -> None:
+        self._open.pop(handle.order_id, None)
+        ids = self._by_symbol.get(handle.symbol)
+        if ids is not None:
+            ids.discard(handle.order_id)
+            if not ids:
+                del self._by_symbol[handle.symbol]
+
+    def _resolve(self, handle: OrderHandle) -> None:
+        # Outside the lock: callbacks may query the manager
+        self.logger.info(
+            f"Order {handle.order_id} {handle.status}: "
+            f"{handle.executed_qty} {handle.symbol} at VWAP "
+            f"{handle.vwap or 0.0:.2f} over {len(handle.fills) or 'n/a'} "
+            "fills")
+        if not handle.future.done():
+            handle.future.set_result(handle.to_result())
+
+    def _push(self, order_id: Any, delay: float) -> None:
+        """Schedules a poll; the caller holds the lock."""
+        if self.fetch_order is None or self._closed:
+            return
+        heapq.heappush(self._schedule, (time.monotonic() + delay,
+                                        next(self._sequence), order_id,
+                                        delay))
+        if self._poller is None:
+            self._poller = threading.Thread(target=self._poll_loop,
+                                            name='OrderManagerPoller',
+                                            daemon=True)
+            self._poller.start()
+        self._wakeup.notify()
+
+    def _poll_loop(self) -> None:
+        while True:
+            with self._lock:
+                while not self._closed:
+                    now = time.monotonic()
+                    if self._schedule and self._schedule[0][0] <= now:
+                        break
+                    self._wakeup.wait(self._schedule[0][0] - now
+                                      if self._schedule else None)
+                if self._closed:
+                    return
+                _, _, order_id, delay = heapq.heappop(self._schedule)
+                handle = self._open.get(order_id)
+            if handle is None:
+                continue  # final (or polled twice after a resync)
+            try:
+                self.update(self.fetch_order(handle.symbol, order_id))
+            except Exception as e:
+                self.logger.warning(f"Polling order {order_id} failed: {e}")
+            with self._lock:
+                if order_id in self._open:
+                    self._push(order_id, min(
+                        max(delay, self.poll_interval) * self.backoff,
+                        self.max_poll_interval))
+
+
+class UserDataStream:
+    """
+    Feeds ``executionReport`` events of the Binance user data stream into
+    an ``OrderManager``. The listen key is created and kept alive through
+    ``call_broker`` (``TradeExecutor._call_broker``); after every
+    (re)connect the open orders are polled once for missed events.
+    """
+
+    def __init__(self, manager: OrderManager,
+                 call_broker: Callable[..., Any],
+                 ws_base_url: Optional[str] = None,
+                 keepalive_interval: float = 1800.0,
+                 reconnect_delay: float = 1.0) -> None:
+        self.manager = manager
+        self.call_broker = call_broker
+        self.ws_base_url = ws_base_url or os.getenv(
+            'BINANCE_WS_URL', 'wss://stream.binance.com:9443')
+        self.keepalive_interval = keepalive_interval
+        self.reconnect_delay = reconnect_delay
+        self._stopping = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional['asyncio.Task[None]'] = None
+
+    def handle_message(self, event: Mapping[str, Any]) -> None:
+        # WebSocket API subscriptions wrap the payload in ``event``
+        event = event.get('event', event)
+        if event.get('e') == 'executionReport':
+            self.manager.on_execution_report(event)
+
+    async def _keepalive(self, listen_key: str) -> None:
+        from src.data_ingestion.rate_limiter import PRIORITY_ACCOUNT
+        loop = asyncio.get_running_loop()
+        while not self._stopping:
+            await asyncio.sleep(self.keepalive_interval)
+            await loop.run_in_executor(
+                None, lambda: self.call_broker(
+                    'stream_keepalive', 2, PRIORITY_ACCOUNT,
+                    listenKey=listen_key))
+
+    async def _stream(self) -> None:
+        import websockets
+
+        from src.data_ingestion.rate_limiter import PRIORITY_ACCOUNT
+        loop = asyncio.get_running_loop()
+        while not self._stopping:
+            keepalive = None
+            try:
+                listen_key = await loop.run_in_executor(
+                    None, lambda: self.call_broker(
+                        'stream_get_listen_key', 2, PRIORITY_ACCOUNT))
+                async with websockets.connect(
+                        f"{self.ws_base_url}/ws/{listen_key}") as ws:
+                    keepalive = asyncio.create_task(
+                        self._keepalive(listen_key))
+                    self.manager.resync()
+                    async for message in ws:
+                        self.handle_message(json.loads(message))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"User data stream error: {e}")
+            finally:
+                if keepalive is not None:
+                    keepalive.cancel()
+            if not self._stopping:
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def run(self) -> None:
+        """Streams account events until ``stop`` is called."""
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        try:
+            await self._stream()
+        except asyncio.CancelledError:
+            pass
+
+    def stop(self) -> None:
+        """Stops the stream; safe to call from another thread."""
+        self._stopping = True
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+
+    def start_background(self) -> threading.Thread:
+        """Runs the stream on its own event loop in a daemon thread."""
+        thread = threading.Thread(target=lambda: asyncio.run(self.run()),
+                                  name='UserDataStream', daemon=True)
+        thread.start()
+        return thread
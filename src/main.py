@@ -1,61 +1,182 @@
+import json
 import time
 import os
 from dotenv import load_dotenv
 import threading
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from src.data_ingestion import get_market_data, get_realtime_data
+from src.data_ingestion import (get_order_book_metrics, get_realtime_data,
+                                local_order_books, order_book_cache)
+from src.data_ingestion.bar_aggregator import BarAggregator, TradeBarStream
+from src.data_ingestion.kline_store import KlineStore
+from src.data_ingestion.recorder import (MarketDataRecorder, ReplayEngine,
+                                         set_recorder)
+from src.data_ingestion.tick_buffer import TickRingBuffer
+from src.ai.features import DEFAULT_FEATURES, FeaturePipeline
 from src.ai.models import AIModel
-from src.strategies.strategy import TradingStrategy
+from src.ai.online import OnlineTrainer
+from src.ai.registry import ModelRegistryError, model_registry
+from src.event_engine import BAR, BOOK, TICK, Event, EventEngine
+from src.runtime import PipelineSpec, TradingRuntime, parse_symbols
+from src.strategies.strategy import StrategyParams, TradingStrategy
 from src.execution.executor import TradeExecutor
 from src.monitoring.monitor import TradingMonitor
 
+HOUR_MS = 3_600_000
+
 # Global stop event for graceful shutdown
 bot_stop_event = threading.Event()
 
 
-def run_trading_bot(stop_event: Optional[threading.Event] = None):
+def run_multi_symbol_bot(symbols: str,
+                         stop_event: Optional[threading.Event] = None):
+    """
+    Trades every symbol in ``symbols`` (``TRADING_SYMBOLS`` format, see
+    ``parse_symbols``) concurrently on one ``TradingRuntime``, with the
+    registry's active model and one shared executor.
+    """
+    monitor = TradingMonitor(log_file='trading_bot_run.log')
+    try:
+        ai_model = model_registry.load()
+    except ModelRegistryError as e:
+        monitor.log_event('critical', f"No registry model to serve: {e}. "
+                          "Run the single-symbol bot once to train one.")
+        return
+    model_registry.serve(ai_model, model_registry.active_version())
+    params = StrategyParams(**json.loads(
+        os.getenv('STRATEGY_PARAMS') or '{}'))
+    specs = [PipelineSpec(symbol=s['symbol'], book_symbol=s['book_symbol'],
+                          strategy=TradingStrategy(ai_model, params))
+             for s in parse_symbols(symbols)]
+    executor = TradeExecutor(
+        api_key=os.getenv('BINANCE_API_KEY', 'dummy_key'),
+        api_secret=os.getenv('BINANCE_API_SECRET', 'dummy_secret'),
+        mode=os.getenv('EXECUTION_MODE', 'paper'))
+    if os.getenv('USER_DATA_STREAM', 'true').lower() == 'true' and \
+            executor.start_user_stream() is not None:
+        monitor.log_event('info', "Started user data stream for orders.")
+    runtime = TradingRuntime(
+        specs, executor, monitor,
+        max_workers=int(os.getenv('RUNTIME_WORKERS', 0)) or None,
+        step_timeout=float(os.getenv('RUNTIME_STEP_TIMEOUT_SECONDS', 10)),
+        min_decision_seconds=float(os.getenv('EVENT_MIN_DECISION_SECONDS',
+                                             1.0)))
+    thread = runtime.start_background(stop_event or bot_stop_event)
+    try:
+        while thread.is_alive():
+            thread.join(float(os.getenv('TRADING_CYCLE_INTERVAL_SECONDS',
+                                        300)))
+            if thread.is_alive():
+                monitor.log_event('info', "Pipeline metrics: "
+                                  f"{runtime.snapshot()}")
+    except KeyboardInterrupt:
+        monitor.log_event('info', "Bot stopped manually (KeyboardInterrupt).")
+        runtime.stop()
+        thread.join(5)
+    finally:
+        executor.close()
+        model_registry.serve(None)
+        monitor.log_event('info', "Trading bot finished.")
+
+
+def run_trading_bot(stop_event: Optional[threading.Event] = None,
+                    cycle_interval: Optional[float] = None):
+    # Several symbols run on the concurrent runtime instead
+    symbols = os.getenv('TRADING_SYMBOLS')
+    if symbols:
+        return run_multi_symbol_bot(symbols, stop_event)
+
     # 1. Initialize Components
     monitor = TradingMonitor(log_file='trading_bot_run.log')
     monitor.log_event('info', "Initializing trading bot components...")
 
+    # Serve the registry's active version (checksum-verified and
+    # memory-mapped); fall back to the legacy model file, otherwise
+    # train on real historical data
     ai_model = AIModel()
-    # Try to load a pre-trained model, otherwise train on real historical data
     model_loaded = False
+    model_version = model_registry.active_version()
     try:
-        ai_model.load_model()
-        if ai_model.is_trained:
-            model_loaded = True
-            monitor.log_event('info', "Loaded pre-trained AI model.")
-    except Exception as e:
-        monitor.log_event('warning', f"Could not load pre-trained model: {e}")
+        ai_model = model_registry.load(model_version)
+        model_loaded = True
+        monitor.log_event('info',
+                          f"Loaded AI model version {model_version}.")
+    except ModelRegistryError as e:
+        monitor.log_event('warning', f"No registry model loaded: {e}")
+        model_version = None
+        try:
+            ai_model.load_model()
+            if ai_model.is_trained:
+                model_loaded = True
+                monitor.log_event('info', "Loaded pre-trained AI model.")
+        except Exception as e:
+            monitor.log_event('warning',
+                              f"Could not load pre-trained model: {e}")
+
+    # Optionally record all market data traffic for offline replay
+    record_path = os.getenv('MARKET_DATA_RECORD_PATH')
+    recorder = MarketDataRecorder(record_path) if record_path else None
+    if recorder is not None:
+        set_recorder(recorder)
+        monitor.log_event('info', f"Recording market data to {record_path}.")
+
+    # Keep a local kline history: only bars newer than the last stored
+    # bar are downloaded, so restarts and retraining read from disk.
+    kline_store = KlineStore(os.getenv('KLINE_STORE_DIR', 'data/klines'))
+    added = kline_store.sync('BTCUSD', '1h', lookback_bars=1000)
+    historical_data = kline_store.read('BTCUSD', '1h', limit=1000)
+    monitor.log_event('info',
+                      f"Synced {added} new bars; using "
+                      f"{len(historical_data)} rows of BTCUSD history.")
+    if historical_data.empty:
+        monitor.log_event('critical', "No BTCUSD history available. "
+                          "Cannot start trading bot.")
+        if recorder is not None:
+            set_recorder(None)
+            recorder.close()
+        return
+
+    # One feature schema for training and live inference; a loaded model
+    # keeps its own columns when the pipeline knows them
+    if model_loaded and not FeaturePipeline.supports(ai_model.feature_names):
+        monitor.log_event('warning', "Loaded model uses unknown features "
+                          f"{ai_model.feature_names}; retraining.")
+        model_loaded = False
+    features = FeaturePipeline(ai_model.feature_names if model_loaded
+                               else DEFAULT_FEATURES)
 
     if not model_loaded:
-        # Use real historical data for training
-        historical_data = get_market_data(symbol='BTCUSD', limit=1000)
-        monitor.log_event('info',
-                          f"Fetched {len(historical_data)} \
-                          rows of historical market data for BTCUSD.")
-        # Example feature engineering: price_change,
-        # volume_change, and target signal
-        historical_data['price_change'] = (
-            historical_data['close'].pct_change().fillna(0)  # type: ignore
-        )
-        historical_data['volume_change'] = (
-            historical_data['volume'].pct_change().fillna(0)  # type: ignore
-        )
-        # Dummy signal: 1 if price_change > 0 else 0
-        historical_data['signal'] = (historical_data['price_change']
-                                     > 0).astype(int)
-        X = historical_data[['price_change', 'volume_change']]
-        y = historical_data['signal']  # type: ignore
+        X = features.transform_batch(historical_data)
+        # Dummy signal: 1 if the bar closed higher else 0
+        y = (historical_data['close'].pct_change().fillna(0)  # type: ignore
+             > 0).astype(int)
         ai_model.train(X, y)  # type: ignore
-        ai_model.save_model()
+        predicted, _ = ai_model.predict_batch(X)
+        model_version = model_registry.register(
+            ai_model,
+            training_range={'symbol': 'BTCUSD', 'interval': '1h',
+                            'start': str(historical_data.index[0]),
+                            'end': str(historical_data.index[-1]),
+                            'rows': len(historical_data)},
+            metrics={'train_accuracy': float((predicted == y).mean())})
         monitor.log_event('info',
-                          "Trained AI model on historical data "
-                          "and saved model.")
+                          "Trained AI model on historical data and "
+                          f"registered it as version {model_version}.")
+    # Lets the API hot-swap registry versions into the running model
+    model_registry.serve(ai_model, model_version)
 
-    strategy = TradingStrategy(ai_model=ai_model)
+    # Thresholds as JSON, e.g. the best row of a parameter sweep
+    strategy = TradingStrategy(
+        ai_model=ai_model,
+        params=StrategyParams(**json.loads(
+            os.getenv('STRATEGY_PARAMS') or '{}')))
+
+    # Live features continue from the last closed bar of the history,
+    # and ticks are kept in a bounded in-memory history
+    features.warm_start(historical_data)
+    last_bar_open = historical_data.index[-1].value // 1_000_000  # ms
+    last_bar_close = float(historical_data['close'].iloc[-1])
+    ticks = TickRingBuffer(int(os.getenv('TICK_BUFFER_CAPACITY', 4096)))
 
     # Configure executor mode based on environment variable
     execution_mode = os.getenv('EXECUTION_MODE', 'paper')
@@ -64,12 +185,191 @@ def run_trading_bot(stop_event: Optional[threading.Event] = None):
         api_secret=os.getenv('BINANCE_API_SECRET', 'dummy_secret'),
         mode=execution_mode
     )
+    if os.getenv('USER_DATA_STREAM', 'true').lower() == 'true' and \
+            executor.start_user_stream() is not None:
+        monitor.log_event('info', "Started user data stream for orders.")
+
+    # Event-driven mode reacts to stream events instead of polling every
+    # TRADING_CYCLE_INTERVAL_SECONDS; it needs the trade and depth streams
+    event_driven = os.getenv('TRADING_LOOP', 'interval').lower() == 'event'
+    engine = None
+    if event_driven:
+        engine = EventEngine(
+            max_pending=int(os.getenv('EVENT_QUEUE_SIZE', 1024)),
+            latency_target=float(os.getenv('EVENT_LATENCY_TARGET_MS',
+                                           250)) / 1000)
+
+    # Optionally keep the BTCUSDT book in memory from the depth stream
+    if event_driven or \
+            os.getenv('LOCAL_ORDER_BOOK', 'false').lower() == 'true':
+        if engine is not None:
+            local_order_books.on_update = lambda book: engine.publish(
+                BOOK, book.symbol, book.last_update_id)
+        local_order_books.start_background(['BTCUSDT'])
+        monitor.log_event('info', "Started local order book for BTCUSDT.")
+
+    # Optionally build live bars from the trade stream so the reference
+    # bar follows each closed hour instead of the start-up history
+    trade_bars = None
+    if event_driven or \
+            os.getenv('TRADE_BAR_STREAM', 'false').lower() == 'true':
+        aggregator = BarAggregator(intervals=('1m', '1h'))
+        if engine is not None:
+            aggregator.on_bar = lambda key, bar: engine.publish(BAR, key, bar)
+            aggregator.on_trade = lambda price, qty, ts_ms: engine.publish(
+                TICK, 'BTCUSDT', (price, qty, ts_ms))
+        trade_bars = TradeBarStream(aggregator, 'BTCUSDT')
+        trade_bars.start_background()
+        monitor.log_event('info', "Started BTCUSDT trade bar stream.")
+
+    # Optionally keep the model current with background rolling-window
+    # refits on newly closed bars (same target as the start-up training)
+    online = None
+    if os.getenv('ONLINE_LEARNING', 'false').lower() == 'true':
+        online = OnlineTrainer(
+            ai_model, window=int(os.getenv('ONLINE_WINDOW_BARS', 1000)),
+            refit_every=int(os.getenv('ONLINE_REFIT_EVERY_BARS', 24)))
+        online.seed(features.transform_batch(historical_data),
+                    (historical_data['close'].pct_change().fillna(0)
+                     > 0).astype(int))
+        monitor.log_event('info', "Online learning enabled.")
 
     monitor.log_event('info',
                       "Trading bot components initialized successfully.")
 
-    # Main Trading Loop
+    def advance_bar(bar_open: int, bar_close: float,
+                    bar_volume: float) -> None:
+        """Advances features (and the online model) by a closed bar."""
+        nonlocal last_bar_open, last_bar_close
+        last_bar_open = int(bar_open)
+        row = features.update_bar(bar_close, bar_volume)
+        label = int(bar_close > last_bar_close)
+        last_bar_close = float(bar_close)
+        if online is not None and online.add_sample(row, label):
+            monitor.log_event('info', "Scheduled online refit "
+                              f"(model version {online.version}).")
+
+    def record_trade(trade_result: Dict[str, Any]) -> None:
+        monitor.log_event('info', f"Order {trade_result.get('order_id')} "
+                          "finished.", trade_details=trade_result)
+        monitor.update_metrics(trade_result=trade_result)
+
+    def execute_decision(decision: str) -> Dict[str, Any]:
+        quantity = 0.0001  # example
+        trade_result = executor.execute_trade('BTCUSD', decision, quantity)
+        monitor.log_event('info', f"{decision.capitalize()} order executed.",
+                          trade_details=trade_result)
+        if trade_result.get('status') == 'pending':
+            # Live order still open: metrics follow once it is final
+            trade_result['handle'].add_done_callback(record_trade)
+        else:
+            monitor.update_metrics(trade_result=trade_result)
+        return trade_result
+
+    def report_metrics() -> None:
+        balance = executor.get_account_balance()
+        latest = ticks.latest()
+        monitor.update_metrics(current_balance=balance,
+                               mark_price=latest[1] if latest else None)
+        monitor.update_order_book_metrics(symbol='BTCUSDT', limit=10)
+        monitor.log_event('info',
+                          f"Current Bot Metrics: "
+                          f"{monitor.get_current_metrics()}")
+
+    if engine is not None:
+        # Stages subscribe to each other's events: tick -> features ->
+        # prediction -> decision -> execution. Ticks are coalesced, and
+        # at most one decision is made per EVENT_MIN_DECISION_SECONDS.
+        # The strategy is stateless, so only a change of direction from
+        # the last placed order is executed; otherwise every tick with
+        # the same signal would place another order.
+        min_decision_gap = float(os.getenv('EVENT_MIN_DECISION_SECONDS',
+                                           1.0))
+        last_decision = float('-inf')
+        last_order: Optional[str] = None
+
+        def on_bar(event: Event) -> None:
+            bar = event.payload
+            if event.key == '1h' and bar['open_time'] > last_bar_open:
+                advance_bar(bar['open_time'], bar['close'], bar['volume'])
+
+        def on_book(event: Event) -> None:
+            # The next tick recomputes metrics from the updated book
+            order_book_cache.invalidate(event.key)
+
+        def on_tick(event: Event) -> None:
+            nonlocal last_decision
+            price, qty, ts_ms = event.payload
+            ticks.append(price, qty, ts_ms * 1_000_000)
+            if time.monotonic() - last_decision < min_decision_gap:
+                return
+            last_decision = time.monotonic()
+            # Volume of the open hour, comparable to closed-bar volume
+            open_bar = trade_bars.aggregator.partial('1h')  # type: ignore
+            volume = open_bar['volume'] if open_bar else qty
+            ob_metrics = get_order_book_metrics('BTCUSDT')
+            market_data = {'price': price, 'volume': volume,
+                           'timestamp': ts_ms}
+            engine.emit('features', event.key, (market_data, ob_metrics,
+                        features.transform_tick(price, volume, ob_metrics,
+                                                key=ts_ms)), event)
+
+        def on_features(event: Event) -> None:
+            market_data, ob_metrics, ai_features = event.payload
+            ai_prediction = ai_model.predict(ai_features,  # type: ignore
+                                             order_book_metrics=ob_metrics)
+            engine.emit('prediction', event.key,
+                        (market_data, ob_metrics, ai_prediction), event)
+
+        def on_prediction(event: Event) -> None:
+            market_data, ob_metrics, ai_prediction = event.payload
+            decision = strategy.make_decision(
+                market_data, ai_prediction, order_book_metrics=ob_metrics)
+            if decision in ('buy', 'sell') and decision != last_order:
+                engine.emit('decision', event.key, decision, event)
+
+        def on_decision(event: Event) -> None:
+            nonlocal last_order
+            if event.payload == last_order:
+                return  # a queued duplicate of the order just placed
+            trade_result = execute_decision(event.payload)
+            if trade_result.get('status') in ('success', 'pending'):
+                last_order = event.payload
+            latency = engine.record_latency(event)
+            if engine.latency_target is not None and \
+                    latency > engine.latency_target:
+                monitor.log_event('warning', "Tick-to-order latency "
+                                  f"{latency * 1000:.1f} ms exceeds the "
+                                  f"{engine.latency_target * 1000:.0f} ms "
+                                  "target.")
+
+        for kind, handler in ((BAR, on_bar), (BOOK, on_book),
+                              (TICK, on_tick), ('features', on_features),
+                              ('prediction', on_prediction),
+                              ('decision', on_decision)):
+            engine.subscribe(kind, handler)
+
     try:
+        if engine is not None:
+            monitor.log_event('info', "Running event-driven trading loop.")
+            report_every = float(os.getenv('TRADING_CYCLE_INTERVAL_SECONDS',
+                                           300)
+                                 if cycle_interval is None
+                                 else cycle_interval)
+            next_report = time.monotonic() + report_every
+            stop = stop_event or threading.Event()
+            while not stop.is_set():
+                engine.run_once(timeout=0.5)
+                if time.monotonic() >= next_report:
+                    next_report = time.monotonic() + report_every
+                    report_metrics()
+                    monitor.log_event('info', "Event engine: "
+                                      f"{engine.snapshot()}")
+            monitor.log_event('info', "Stop event received. "
+                              "Exiting trading loop.")
+            return
+
+        # Main Trading Loop
         while True:
             if stop_event and stop_event.is_set():
                 monitor.log_event('info', "Stop event received. "
@@ -77,6 +377,8 @@ def run_trading_bot(stop_event: Optional[threading.Event] = None):
                 break
 
             monitor.log_event('info', "--- Starting new trading cycle ---")
+            # Force one fresh depth snapshot shared by all stages below
+            order_book_cache.invalidate('BTCUSDT')
 
             # 2. Data Ingestion
             current_market_data = get_realtime_data(symbol='BTCUSD')
@@ -85,62 +387,65 @@ def run_trading_bot(stop_event: Optional[threading.Event] = None):
                 monitor.log_event('error',
                                   "Failed to get current market. "
                                   "Skipping cycle.")
-                time.sleep(60)
+                if stop_event:
+                    stop_event.wait(60)
+                else:
+                    time.sleep(60)
                 continue
 
+            ticks.append(current_market_data['price'],
+                         current_market_data.get('volume') or 0.0)
+
+            # Advance features (and the online model) by each bar closed
+            # since the last cycle, from the trade stream or the store
+            if trade_bars is not None:
+                last_hour = trade_bars.aggregator.last_closed('1h')
+                if last_hour is not None and \
+                        last_hour['open_time'] > last_bar_open:
+                    advance_bar(last_hour['open_time'], last_hour['close'],
+                                last_hour['volume'])
+            elif online is not None and \
+                    time.time() * 1000 >= last_bar_open + 2 * HOUR_MS:
+                kline_store.sync('BTCUSD', '1h', lookback_bars=1000)
+                # Only bars that opened at least an hour ago have closed
+                fresh = kline_store.read(
+                    'BTCUSD', '1h', start=last_bar_open + 1,
+                    end=int(time.time() * 1000) - HOUR_MS)
+                for bar in zip(fresh.index.as_unit('ns').asi8 // 1_000_000,
+                               fresh['close'], fresh['volume']):
+                    advance_bar(*bar)
+
             # Prepare features for AI model using real-time data
-            price_change = (  # type: ignore
-                (current_market_data.get('price', 0) -
-                 historical_data['close'].iloc[-1]) /  # type: ignore
-                historical_data['close'].iloc[-1]  # type: ignore
-            )
-            volume_change = (  # type: ignore
-                (current_market_data.get('volume', 0) -
-                 historical_data['volume'].iloc[-1]) /  # type: ignore
-                historical_data['volume'].iloc[-1]  # type: ignore
-            )
-            ai_features = {'price_change': price_change,  # type: ignore
-                           'volume_change': volume_change}
-
-            # 3. AI Prediction
-            ai_prediction = ai_model.predict(ai_features)  # type: ignore
+            ob_metrics = get_order_book_metrics('BTCUSDT')
+            tick_ts, tick_price, tick_volume = ticks.latest()  # type: ignore
+            ai_features = features.transform_tick(
+                tick_price, tick_volume, ob_metrics, key=tick_ts)
+
+            # 3. AI Prediction, enriched with this cycle's order book
+            ai_prediction = ai_model.predict(ai_features,  # type: ignore
+                                             order_book_metrics=ob_metrics)
             monitor.log_event('info', f"AI predicted: {ai_prediction} "
                               f"for market data: {current_market_data}")
 
             # 4. Trading Strategy Decision
-            decision = strategy.make_decision(current_market_data,
-                                              ai_prediction)
+            decision = strategy.make_decision(
+                current_market_data, ai_prediction,
+                order_book_metrics=ob_metrics)
             monitor.log_event('info', f"Strategy decision: {decision}")
 
             # 5. Trade Execution
-            if decision == 'buy':
-                quantity_to_buy = 0.0001  # example
-                trade_result = executor.execute_trade('BTCUSD', 'buy',
-                                                      quantity_to_buy)
-                monitor.log_event('info', "Buy order executed.",
-                                  trade_details=trade_result)
-                monitor.update_metrics(trade_result=trade_result)
-            elif decision == 'sell':
-                quantity_to_sell = 0.0001  # example
-                trade_result = executor.execute_trade('BTCUSD', 'sell',
-                                                      quantity_to_sell)
-                monitor.log_event('info', "Sell order executed.",
-                                  trade_details=trade_result)
-                monitor.update_metrics(trade_result=trade_result)
+            if decision in ('buy', 'sell'):
+                execute_decision(decision)
             else:
                 monitor.log_event('info',
                                   "Holding. No trade executed this cycle.")
 
             # 6. Monitoring and Metrics Update
-            current_balance = executor.get_account_balance().get('cash')
-            monitor.update_metrics(current_balance=current_balance)
-            monitor.update_order_book_metrics(symbol='BTCUSDT', limit=10)
-            monitor.log_event('info',
-                              f"Current Bot Metrics: "
-                              f"{monitor.get_current_metrics()}")
+            report_metrics()
 
             # 7. Pause before next cycle
-            sleep_time = int(os.getenv('TRADING_CYCLE_INTERVAL_SECONDS', 300))
+            sleep_time = int(os.getenv('TRADING_CYCLE_INTERVAL_SECONDS', 300)
+                             if cycle_interval is None else cycle_interval)
             monitor.log_event('info', f"Sleeping for {sleep_time} seconds...")
             for _ in range(sleep_time):
                 if stop_event and stop_event.is_set():
@@ -158,9 +463,40 @@ def run_trading_bot(stop_event: Optional[threading.Event] = None):
         monitor.log_event('critical', f"An unexpected error occurred: {e}")
         monitor.send_alert(f"Critical error in trading bot: {e}")
     finally:
+        executor.close()
+        model_registry.serve(None)
+        local_order_books.on_update = None
+        local_order_books.stop()
+        if trade_bars is not None:
+            trade_bars.stop()
+        if online is not None:
+            online.close(wait=False)
+        if recorder is not None:
+            set_recorder(None)
+            recorder.close()
         monitor.log_event('info', "Trading bot finished.")
 
 
+def replay_trading_bot(log_path: str, speed: Optional[float] = None):
+    """
+    Runs the full trading pipeline against a recorded market data log
+    (see ``MARKET_DATA_RECORD_PATH``) instead of Binance, without cycle
+    pauses, until the recorded tickers run out.
+    :param speed: None for as fast as possible, 1.0 for real time
+    :return: replay statistics including requests per second
+    """
+    stop_event = threading.Event()
+
+    def on_exhausted(path: str) -> None:
+        if path == '/api/v3/ticker/24hr':
+            stop_event.set()
+
+    with ReplayEngine(log_path, speed=speed,
+                      on_exhausted=on_exhausted) as replay:
+        run_trading_bot(stop_event=stop_event, cycle_interval=0)
+    return replay.stats()
+
+
 if __name__ == "__main__":
     load_dotenv()
     # TRADING_CYCLE_INTERVAL_SECONDS=60
@@ -1,14 +1,23 @@
 from fastapi import FastAPI, BackgroundTasks
 import os
 import threading
-from src.main import run_trading_bot, bot_stop_event
 from src.monitoring.monitor import TradingMonitor
+from src.data_ingestion.rate_limiter import binance_rate_limiter
+from src.ai.registry import ModelRegistryError, model_registry
 from typing import Dict, Any
 
 app = FastAPI()
 bot_thread = None
 bot_running = False
 monitor_instance = TradingMonitor(log_file='trading_bot_run.log')
+# src.main (pandas, scikit-learn, python-binance, ...) is imported by the
+# bot thread on /start, so the server answers right after a cold start
+bot_stop_event = threading.Event()
+
+
+def _run_bot(stop_event: threading.Event) -> None:
+    from src.main import run_trading_bot
+    run_trading_bot(stop_event=stop_event)
 
 
 @app.get("/")
@@ -31,8 +40,8 @@ def start_bot(background_tasks: BackgroundTasks) -> Dict[str, Any]:
     global bot_thread, bot_running
     if not bot_running:
         bot_stop_event.clear()
-        bot_thread = threading.Thread(target=run_trading_bot,
-                                      kwargs={"stop_event": bot_stop_event},
+        bot_thread = threading.Thread(target=_run_bot,
+                                      args=(bot_stop_event,),
                                       daemon=True)
         bot_thread.start()
         bot_running = True
@@ -83,4 +92,33 @@ def update_settings(settings: Dict[str, Any]) -> Dict[str, Any]:
 @app.get("/metrics")
 def get_metrics() -> Dict[str, Any]:
     metrics = monitor_instance.get_current_metrics()
-    return {"metrics": metrics}
+    return {"metrics": metrics,
+            "rate_limits": binance_rate_limiter.stats()}
+
+
+@app.get("/model")
+def get_model() -> Dict[str, Any]:
+    return {
+        "served_version": model_registry.served_version,
+        "active_version": model_registry.active_version(),
+        "versions": model_registry.versions()
+    }
+
+
+@app.get("/model/{version}")
+def get_model_version(version: int) -> Dict[str, Any]:
+    try:
+        return model_registry.manifest(version)
+    except ModelRegistryError as e:
+        return {"message": str(e)}
+
+
+@app.post("/model/swap")
+def swap_model(settings: Dict[str, Any]) -> Dict[str, Any]:
+    # Hot-swaps the running bot to a registry version (default: active)
+    try:
+        manifest = model_registry.swap(settings.get('version'))
+    except ModelRegistryError as e:
+        return {"message": f"Model swap failed: {e}"}
+    return {"message": f"Now serving model version {manifest['version']}",
+            "model": manifest}
@@ -1,6 +1,8 @@
 import logging
-from typing import Any, Optional, Dict
-from src.data_ingestion import get_order_book_metrics
+import threading
+from typing import Any, Optional, Dict, Union
+
+from src.monitoring.performance import PerformanceTracker
 
 
 class TradingMonitor:
@@ -14,6 +16,10 @@ class TradingMonitor:
             'total_profit_loss': 0.0,
             'current_balance': 0.0
         }
+        # Streaming trade/equity statistics, updated per fill and sample
+        self.performance = PerformanceTracker()
+        # Live orders report their fills from the order poller's thread
+        self._lock = threading.Lock()
 
     def _setup_logger(self):
         logger = logging.getLogger('TradingBot')
@@ -58,18 +64,47 @@ class TradingMonitor:
             self.logger.debug(message)
 
     def update_metrics(self, trade_result: Optional[Dict[str, Any]] = None,
-                       current_balance: Optional[float] = None):
-        """Updates internal performance metrics."""
-        if trade_result:
-            self.performance_metrics['trades_executed'] += 1
-            if trade_result.get('status') == 'success':
-                self.performance_metrics['total_profit_loss'] += \
-                                        trade_result.get('profit_loss', 0)
-                if trade_result.get('profit_loss', 0) > 0:
-                    self.performance_metrics['profitable_trades'] += 1
-        if current_balance is not None:
-            self.performance_metrics['current_balance'] = current_balance
-        self.log_event('info', f"Metrics Updated: {self.performance_metrics}")
+                       current_balance: Union[float, Dict[str, Any],
+                                              None] = None,
+                       mark_price: Optional[float] = None):
+        """
+        Updates internal performance metrics.
+        :param current_balance: Cash, or a ``get_account_balance`` dict;
+                                a dict with an ``'error'`` is ignored
+        :param mark_price: Price to value the tracked position at; with
+                           ``current_balance`` it adds an equity sample
+        """
+        if isinstance(current_balance, dict):
+            # A failed balance call reports zero cash, not a real sample
+            current_balance = None if 'error' in current_balance \
+                else current_balance.get('cash')
+        with self._lock:
+            if trade_result:
+                self.performance_metrics['trades_executed'] += 1
+                if trade_result.get('status') == 'success':
+                    if 'profit_loss' in trade_result:
+                        self.performance.close_trade(
+                            trade_result['profit_loss'])
+                    elif trade_result.get('price'):
+                        self.performance.record_fill(
+                            trade_result['type'],
+                            float(trade_result['price']),
+                            float(trade_result['quantity']),
+                            float(trade_result.get('fee', 0.0)))
+            if current_balance is not None:
+                self.performance_metrics['current_balance'] = current_balance
+                if mark_price is not None:
+                    self.performance.update_equity(
+                        current_balance
+                        + self.performance.position * mark_price)
+            performance = self.performance.snapshot()
+            self.performance_metrics['total_profit_loss'] = \
+                performance['total_pnl']
+            self.performance_metrics['profitable_trades'] = \
+                performance['wins']
+            self.performance_metrics['performance'] = performance
+            self.log_event('info',
+                           f"Metrics Updated: {self.performance_metrics}")
 
     def send_alert(self, message: str):
         """Sends an alert (e.g., via email, SMS, or Slack)."""
@@ -83,10 +118,12 @@ class TradingMonitor:
     def update_order_book_metrics(self, symbol: str = 'BTCUSDT',
                                   limit: int = 10):
         """Fetch and log order book metrics for monitoring and analytics."""
+        from src.data_ingestion import get_order_book_metrics
         metrics = get_order_book_metrics(symbol, limit)
         self.performance_metrics.update({
             'order_book_spread': metrics['spread'],
             'order_book_imbalance': metrics['imbalance'],
+            'order_book_microprice': metrics.get('microprice'),
             'order_book_vwap_bid': metrics['vwap_bid'],
             'order_book_vwap_ask': metrics['vwap_ask'],
             'order_book_bid_qty': metrics['bid_qty'],
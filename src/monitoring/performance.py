@@ -0,0 +1,283 @@
+import math
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Mapping, Optional
+
+# The batch functions import NumPy when called; the monitor (and with it
+# the API server) only needs the NumPy-free ``PerformanceTracker``
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _ratio(num: float, den: float) -> Optional[float]:
+    # Undefined statistics (no trades, flat equity) are None, so the
+    # metrics stay JSON-serializable for the API
+    return float(num / den) if den > 0 else None
+
+
+def _annualize(periods_per_year: Optional[float]) -> float:
+    return math.sqrt(periods_per_year) if periods_per_year else 1.0
+
+
+def trade_pnl(side: Any, entry_price: Any, exit_price: Any,
+              quantity: Any, fees: Any = 0.0) -> 'np.ndarray':
+    """
+    Net PnL per closed trade.
+    :param side: +1 (or 'buy') for long trades, -1 (or 'sell') for shorts
+    """
+    import numpy as np
+    side = np.asarray(side)
+    if side.dtype.kind in 'US':
+        side = np.where(side == 'buy', 1.0, -1.0)
+    return (np.asarray(side, dtype=np.float64)
+            * (np.asarray(exit_price, dtype=np.float64)
+               - np.asarray(entry_price, dtype=np.float64))
+            * np.asarray(quantity, dtype=np.float64)
+            - np.asarray(fees, dtype=np.float64))
+
+
+def trade_stats(pnl: Any) -> Dict[str, Any]:
+    """
+    Statistics over closed trades' PnL. Breakeven trades are counted
+    separately and left out of the win rate.
+    """
+    import numpy as np
+    pnl = np.asarray(pnl, dtype=np.float64)
+    wins, losses = pnl > 0, pnl < 0
+    n_wins, n_losses = int(wins.sum()), int(losses.sum())
+    gross_profit = float(pnl[wins].sum())
+    gross_loss = float(-pnl[losses].sum())
+    return {
+        'trades': int(len(pnl)),
+        'total_pnl': float(pnl.sum()),
+        'wins': n_wins,
+        'losses': n_losses,
+        'breakeven': int(len(pnl)) - n_wins - n_losses,
+        'win_rate': _ratio(n_wins, n_wins + n_losses) or 0.0,
+        'gross_profit': gross_profit,
+        'gross_loss': gross_loss,
+        'profit_factor': _ratio(gross_profit, gross_loss),
+        'avg_win': _ratio(gross_profit, n_wins),
+        'avg_loss': _ratio(-gross_loss, n_losses) if n_losses else None,
+        'expectancy': _ratio(float(pnl.sum()), len(pnl)),
+    }
+
+
+def equity_stats(equity: Any, periods_per_year: Optional[float] = None,
+                 position: Optional[Any] = None,
+                 traded_notional: float = 0.0,
+                 initial: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Return and risk statistics of an equity curve sampled once per
+    period.
+    :param periods_per_year: Annualizes Sharpe/Sortino (e.g. 8760 for
+                             hourly samples); per-period ratios if None
+    :param position: Position per sample, for the exposure
+    :param traded_notional: Absolute notional traded, for the turnover
+    :param initial: Equity before the first sample (e.g. starting cash)
+    """
+    import numpy as np
+    equity = np.asarray(equity, dtype=np.float64)
+    if initial is not None:
+        equity = np.concatenate(([initial], equity))
+    returns = equity[1:] / equity[:-1] - 1.0
+    n = len(returns)
+    mean = float(returns.mean()) if n else 0.0
+    std = float(returns.std(ddof=1)) if n > 1 else 0.0
+    downside = math.sqrt(float(np.mean(np.minimum(returns, 0.0) ** 2))) \
+        if n else 0.0
+    scale = _annualize(periods_per_year)
+    peak = np.maximum.accumulate(equity) if len(equity) else equity
+    sharpe, sortino = _ratio(mean, std), _ratio(mean, downside)
+    return {
+        'total_return': float(equity[-1] / equity[0] - 1.0)
+        if len(equity) else 0.0,
+        'mean_return': mean,
+        'volatility': std * scale,
+        'sharpe': None if sharpe is None else sharpe * scale,
+        'sortino': None if sortino is None else sortino * scale,
+        'max_drawdown': float((equity / peak - 1.0).min())
+        if len(equity) else 0.0,
+        'turnover': _ratio(traded_notional, float(equity.mean()))
+        if len(equity) else None,
+        'exposure': float((np.asarray(position) != 0).mean())
+        if position is not None and len(position) else None,
+    }
+
+
+def period_returns(equity: Any, freq: str = 'D') -> Any:
+    """
+    Returns per calendar period (``'D'``, ``'W'``, ``'M'``...) of an
+    equity ``Series`` with a datetime index; the first period is
+    measured from the first sample.
+    """
+    closes = equity.resample(freq).last().dropna()
+    returns = closes.pct_change()
+    if len(closes):
+        returns.iloc[0] = closes.iloc[0] / equity.iloc[0] - 1.0
+    return returns
+
+
+def round_trip_pnl(trades: Mapping[str, 'np.ndarray']) -> 'np.ndarray':
+    """
+    Net PnL of the round trips in ``BacktestResult.trades``. Fills there
+    are one lot each and long-only, so the k-th sell closes the k-th buy.
+    """
+    import numpy as np
+    side = np.asarray(trades['side'])
+    price = np.asarray(trades['price'], dtype=np.float64)
+    fee = np.asarray(trades['fee'], dtype=np.float64)
+    quantity = np.asarray(trades['quantity'], dtype=np.float64)
+    buys, sells = np.flatnonzero(side > 0), np.flatnonzero(side < 0)
+    buys = buys[:len(sells)]
+    return trade_pnl(1.0, price[buys], price[sells], quantity[sells],
+                     fee[buys] + fee[sells])
+
+
+def backtest_stats(result: Any, starting_cash: float,
+                   periods_per_year: Optional[float] = None
+                   ) -> Dict[str, Any]:
+    """Trade and equity statistics of a ``BacktestResult``."""
+    import numpy as np
+    trades = result.trades
+    notional = float(np.sum(np.asarray(trades['price'])
+                            * np.asarray(trades['quantity'])))
+    return {**trade_stats(round_trip_pnl(trades)),
+            **equity_stats(result.equity, periods_per_year,
+                           result.position, notional,
+                           initial=starting_cash),
+            'final_equity': float(result.equity[-1])
+            if len(result.equity) else starting_cash,
+            'fees': float(np.sum(trades['fee']))}
+
+
+class PerformanceTracker:
+    """
+    Streaming version of ``trade_stats`` and ``equity_stats``: fills
+    are matched FIFO against open lots and every closed lot updates the
+    trade counters; equity samples update running moments (Welford) and
+    the drawdown. Each update is O(1) per closed lot, so the live bot
+    can report full statistics after every fill.
+    """
+
+    def __init__(self, periods_per_year: Optional[float] = None) -> None:
+        self.periods_per_year = periods_per_year
+        # Open lots as [signed quantity, price, fee per unit]
+        self._lots: Deque[List[float]] = deque()
+        self.position = 0.0
+        self._trades = self._wins = self._losses = 0
+        self._total_pnl = self._gross_profit = self._gross_loss = 0.0
+        self._traded_notional = 0.0
+        self._initial: Optional[float] = None
+        self._last_equity: Optional[float] = None
+        self._peak = 0.0
+        self._max_drawdown = 0.0
+        self._samples = self._exposed = 0
+        self._equity_sum = 0.0
+        self._n = 0
+        self._mean = self._m2 = self._downside_sq = 0.0
+
+    def close_trade(self, pnl: float) -> None:
+        """Records a closed trade's net PnL."""
+        self._trades += 1
+        self._total_pnl += pnl
+        if pnl > 0:
+            self._wins += 1
+            self._gross_profit += pnl
+        elif pnl < 0:
+            self._losses += 1
+            self._gross_loss -= pnl
+
+    def record_fill(self, side: str, price: float, quantity: float,
+                    fee: float = 0.0) -> List[float]:
+        """
+        Applies a fill; the part that reduces the position closes open
+        lots oldest first.
+        :return: net PnL of each lot closed by this fill
+        """
+        sign = 1.0 if side == 'buy' else -1.0
+        remaining = quantity
+        fee_per_unit = fee / quantity if quantity else 0.0
+        closed = []
+        while remaining > 0 and self._lots and \
+                self._lots[0][0] * sign < 0:
+            lot = self._lots[0]
+            matched = min(remaining, abs(lot[0]))
+            # The lot's side is -sign
+            pnl = -sign * (price - lot[1]) * matched \
+                - (lot[2] + fee_per_unit) * matched
+            self.close_trade(pnl)
+            closed.append(pnl)
+            lot[0] += sign * matched
+            remaining -= matched
+            if abs(lot[0]) <= 1e-12:
+                self._lots.popleft()
+        if remaining > 1e-12:
+            self._lots.append([sign * remaining, price, fee_per_unit])
+        self.position += sign * quantity
+        self._traded_notional += price * quantity
+        return closed
+
+    def update_equity(self, equity: float,
+                      position: Optional[float] = None) -> None:
+        """
+        Adds an equity sample (one per period for Sharpe/Sortino). A
+        return or drawdown relative to zero or negative equity is
+        undefined and skipped.
+        """
+        if self._last_equity is None:
+            self._initial = self._peak = equity
+        elif self._last_equity > 0:
+            r = equity / self._last_equity - 1.0
+            self._n += 1
+            delta = r - self._mean
+            self._mean += delta / self._n
+            self._m2 += delta * (r - self._mean)
+            self._downside_sq += min(r, 0.0) ** 2
+        self._last_equity = equity
+        self._peak = max(self._peak, equity)
+        if self._peak > 0:
+            self._max_drawdown = min(self._max_drawdown,
+                                     equity / self._peak - 1.0)
+        self._samples += 1
+        self._equity_sum += equity
+        held = self.position if position is None else position
+        self._exposed += held != 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current statistics, with the keys of the batch functions."""
+        trades = self._trades
+        decided = self._wins + self._losses
+        scale = _annualize(self.periods_per_year)
+        std = math.sqrt(self._m2 / (self._n - 1)) if self._n > 1 else 0.0
+        downside = math.sqrt(self._downside_sq / self._n) if self._n \
+            else 0.0
+        sharpe, sortino = _ratio(self._mean, std), \
+            _ratio(self._mean, downside)
+        return {
+            'trades': trades,
+            'total_pnl': self._total_pnl,
+            'wins': self._wins,
+            'losses': self._losses,
+            'breakeven': trades - decided,
+            'win_rate': _ratio(self._wins, decided) or 0.0,
+            'gross_profit': self._gross_profit,
+            'gross_loss': self._gross_loss,
+            'profit_factor': _ratio(self._gross_profit, self._gross_loss),
+            'avg_win': _ratio(self._gross_profit, self._wins),
+            'avg_loss': _ratio(-self._gross_loss, self._losses)
+            if self._losses else None,
+            'expectancy': _ratio(self._total_pnl, trades),
+            'total_return': self._last_equity / self._initial - 1.0
+            if self._initial else 0.0,
+            'mean_return': self._mean,
+            'volatility': std * scale,
+            'sharpe': None if sharpe is None else sharpe * scale,
+            'sortino': None if sortino is None else sortino * scale,
+            'max_drawdown': self._max_drawdown,
+            'turnover': _ratio(self._traded_notional,
+                               self._equity_sum / self._samples)
+            if self._samples else None,
+            'exposure': self._exposed / self._samples
+            if self._samples else None,
+            'position': self.position,
+        }
@@ -0,0 +1,387 @@
+import asyncio
+import contextlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from src.monitoring.performance import PerformanceTracker
+
+# Above this many symbols one all-market ticker stream is cheaper than a
+# combined stream URL listing every symbol
+MAX_STREAM_SYMBOLS = 200
+
+
+class PipelineSpec(NamedTuple):
+    """One (symbol, strategy, model) pipeline hosted by the runtime."""
+    symbol: str                        # ticker and order symbol
+    strategy: Any                      # ``TradingStrategy``
+    model: Any = None                  # default: ``strategy.ai_model``
+    book_symbol: Optional[str] = None  # default: ``symbol``
+    quantity: float = 0.0001
+    interval: str = '1h'               # bar interval of the features
+    name: Optional[str] = None         # default: ``symbol``
+
+
+class _Pipeline:
+    """
+    Runtime state of one pipeline, touched by its own task and its one
+    running step; fills are recorded on the runtime loop.
+    """
+
+    def __init__(self, spec: PipelineSpec) -> None:
+        self.spec = spec
+        self.name = spec.name or spec.symbol.upper()
+        self.symbol = spec.symbol.upper()
+        self.book_symbol = (spec.book_symbol or spec.symbol).upper()
+        self.model = spec.model if spec.model is not None \
+            else spec.strategy.ai_model
+        self.features: Any = None
+        self.last_bar_open: Optional[int] = None
+        self.wake: Optional[asyncio.Event] = None  # set up by ``run``
+        self.busy: Optional['asyncio.Future[Any]'] = None
+        self.last_ts = 0
+        self.last_decision = float('-inf')
+        self.failures = 0
+        self.retry_at = 0.0
+        self.performance = PerformanceTracker()
+        self.stats: Dict[str, Any] = {
+            'steps': 0, 'orders': 0, 'errors': 0, 'timeouts': 0,
+            'skipped': 0, 'last_error': None, 'last_step_ms': None}
+
+
+class TradingRuntime:
+    """
+    Hosts many trading pipelines on one asyncio loop. Market data is
+    shared: one ticker WebSocket (with a batched REST poll while it is
+    down) updates a ``TickerTable`` for every symbol, order books come
+    through ``order_book_cache``/``local_order_books``, and all orders go
+    through one ``TradeExecutor``.
+
+    Each pipeline is its own task and runs its blocking work (bar
+    updates, order book, prediction, decision, order) on a shared thread
+    pool, one step at a time. Ticker updates are coalesced: a busy
+    pipeline sees only the newest price once it is free. A step that
+    fails or exceeds ``step_timeout`` only backs off its own pipeline
+    (exponentially, up to ``max_backoff`` seconds); the others keep
+    trading. A step that is past its timeout, or still running when the
+    runtime stops, places no order.
+    """
+
+    def __init__(self, specs: Iterable[PipelineSpec], executor: Any,
+                 monitor: Optional[Any] = None,
+                 max_workers: Optional[int] = None,
+                 step_timeout: float = 10.0,
+                 min_decision_seconds: float = 1.0,
+                 max_backoff: float = 300.0,
+                 warmup_bars: int = 1000,
+                 poll_interval: float = 5.0,
+                 ws_base_url: Optional[str] = None) -> None:
+        from src.data_ingestion.tickers import TickerTable
+        self.pipelines: Dict[str, _Pipeline] = {}
+        for spec in specs:
+            pipe = _Pipeline(spec)
+            if pipe.name in self.pipelines:
+                raise ValueError(f"Duplicate pipeline name: {pipe.name}")
+            self.pipelines[pipe.name] = pipe
+        self.symbols = sorted({p.symbol for p in self.pipelines.values()})
+        self.executor = executor
+        self.monitor = monitor
+        self.max_workers = max_workers or min(64,
+                                              len(self.pipelines) + 4)
+        self.step_timeout = step_timeout
+        self.min_decision_seconds = min_decision_seconds
+        self.max_backoff = max_backoff
+        self.warmup_bars = warmup_bars
+        self.poll_interval = poll_interval
+        self.ws_base_url = ws_base_url
+        self.tickers = TickerTable(capacity=max(len(self.symbols), 1))
+        self._last_stream_update = float('-inf')
+        # TradeExecutor's paper book is not thread-safe; live orders are
+        # submitted concurrently so a slow one does not hold up the rest
+        self._order_lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional['asyncio.Task[None]'] = None
+        self._stopping = False
+
+    def _log(self, level: str, message: str) -> None:
+        if self.monitor is not None:
+            self.monitor.log_event(level, message)
+        else:
+            print(message)
+
+    # Shared market data
+
+    def _on_tickers(self, table: Any = None) -> None:
+        self._last_stream_update = time.monotonic()
+        self._wake_all()
+
+    def _wake_all(self) -> None:
+        for pipe in self.pipelines.values():
+            if pipe.wake is not None:
+                pipe.wake.set()
+
+    async def _stream_tickers(self) -> None:
+        from src.data_ingestion.tickers import binance_ws_tickers
+        symbols = self.symbols if len(self.symbols) <= MAX_STREAM_SYMBOLS \
+            else None
+        while not self._stopping:
+            try:
+                await binance_ws_tickers(self.tickers, symbols,
+                                         on_update=self._on_tickers,
+                                         ws_base_url=self.ws_base_url)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._log('warning', f"Ticker stream error: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _poll_tickers(self) -> None:
+        """Batched REST tickers whenever the stream has gone quiet."""
+        from src.data_ingestion.tickers import async_get_realtime_data_batch
+        while not self._stopping:
+            if time.monotonic() - self._last_stream_update > \
+                    self.poll_interval:
+                await async_get_realtime_data_batch(self.symbols,
+                                                    self.tickers)
+                self._wake_all()
+            await asyncio.sleep(self.poll_interval)
+
+    # Per-pipeline work (thread pool)
+
+    def _warm_up(self, pipe: _Pipeline) -> None:
+        from src.ai.features import FeaturePipeline
+        from src.data_ingestion import get_market_data
+        history = get_market_data(pipe.symbol, limit=self.warmup_bars,
+                                  interval=pipe.spec.interval)
+        if history.empty:
+            raise RuntimeError(f"No {pipe.symbol} history")
+        features = FeaturePipeline(pipe.model.feature_names)
+        features.warm_start(history)
+        pipe.last_bar_open = history.index[-1].value // 1_000_000
+        pipe.features = features
+
+    def _advance_bars(self, pipe: _Pipeline, now_ms: int) -> None:
+        """Feeds bars closed since the last one into the features."""
+        from src.data_ingestion import get_market_data
+        from src.data_ingestion.kline_store import interval_to_ms
+        interval_ms = interval_to_ms(pipe.spec.interval)
+        if pipe.last_bar_open is None or \
+                now_ms < pipe.last_bar_open + 2 * interval_ms:
+            return
+        fresh = get_market_data(pipe.symbol, limit=100,
+                                interval=pipe.spec.interval,
+                                start_time=pipe.last_bar_open + 1,
+                                end_time=now_ms - interval_ms)
+        if fresh.empty:
+            return
+        opens = fresh.index.as_unit('ns').asi8 // 1_000_000
+        for open_ms, close, volume in zip(opens, fresh['close'],
+                                          fresh['volume']):
+            pipe.features.update_bar(close, volume)
+            pipe.last_bar_open = int(open_ms)
+
+    def _step(self, pipe: _Pipeline, price: float, volume: float,
+              ts_ns: int, deadline: float) -> Optional[Dict[str, Any]]:
+        """
+        One decision for ``pipe`` on the latest ticker.
+        :param deadline: ``time.monotonic()`` after which the price is
+                         stale and no order may be placed
+        """
+        from src.data_ingestion import get_order_book_metrics
+        if pipe.features is None:
+            self._warm_up(pipe)
+        self._advance_bars(pipe, ts_ns // 1_000_000)
+        ob_metrics = get_order_book_metrics(pipe.book_symbol)
+        row = pipe.features.transform_tick(price, volume, ob_metrics,
+                                           key=ts_ns)
+        prediction = pipe.model.predict(row, order_book_metrics=ob_metrics)
+        decision = pipe.spec.strategy.make_decision(
+            {'price': price, 'volume': volume}, prediction,
+            symbol=pipe.book_symbol, order_book_metrics=ob_metrics)
+        if decision not in ('buy', 'sell'):
+            return None
+        paper = getattr(self.executor, 'mode', 'paper') != 'live'
+        with self._order_lock if paper else contextlib.nullcontext():
+            # The loop stops waiting for a step at its deadline, but the
+            # thread runs on; a late or stopping step must not trade
+            late = time.monotonic() > deadline
+            if late or self._stopping:
+                if not late:
+                    # Stopping: no task is left to count the timeout
+                    pipe.stats['timeouts'] += 1
+                self._log('warning', f"[{pipe.name}] {decision.capitalize()}"
+                          " order skipped: step is past its deadline or "
+                          "the runtime is stopping.")
+                raise TimeoutError(f"step exceeded {self.step_timeout}s")
+            result = self.executor.execute_trade(pipe.symbol, decision,
+                                                 pipe.spec.quantity)
+        if self.monitor is not None:
+            with self._order_lock:
+                self.monitor.log_event(
+                    'info', f"[{pipe.name}] {decision.capitalize()} order "
+                    "executed.", trade_details=result)
+        if result.get('status') == 'pending':
+            # Open live order: its fills count once it is final
+            result['handle'].add_done_callback(
+                lambda final: self._on_order_done(pipe, final))
+        else:
+            self._on_order_done(pipe, result)
+        return result
+
+    def _on_order_done(self, pipe: _Pipeline,
+                       result: Dict[str, Any]) -> None:
+        """
+        Hands a final order to the runtime loop; it arrives on a pool or
+        order poller thread and ``PerformanceTracker`` is not thread-safe.
+        """
+        try:
+            self._loop.call_soon_threadsafe(  # type: ignore
+                self._record_fill, pipe, result)
+        except RuntimeError:
+            # The loop is closed: the runtime has stopped
+            self._record_fill(pipe, result)
+
+    @staticmethod
+    def _record_fill(pipe: _Pipeline, result: Dict[str, Any]) -> None:
+        if result.get('status') == 'success' and result.get('price'):
+            pipe.performance.record_fill(result['type'],
+                                         float(result['price']),
+                                         float(result['quantity']))
+
+    async def _run_pipeline(self, pipe: _Pipeline) -> None:
+        loop = asyncio.get_running_loop()
+        assert pipe.wake is not None
+        while not self._stopping:
+            await pipe.wake.wait()
+            pipe.wake.clear()
+            now = time.monotonic()
+            if now < pipe.retry_at or \
+                    now - pipe.last_decision < self.min_decision_seconds:
+                continue
+            if pipe.busy is not None and not pipe.busy.done():
+                # A timed-out step still holds a worker thread
+                pipe.stats['skipped'] += 1
+                continue
+            row = self.tickers.index.get(pipe.symbol)
+            if row is None:
+                continue
+            ts_ns = int(self.tickers.timestamp_ns[row])
+            if ts_ns == pipe.last_ts:
+                continue
+            pipe.last_ts = ts_ns
+            pipe.last_decision = now
+            pipe.busy = loop.run_in_executor(
+                self._pool, self._step, pipe,
+                float(self.tickers.price[row]),
+                float(self.tickers.volume[row]), ts_ns,
+                now + self.step_timeout)
+            try:
+                result = await asyncio.wait_for(asyncio.shield(pipe.busy),
+                                                self.step_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._fail(pipe, e)
+            else:
+                pipe.failures = 0
+                pipe.stats['steps'] += 1
+                if result is not None:
+                    pipe.stats['orders'] += 1
+            pipe.stats['last_step_ms'] = (time.monotonic() - now) * 1000
+
+    def _fail(self, pipe: _Pipeline, error: BaseException) -> None:
+        pipe.failures += 1
+        if isinstance(error, asyncio.TimeoutError):
+            pipe.stats['timeouts'] += 1
+            error = TimeoutError(f"step exceeded {self.step_timeout}s")
+        else:
+            pipe.stats['errors'] += 1
+        delay = min(self.max_backoff, 2.0 ** (pipe.failures - 1))
+        pipe.retry_at = time.monotonic() + delay
+        pipe.stats['last_error'] = str(error)
+        self._log('warning', f"[{pipe.name}] Pipeline step failed "
+                  f"({error}); retrying in {delay:.0f}s.")
+
+    # Lifecycle
+
+    async def run(self, stop_event: Optional[threading.Event] = None,
+                  stream: bool = True) -> None:
+        """
+        Runs every pipeline until ``stop`` is called or ``stop_event``
+        is set.
+        :param stream: False to use only the REST ticker poll
+        """
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                        thread_name_prefix='pipeline')
+        for pipe in self.pipelines.values():
+            pipe.wake = asyncio.Event()
+        tasks = [asyncio.create_task(self._run_pipeline(p))
+                 for p in self.pipelines.values()]
+        tasks.append(asyncio.create_task(self._poll_tickers()))
+        if stream:
+            tasks.append(asyncio.create_task(self._stream_tickers()))
+        self._log('info', f"Trading runtime started with "
+                  f"{len(self.pipelines)} pipelines on "
+                  f"{len(self.symbols)} symbols.")
+        try:
+            while not self._stopping and \
+                    not (stop_event and stop_event.is_set()):
+                await asyncio.sleep(0.5)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._stopping = True
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._log('info', "Trading runtime stopped.")
+
+    def stop(self) -> None:
+        """Stops the runtime; safe to call from another thread."""
+        self._stopping = True
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+
+    def start_background(self, stop_event: Optional[threading.Event] = None,
+                         stream: bool = True) -> threading.Thread:
+        """Runs the runtime on its own event loop in a daemon thread."""
+        thread = threading.Thread(
+            target=lambda: asyncio.run(self.run(stop_event, stream)),
+            name='TradingRuntime', daemon=True)
+        thread.start()
+        return thread
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-pipeline counters and realized trade statistics."""
+        now = time.monotonic()
+        out = {}
+        for name, pipe in self.pipelines.items():
+            out[name] = {
+                **pipe.stats,
+                'symbol': pipe.symbol,
+                'warm': pipe.features is not None,
+                'backoff_seconds': max(0.0, pipe.retry_at - now),
+                'performance': pipe.performance.snapshot(),
+            }
+        return out
+
+
+def parse_symbols(value: str) -> List[Dict[str, str]]:
+    """
+    Parses ``TRADING_SYMBOLS``: comma-separated ``SYMBOL`` or
+    ``SYMBOL:BOOK_SYMBOL`` entries (e.g. ``BTCUSD:BTCUSDT,ETHUSDT``).
+    """
+    out = []
+    for item in value.split(','):
+        item = item.strip().upper()
+        if not item:
+            continue
+        symbol, _, book = item.partition(':')
+        out.append({'symbol': symbol, 'book_symbol': book or symbol})
+    return out
@@ -0,0 +1,104 @@
+"""
+Import-time benchmark for the API server and the bot entry point.
+
+Each target is imported in a fresh interpreter, which reports the
+import latency, peak resident memory and which heavy dependencies got
+loaded. Run with ``python -m src.startup_benchmark``.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+# What ``uvicorn src.mcp_server:app`` and ``python -m src.main`` import
+# before serving / trading
+TARGETS = {'server': 'src.mcp_server', 'bot': 'src.main'}
+# Dependencies that should only load once a subsystem is used
+HEAVY_MODULES = ('pandas', 'numpy', 'scipy', 'sklearn', 'joblib',
+                 'binance', 'src.main')
+
+_PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - started
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    'import_seconds': seconds,
+    'max_rss_mb': rss / (1 << 20 if sys.platform == 'darwin' else 1 << 10),
+    'heavy_modules': [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure(module: str, cwd: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Imports ``module`` in a new interpreter.
+    :return: ``import_seconds``, ``process_seconds`` (including interpreter
+             start-up), ``max_rss_mb`` and loaded ``heavy_modules``
+    """
+    cwd = cwd or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    started = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, '-c', _PROBE.format(module=module,
+                                             heavy=HEAVY_MODULES)],
+        cwd=cwd, capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result['process_seconds'] = time.perf_counter() - started
+    return result
+
+
+def run(targets: Sequence[str] = tuple(TARGETS),
+        repeat: int = 5) -> Dict[str, Dict[str, Any]]:
+    """Median import latency and memory per target over ``repeat`` runs."""
+    report = {}
+    for name in targets:
+        runs: List[Dict[str, Any]] = [measure(TARGETS[name])
+                                      for _ in range(repeat)]
+        report[name] = {
+            'module': TARGETS[name],
+            'import_seconds': statistics.median(
+                r['import_seconds'] for r in runs),
+            'process_seconds': statistics.median(
+                r['process_seconds'] for r in runs),
+            'max_rss_mb': statistics.median(r['max_rss_mb'] for r in runs),
+            'heavy_modules': runs[-1]['heavy_modules'],
+        }
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('targets', nargs='*', default=list(TARGETS),
+                        help=f"any of {', '.join(TARGETS)}")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true',
+                        help="print the report as JSON")
+    parser.add_argument('--max-seconds', type=float,
+                        help="fail if a median import takes longer")
+    args = parser.parse_args(argv)
+    unknown = set(args.targets) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+    report = run(args.targets, args.repeat)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for name, r in report.items():
+            print(f"{name:<7} {r['module']:<15} "
+                  f"import {r['import_seconds'] * 1000:8.1f} ms  "
+                  f"process {r['process_seconds'] * 1000:8.1f} ms  "
+                  f"rss {r['max_rss_mb']:7.1f} MB  "
+                  f"heavy: {', '.join(r['heavy_modules']) or '-'}")
+    if args.max_seconds is not None and any(
+            r['import_seconds'] > args.max_seconds for r in report.values()):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
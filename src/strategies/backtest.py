@@ -0,0 +1,176 @@
+import json
+from typing import Any, Dict, NamedTuple, Optional
+from urllib.parse import parse_qs
+
+import numpy as np
+import pandas as pd
+
+from src.data_ingestion.order_book_analytics import (compute_metrics_batch,
+                                                     stack_order_books)
+from src.strategies.strategy import HOLD, TradingStrategy
+
+ORDER_BOOK_COLUMNS = ('spread', 'imbalance')
+
+
+class BacktestResult(NamedTuple):
+    """Per-bar arrays (aligned with ``index``) and the executed trades."""
+    index: pd.Index
+    prediction: np.ndarray
+    signal: np.ndarray      # BUY/SELL/HOLD decided on each bar
+    executed: np.ndarray    # fills on each bar (+1/-1/0)
+    position: np.ndarray    # units held after each bar
+    cash: np.ndarray
+    equity: np.ndarray      # cash + position marked at the close
+    trades: Dict[str, np.ndarray]  # bar, side, price, quantity, fee
+
+
+def order_book_from_log(path: str, symbol: str = 'BTCUSDT',
+                        depth: int = 10) -> pd.DataFrame:
+    """
+    Order book metrics of every depth snapshot recorded by
+    ``MarketDataRecorder`` for ``symbol``, indexed by receive time.
+    :param depth: Levels used per side (the live bot uses 10)
+    """
+    from src.data_ingestion.recorder import KIND_REST, read_log
+    books, received = [], []
+    for record in read_log(path):
+        if record.kind != KIND_REST:
+            continue
+        rest_path, _, query = record.channel.partition('?')
+        if rest_path == '/api/v3/depth' and \
+                parse_qs(query).get('symbol') == [symbol.upper()]:
+            books.append(json.loads(record.payload))
+            received.append(record.recv_ns)
+    index = pd.to_datetime(np.asarray(received, dtype=np.int64), unit='ns')
+    if not books:
+        return pd.DataFrame(columns=list(ORDER_BOOK_COLUMNS), index=index)
+    metrics = compute_metrics_batch(**stack_order_books(books, depth))
+    return pd.DataFrame({name: metrics[name] for name in metrics
+                         if np.ndim(metrics[name]) == 1},
+                        index=index).sort_index()
+
+
+def align_order_book(bars: pd.DataFrame,
+                     order_book: pd.DataFrame) -> pd.DataFrame:
+    """
+    The newest order book row known at each bar's close (``close_time``
+    column, else the index); NaN before the first snapshot.
+    """
+    when = bars['close_time'] if 'close_time' in bars else bars.index
+    # Compare in one unit: the indexes may be ms/us rather than ns
+    when = np.asarray(pd.DatetimeIndex(when).as_unit('ns').asi8)
+    known = np.asarray(
+        pd.DatetimeIndex(order_book.index).as_unit('ns').asi8)
+    pos = np.searchsorted(known, when, side='right') - 1
+    out = {}
+    for name in ORDER_BOOK_COLUMNS:
+        # Leading NaN slot for bars before the first snapshot
+        values = np.full(len(known) + 1, np.nan)
+        if name in order_book:
+            values[1:] = order_book[name].to_numpy(dtype=np.float64)
+        out[name] = values[pos + 1]
+    return pd.DataFrame(out, index=bars.index)
+
+
+def predict_bars(bars: pd.DataFrame, model: Any,
+                 features: Optional[Any] = None) -> np.ndarray:
+    """
+    AI predictions for every bar in one ``predict_batch`` call.
+    :param features: ``FeaturePipeline`` (default: the model's schema)
+    """
+    from src.ai.features import FeaturePipeline
+    pipeline = features if features is not None \
+        else FeaturePipeline(model.feature_names)
+    predictions, _ = model.predict_batch(pipeline.transform_batch(bars))
+    return np.asarray(predictions)
+
+
+def _cash_flows(executed: np.ndarray, price: np.ndarray, quantity: float,
+                starting_cash: float, fee_rate: float):
+    """Fee and running cash per bar."""
+    notional = np.where(executed != 0, executed * quantity * price, 0.0)
+    fees = np.abs(notional) * fee_rate
+    return fees, starting_cash - np.cumsum(notional + fees)
+
+
+def _fill_sequential(signal: np.ndarray, price: np.ndarray,
+                     quantity: float, starting_cash: float,
+                     fee_rate: float) -> np.ndarray:
+    """Paper fills with the cash check, visiting only signal bars."""
+    executed = np.zeros(len(signal), dtype=np.int8)
+    cash, units = starting_cash, 0
+    for i in np.flatnonzero(signal).tolist():
+        notional = quantity * float(price[i])
+        if signal[i] > 0 and cash >= notional * (1.0 + fee_rate):
+            cash -= notional * (1.0 + fee_rate)
+            units += 1
+            executed[i] = 1
+        elif signal[i] < 0 and units > 0:
+            cash += notional * (1.0 - fee_rate)
+            units -= 1
+            executed[i] = -1
+    return executed
+
+
+def backtest(bars: pd.DataFrame, strategy: TradingStrategy,
+             predictions: Optional[Any] = None,
+             features: Optional[Any] = None,
+             order_book: Optional[pd.DataFrame] = None,
+             quantity: float = 0.0001,
+             starting_cash: float = 100000.0,
+             fee_rate: float = 0.0,
+             fill_at_next_open: bool = False) -> BacktestResult:
+    """
+    Runs ``strategy`` over a bar history in vectorized form: features
+    and AI predictions for all bars at once (``predict_batch``), the
+    strategy rules via ``decide_batch``, then paper fills like
+    ``TradeExecutor`` (buy ``quantity`` if cash allows, sell only from
+    holdings).
+
+    :param predictions: Precomputed AI predictions per bar; otherwise
+                        ``strategy.ai_model`` predicts from ``features``
+    :param features: ``FeaturePipeline`` (default: the model's schema)
+    :param order_book: Recorded order book metrics (e.g. from
+                       ``order_book_from_log``), aligned to bar closes
+    :param fill_at_next_open: Fill at the next bar's open instead of
+                              the signal bar's close
+    """
+    close = bars['close'].to_numpy(dtype=np.float64)
+    if order_book is not None:
+        bars = bars.assign(**align_order_book(bars, order_book))
+    prediction = np.asarray(predict_bars(bars, strategy.ai_model, features)
+                            if predictions is None else predictions)
+    spread, imbalance = (bars[name].to_numpy(dtype=np.float64)
+                         if name in bars else None
+                         for name in ORDER_BOOK_COLUMNS)
+    signal = strategy.decide_batch(close, prediction, spread, imbalance)
+
+    orders, price = signal, close
+    if fill_at_next_open:
+        orders = np.roll(signal, 1)
+        orders[:1] = HOLD
+        price = bars['open'].to_numpy(dtype=np.float64)
+    # Holdings can't go negative: the unit count is the order walk
+    # reflected at zero, so rejected sells need no loop
+    walk = np.cumsum(orders, dtype=np.int64)
+    units = walk - np.minimum(np.minimum.accumulate(walk), 0)
+    executed = np.diff(units, prepend=0).astype(np.int8)
+    fees, cash = _cash_flows(executed, price, quantity, starting_cash,
+                             fee_rate)
+    if len(cash) and cash.min() < 0:
+        # Cash ran out somewhere: buys there must fail, which depends on
+        # the path, so replay the order bars with the cash check
+        executed = _fill_sequential(orders, price, quantity,
+                                    starting_cash, fee_rate)
+        units = np.cumsum(executed, dtype=np.int64)
+        fees, cash = _cash_flows(executed, price, quantity,
+                                 starting_cash, fee_rate)
+    position = units * quantity
+    equity = cash + position * close
+    bar = np.flatnonzero(executed)
+    trades = {'bar': bar, 'side': executed[bar], 'price': price[bar],
+              'quantity': np.full(len(bar), quantity), 'fee': fees[bar]}
+    return BacktestResult(index=bars.index, prediction=prediction,
+                          signal=signal, executed=executed,
+                          position=position, cash=cash, equity=equity,
+                          trades=trades)
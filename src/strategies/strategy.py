@@ -1,28 +1,48 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Mapping, NamedTuple, Optional
+import numpy as np
 from src.data_ingestion import get_order_book_metrics
+from src.monitoring.performance import trade_pnl, trade_stats
+
+# Vectorized decision codes (``decide_batch``)
+HOLD, BUY, SELL = 0, 1, -1
+
+
+class StrategyParams(NamedTuple):
+    """Decision thresholds of ``TradingStrategy``."""
+    buy_below: float = 66000.0     # AI buy is taken under this price
+    sell_above: float = 64000.0    # AI sell is taken over this price
+    max_spread: float = 5.0        # order book rules need a tighter spread
+    buy_imbalance: float = 0.0     # book buy needs imbalance above this
+    sell_imbalance: float = 0.0    # book sell needs imbalance below this
 
 
 class TradingStrategy:
 
-    def __init__(self, ai_model: Any):
+    def __init__(self, ai_model: Any,
+                 params: Optional[StrategyParams] = None):
         self.ai_model = ai_model
-        # Placeholder for other strategy parameters
+        self.params = params or StrategyParams()
 
     def make_decision(
         self,
         market_data: Dict[str, Any],
         ai_prediction: int,
-        symbol: str = 'BTCUSDT'
+        symbol: str = 'BTCUSDT',
+        order_book_metrics: Optional[Mapping[str, Any]] = None
     ) -> str:
         """
         Makes a trading decision on current market data and AI prediction.
         :param market_data: dict of current market data
         :param ai_prediction: The output from the AI model
+        :param order_book_metrics: Metrics the caller already has;
+                                   fetched for ``symbol`` otherwise
         :return: 'buy', 'sell', or 'hold'
         """
-        ob_metrics = get_order_book_metrics(symbol)
+        ob_metrics = order_book_metrics if order_book_metrics is not None \
+            else get_order_book_metrics(symbol)
         spread = ob_metrics['spread']
         imbalance = ob_metrics['imbalance']
+        p = self.params
         current_price = market_data.get('price')
 
         if current_price is None:
@@ -30,14 +50,14 @@ class TradingStrategy:
             return 'hold'
 
         # Example production logic: combine AI and order book signals
-        if ai_prediction == 1 and current_price < 66000:
+        if ai_prediction == 1 and current_price < p.buy_below:
             print(
                 f"Strategy: AI recommends BUY and "
                 f"price is favorable ({current_price}). "
                 "Decision: Buy"
             )
             return 'buy'
-        elif ai_prediction == 0 and current_price > 64000:
+        elif ai_prediction == 0 and current_price > p.sell_above:
             print(
                 f"Strategy: AI recommends SELL "
                 f"and price is high ({current_price}). "
@@ -45,8 +65,9 @@ class TradingStrategy:
             )
             return 'sell'
         elif (
-            ai_prediction == 1 and spread is not None and spread < 5 and
-            imbalance is not None and imbalance > 0
+            ai_prediction == 1 and spread is not None and
+            spread < p.max_spread and
+            imbalance is not None and imbalance > p.buy_imbalance
         ):
             print(
                 f"Strategy: AI recommends BUY, spread={spread}, "
@@ -55,8 +76,9 @@ class TradingStrategy:
             )
             return 'buy'
         elif (
-            ai_prediction == 0 and spread is not None and spread < 5 and
-            imbalance is not None and imbalance < 0
+            ai_prediction == 0 and spread is not None and
+            spread < p.max_spread and
+            imbalance is not None and imbalance < p.sell_imbalance
         ):
             print(
                 f"Strategy: AI recommends SELL, spread={spread}, "
@@ -71,46 +93,55 @@ class TradingStrategy:
             )
             return 'hold'
 
+    def decide_batch(self, price: Any, ai_prediction: Any,
+                     spread: Any = None, imbalance: Any = None
+                     ) -> np.ndarray:
+        """
+        Vectorized ``make_decision`` over whole arrays (e.g. a backtest):
+        the same rules in the same order, with NaN standing for a missing
+        price, spread or imbalance.
+        :return: ``BUY``/``SELL``/``HOLD`` code per row
+        """
+        price = np.asarray(price, dtype=np.float64)
+        ai_prediction = np.asarray(ai_prediction)
+        spread = np.full(price.shape, np.nan) if spread is None \
+            else np.asarray(spread, dtype=np.float64)
+        imbalance = np.full(price.shape, np.nan) if imbalance is None \
+            else np.asarray(imbalance, dtype=np.float64)
+        has_price = ~np.isnan(price)
+        buy_ai, sell_ai = ai_prediction == 1, ai_prediction == 0
+        p = self.params
+        with np.errstate(invalid='ignore'):
+            tight = spread < p.max_spread  # False for NaN
+            conditions = [
+                has_price & buy_ai & (price < p.buy_below),
+                has_price & sell_ai & (price > p.sell_above),
+                has_price & buy_ai & tight & (imbalance > p.buy_imbalance),
+                has_price & sell_ai & tight &
+                (imbalance < p.sell_imbalance),
+            ]
+        return np.select(conditions, [BUY, SELL, BUY, SELL],
+                         HOLD).astype(np.int8)
+
     def evaluate_performance(
         self, historical_trades: List[Dict[str, Any]]
-    ) -> Dict[str, float]:
+    ) -> Dict[str, Any]:
         """
         Evaluates the strategy's performance based on historical trades.
         :param historical_trades: List of executed trades
                                     with entry/exit prices, etc.
-        :return: dict with performance metrics (e.g., profit, win_rate)
+        :return: dict with performance metrics: net ``profit``,
+                 ``win_rate`` (breakeven trades excluded) and the rest of
+                 ``trade_stats``
         """
-        total_profit = 0.0
-        num_wins = 0
-        num_losses = 0
-        for trade in historical_trades:
-            if (
-                trade['type'] == 'buy'
-                and trade['exit_price'] > trade['entry_price']
-            ):
-                total_profit += (
-                    (trade['exit_price'] - trade['entry_price'])
-                    * trade['quantity']
-                )
-                num_wins += 1
-            elif (
-                trade['type'] == 'sell' and
-                trade['exit_price'] < trade['entry_price']
-            ):
-                total_profit += (
-                    (trade['entry_price'] - trade['exit_price'])
-                    * trade['quantity']
-                )  # for short sells
-                num_wins += 1
-            else:
-                num_losses += 1
-        win_rate = (
-            num_wins / (num_wins + num_losses)
-            if (num_wins + num_losses) > 0
-            else 0.0
-        )
+        pnl = trade_pnl([t['type'] for t in historical_trades],
+                        [t['entry_price'] for t in historical_trades],
+                        [t['exit_price'] for t in historical_trades],
+                        [t['quantity'] for t in historical_trades],
+                        [t.get('fee', 0.0) for t in historical_trades])
+        stats = trade_stats(pnl)
         print(
-            f"Strategy Performance: Total Profit: {total_profit:.2f}, "
-            f"Win rate: {win_rate:.2%}"
+            f"Strategy Performance: Total Profit: {stats['total_pnl']:.2f}, "
+            f"Win rate: {stats['win_rate']:.2%}"
         )
-        return {'profit': total_profit, 'win_rate': win_rate}
+        return {'profit': stats['total_pnl'], **stats}
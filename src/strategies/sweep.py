@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.ai.training import SharedArray, grid_candidates, random_candidates
+from src.monitoring.performance import backtest_stats
+from src.strategies.backtest import align_order_book, backtest, predict_bars
+from src.strategies.strategy import StrategyParams, TradingStrategy
+
+DEFAULT_PARAM_SPACE: Dict[str, List[Any]] = {
+    'buy_below': [64000.0, 66000.0, 68000.0],
+    'sell_above': [62000.0, 64000.0, 66000.0],
+    'max_spread': [2.0, 5.0, 10.0],
+    'buy_imbalance': [0.0, 0.1],
+    'sell_imbalance': [0.0, -0.1],
+}
+# Per-bar inputs shared with the workers
+SWEEP_COLUMNS = ('open', 'close', 'spread', 'imbalance')
+
+# Worker-side attachments, set up once per process by ``_attach``
+_worker_arrays: Dict[str, np.ndarray] = {}
+_worker_shms: List[shared_memory.SharedMemory] = []
+_worker_config: Dict[str, Any] = {}
+
+
+def _attach(specs: Dict[str, Tuple[str, tuple, str]],
+            config: Mapping[str, Any]) -> None:
+    for key, (name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _worker_shms.append(shm)
+        _worker_arrays[key] = np.ndarray(shape, np.dtype(dtype),
+                                         buffer=shm.buf)
+    _worker_config.update(config)
+
+
+def _evaluate(task: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """Backtests one parameter set inside a worker."""
+    candidate, params = task
+    bars = pd.DataFrame({name: _worker_arrays[name]
+                         for name in SWEEP_COLUMNS})
+    strategy = TradingStrategy(ai_model=None,
+                               params=StrategyParams(**params))
+    started = time.perf_counter()
+    result = backtest(bars, strategy,
+                      predictions=_worker_arrays['prediction'],
+                      **_worker_config)
+    return {'candidate': candidate, **strategy.params._asdict(),
+            **backtest_stats(result, _worker_config['starting_cash']),
+            'seconds': time.perf_counter() - started}
+
+
+def _params_key(params: Mapping[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _fingerprint(arrays: Mapping[str, np.ndarray],
+                 config: Mapping[str, Any]) -> str:
+    """Identifies the data and fill settings a checkpoint belongs to."""
+    digest = hashlib.sha256(_params_key(config).encode())
+    for name in sorted(arrays):
+        digest.update(name.encode())
+        digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+    return digest.hexdigest()
+
+
+def _load_checkpoint(path: str, fingerprint: str
+                     ) -> Dict[str, Dict[str, Any]]:
+    """Completed rows by parameter key; a torn last line is ignored."""
+    done: Dict[str, Dict[str, Any]] = {}
+    try:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return done
+    if not lines:
+        return done
+    header = json.loads(lines[0])
+    if header.get('fingerprint') != fingerprint:
+        raise ValueError(
+            f"Checkpoint {path} was written for different data or fill "
+            "settings; remove it to start a new sweep")
+    for line in lines[1:]:
+        try:
+            row = json.loads(line)
+        except ValueError:
+            continue
+        done[_params_key(row['params'])] = row['result']
+    return done
+
+
+def sweep(bars: pd.DataFrame,
+          space: Optional[Mapping[str, Sequence[Any]]] = None,
+          predictions: Optional[Any] = None,
+          model: Optional[Any] = None,
+          order_book: Optional[pd.DataFrame] = None,
+          n_iter: Optional[int] = None,
+          quantity: float = 0.0001,
+          starting_cash: float = 100000.0,
+          fee_rate: float = 0.0,
+          fill_at_next_open: bool = False,
+          max_workers: Optional[int] = None, seed: int = 42,
+          checkpoint_path: Optional[str] = None,
+          results_path: Optional[str] = None,
+          sort_by: str = 'total_return') -> pd.DataFrame:
+    """
+    Backtests many ``StrategyParams`` on one bar history. AI predictions
+    and order book alignment are computed once; the per-bar arrays are
+    placed in shared memory and every parameter set is a task on a
+    process pool.
+
+    :param space: Values per ``StrategyParams`` field; unlisted fields
+                  keep their defaults
+    :param predictions: AI prediction per bar; otherwise ``model``
+                        predicts them with its feature schema
+    :param n_iter: Random sample of ``n_iter`` grid points instead of
+                   the full grid
+    :param checkpoint_path: JSON lines file; each finished parameter set
+                            is appended, and a rerun skips those already
+                            in it
+    :param results_path: Optional CSV file for the results table
+    :return: one row per parameter set (parameters and metrics), best
+             ``sort_by`` first
+    """
+    space = space or DEFAULT_PARAM_SPACE
+    unknown = set(space) - set(StrategyParams._fields)
+    if unknown:
+        raise ValueError(f"Unknown strategy parameters: {sorted(unknown)}")
+    if not len(bars):
+        raise ValueError("Cannot sweep over an empty bar history")
+    if order_book is not None:
+        bars = bars.assign(**align_order_book(bars, order_book))
+    if predictions is None:
+        if model is None:
+            raise ValueError("Pass predictions or a trained model")
+        predictions = predict_bars(bars, model)
+    arrays = {name: bars[name].to_numpy(dtype=np.float64) if name in bars
+              else np.full(len(bars), np.nan) for name in SWEEP_COLUMNS}
+    arrays['prediction'] = np.asarray(predictions)
+    config = {'quantity': quantity, 'starting_cash': starting_cash,
+              'fee_rate': fee_rate, 'fill_at_next_open': fill_at_next_open}
+
+    candidates = random_candidates(space, n_iter, seed) if n_iter \
+        else grid_candidates(space)
+    done: Dict[str, Dict[str, Any]] = {}
+    checkpoint = None
+    if checkpoint_path:
+        fingerprint = _fingerprint(arrays, config)
+        done = _load_checkpoint(checkpoint_path, fingerprint)
+        directory = os.path.dirname(checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        checkpoint = open(checkpoint_path, 'a+')
+        if checkpoint.tell() == 0:
+            checkpoint.write(json.dumps({'fingerprint': fingerprint,
+                                         'config': config}) + '\n')
+        else:
+            checkpoint.seek(checkpoint.tell() - 1)
+            if checkpoint.read(1) != '\n':
+                checkpoint.write('\n')  # end a torn last line
+    rows = [dict(done[_params_key(p)], candidate=c)
+            for c, p in enumerate(candidates) if _params_key(p) in done]
+    tasks = [(c, p) for c, p in enumerate(candidates)
+             if _params_key(p) not in done]
+    if rows:
+        print(f"Resuming sweep: {len(rows)} of {len(candidates)} "
+              "parameter sets already done")
+    started = time.perf_counter()
+    try:
+        if tasks:
+            shared = {name: SharedArray(a) for name, a in arrays.items()}
+            try:
+                specs = {name: s.spec for name, s in shared.items()}
+                with ProcessPoolExecutor(
+                        max_workers=max_workers or os.cpu_count() or 1,
+                        initializer=_attach,
+                        initargs=(specs, config)) as pool:
+                    futures = {pool.submit(_evaluate, t): t for t in tasks}
+                    try:
+                        for future in as_completed(futures):
+                            row = future.result()
+                            rows.append(row)
+                            if checkpoint is not None:
+                                checkpoint.write(json.dumps({
+                                    'params': futures[future][1],
+                                    'result': row}) + '\n')
+                                checkpoint.flush()
+                    except BaseException:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        raise
+            finally:
+                for array in shared.values():
+                    array.close()
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    print(f"Strategy sweep: {len(tasks)} parameter sets backtested in "
+          f"{time.perf_counter() - started:.1f}s")
+    table = pd.DataFrame(rows).sort_values(
+        [sort_by, 'candidate'], ascending=[False, True],
+        ignore_index=True)
+    if results_path:
+        directory = os.path.dirname(results_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        table.to_csv(results_path, index=False)
+    return table
+
+
+if __name__ == "__main__":
+    # Example: sweep the thresholds on the stored BTCUSD history with the
+    # registry's active model
+    from src.ai.registry import model_registry
+    from src.data_ingestion.kline_store import KlineStore
+
+    history = KlineStore(os.getenv('KLINE_STORE_DIR', 'data/klines')).read(
+        'BTCUSD', '1h')
+    results = sweep(history, model=model_registry.load(),
+                    checkpoint_path='reports/strategy_sweep.jsonl',
+                    results_path='reports/strategy_sweep.csv')
+    best = results.iloc[0]
+    best_params = {f: best[f] for f in StrategyParams._fields}
+    print(f"Best parameters: {best_params} "
+          f"(return {best['total_return']:.2%}, "
+          f"max drawdown {best['max_drawdown']:.2%})")
@@ -1,4 +1,5 @@
 from src.ai.models import AIModel
+import numpy as np
 import pandas as pd
 
 
@@ -16,3 +17,27 @@ def test_ai_model_train_and_predict():
     assert model.is_trained
     pred = model.predict({'price_change': 0.01, 'volume_change': 0.1})
     assert pred in [0, 1]
+
+
+def test_predict_batch_matches_predict():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({'price_change': rng.normal(size=50),
+                      'volume_change': rng.normal(size=50),
+                      'ob_spread': rng.uniform(0, 5, size=50),
+                      'ob_imbalance': rng.uniform(-1, 1, size=50)})
+    y = (X['price_change'] + X['ob_imbalance'] > 0).astype(int)
+    model = AIModel()
+    model.train(X, y)  # type: ignore
+    assert model.feature_names == list(X.columns)
+    preds, proba = model.predict_batch(X.to_numpy())
+    np.testing.assert_array_equal(preds, model.model.predict(
+        model.scaler.transform(X.to_numpy())))
+    assert proba.shape == (50, 2)
+    np.testing.assert_allclose(proba.sum(axis=1), 1.0)
+    columnar = {c: X[c].to_numpy() for c in X.columns}
+    np.testing.assert_array_equal(model.predict_batch(columnar)[0], preds)
+    row = X.iloc[3]
+    ob = {'spread': row['ob_spread'], 'imbalance': row['ob_imbalance']}
+    assert model.predict({'price_change': row['price_change'],
+                          'volume_change': row['volume_change']},
+                         order_book_metrics=ob) == preds[3]
@@ -0,0 +1,61 @@
+import asyncio
+
+from aiohttp import web
+
+from src.data_ingestion.backfill import async_backfill_klines, kline_pages
+from src.data_ingestion.http_client import AsyncBinanceClient
+
+MINUTE = 60_000
+T0 = 1_600_000_000_000 - 1_600_000_000_000 % MINUTE
+
+
+def _kline(open_time):  # type: ignore
+    return [open_time, '1', '2', '0.5', str(open_time // MINUTE % 97), '3',
+            open_time + MINUTE - 1, '4', 5, '1', '2', '0']
+
+
+def test_kline_pages_cover_range_without_overlap():
+    pages = kline_pages(T0 + 1, T0 + 2500 * MINUTE, '1m', page_size=1000)
+    assert pages[0][0] == T0 + MINUTE
+    assert len(pages) == 3
+    for (_, end), (start, _) in zip(pages, pages[1:]):
+        assert start == end + MINUTE
+    assert pages[-1][1] == T0 + 2500 * MINUTE
+
+
+def test_backfill_fetches_pages_concurrently_and_dedupes():
+    in_flight = [0, 0]
+
+    async def klines(request):  # type: ignore
+        start = int(request.query['startTime'])
+        end = int(request.query['endTime'])
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight[1], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        # Overlap one bar with the previous page to exercise de-duplication
+        times = range(start - MINUTE, end + 1, MINUTE)
+        return web.json_response([_kline(t) for t in times])
+
+    async def scenario():  # type: ignore
+        app = web.Application()
+        app.router.add_get('/api/v3/klines', klines)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            async with AsyncBinanceClient(f'http://127.0.0.1:{port}') as c:
+                return await async_backfill_klines(
+                    'BTCUSDT', '1m', T0, T0 + 4999 * MINUTE, client=c,
+                    concurrency=4, weight_per_minute=6000, page_size=500)
+        finally:
+            await runner.cleanup()
+
+    df = asyncio.run(scenario())
+    assert len(df) == 5000
+    assert df.index.is_unique and df.index.is_monotonic_increasing
+    assert df.index[0].value // 1_000_000 == T0
+    assert df.attrs['failed_pages'] == []
+    assert in_flight[1] > 1
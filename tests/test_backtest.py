@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from src.data_ingestion.recorder import MarketDataRecorder
+from src.strategies.backtest import (_fill_sequential, align_order_book,
+                                     backtest, order_book_from_log)
+from src.strategies.strategy import BUY, HOLD, SELL, TradingStrategy
+
+DECISION_CODES = {'buy': BUY, 'sell': SELL, 'hold': HOLD}
+
+
+def _bars(close):
+    index = pd.date_range('2024-01-01', periods=len(close), freq='min')
+    close = np.asarray(close, dtype=np.float64)
+    return pd.DataFrame({'open': close, 'close': close,
+                         'volume': np.ones(len(close))}, index=index)
+
+
+def test_decide_batch_matches_make_decision():
+    rng = np.random.default_rng(0)
+    n = 300
+    price = rng.choice([63000.0, 65000.0, 67000.0, np.nan], size=n)
+    prediction = rng.integers(0, 2, size=n)
+    spread = rng.choice([1.0, 10.0, np.nan], size=n)
+    imbalance = rng.choice([-0.5, 0.0, 0.5, np.nan], size=n)
+    strategy = TradingStrategy(ai_model=None)
+    batch = strategy.decide_batch(price, prediction, spread, imbalance)
+
+    def value(x):
+        return None if np.isnan(x) else float(x)
+    for i in range(n):
+        decision = strategy.make_decision(
+            {'price': value(price[i])}, int(prediction[i]),
+            order_book_metrics={'spread': value(spread[i]),
+                                'imbalance': value(imbalance[i])})
+        assert batch[i] == DECISION_CODES[decision]
+
+
+def test_position_never_goes_negative_and_matches_sequential_fills():
+    rng = np.random.default_rng(1)
+    bars = _bars(rng.choice([63000.0, 65000.0, 67000.0], size=500))
+    predictions = rng.integers(0, 2, size=500)
+    result = backtest(bars, TradingStrategy(ai_model=None),
+                      predictions=predictions, quantity=0.01,
+                      fee_rate=0.001)
+    expected = _fill_sequential(result.signal, bars['close'].to_numpy(),
+                                0.01, 100000.0, 0.001)
+    np.testing.assert_array_equal(result.executed, expected)
+    assert (result.position >= 0).all()
+    assert len(result.trades['bar']) == np.count_nonzero(expected)
+    last = len(bars) - 1
+    assert np.isclose(result.equity[-1], result.cash[-1] +
+                      result.position[-1] * bars['close'].iloc[last])
+
+
+def test_buys_fail_once_cash_runs_out():
+    bars = _bars([60000.0] * 5)
+    result = backtest(bars, TradingStrategy(ai_model=None),
+                      predictions=[1] * 5, quantity=1.0,
+                      starting_cash=130000.0)
+    np.testing.assert_array_equal(result.executed, [1, 1, 0, 0, 0])
+    np.testing.assert_allclose(result.cash[-1], 10000.0)
+    np.testing.assert_allclose(result.equity, 130000.0)
+
+
+def test_fill_at_next_open_uses_following_bar():
+    bars = _bars([65000.0, 65000.0, 65000.0])
+    bars['open'] = [1.0, 2.0, 3.0]
+    result = backtest(bars, TradingStrategy(ai_model=None),
+                      predictions=[1, 0, 1], quantity=1.0,
+                      fill_at_next_open=True)
+    np.testing.assert_array_equal(result.executed, [0, 1, -1])
+    np.testing.assert_allclose(result.trades['price'], [2.0, 3.0])
+
+
+def test_recorded_order_book_is_aligned_without_lookahead(tmp_path):
+    path = str(tmp_path / 'market.log')
+    start = pd.Timestamp('2024-01-01').value
+    with MarketDataRecorder(path) as recorder:
+        recorder.record_rest(
+            '/api/v3/depth', {'symbol': 'BTCUSDT', 'limit': 10},
+            {'bids': [['100', '3']], 'asks': [['101', '1']]},
+            recv_ns=start + 30 * 10**9)
+        recorder.record_rest(
+            '/api/v3/depth', {'symbol': 'ETHUSDT', 'limit': 10},
+            {'bids': [['1', '1']], 'asks': [['9', '1']]},
+            recv_ns=start + 40 * 10**9)
+    order_book = order_book_from_log(path, 'BTCUSDT')
+    assert len(order_book) == 1
+    assert order_book['spread'].iloc[0] == 1.0
+    assert order_book['imbalance'].iloc[0] == 0.5
+    aligned = align_order_book(_bars([1.0, 2.0]), order_book)
+    # Bar 0 is indexed at the first snapshot's minute, before it arrived
+    assert np.isnan(aligned['spread'].iloc[0])
+    assert aligned['spread'].iloc[1] == 1.0
+
+
+def test_align_order_book_across_index_units():
+    start = pd.Timestamp('2024-01-01')
+    order_book = pd.DataFrame(
+        {'spread': [1.0], 'imbalance': [0.5]},
+        index=pd.DatetimeIndex([start + pd.Timedelta(seconds=30)]))
+    bars = _bars([1.0, 2.0])
+    bars.index = bars.index.as_unit('ms')
+    aligned = align_order_book(bars, order_book)
+    assert np.isnan(aligned['spread'].iloc[0])
+    assert aligned['spread'].iloc[1] == 1.0
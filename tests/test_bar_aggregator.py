@@ -0,0 +1,52 @@
+import json
+
+from src.data_ingestion.bar_aggregator import BarAggregator
+
+
+def test_time_bars_close_on_new_interval_and_flush():
+    closed = []
+    agg = BarAggregator(intervals=('1m',),
+                        on_bar=lambda key, bar: closed.append(key))
+    agg.add_trade(100.0, 1.0, 1_000)
+    agg.add_trade(103.0, 2.0, 30_000)
+    agg.add_trade(99.0, 1.0, 59_999)
+    partial = agg.partial('1m')
+    assert partial['closed'] is False and partial['close'] == 99.0
+    bars = agg.add_trade(101.0, 1.0, 60_500)
+    key, bar = bars[0]
+    assert key == '1m' and bar['closed']
+    assert (bar['open'], bar['high'], bar['low'], bar['close']) == \
+        (100.0, 103.0, 99.0, 99.0)
+    assert bar['volume'] == 4.0 and bar['number_of_trades'] == 3
+    assert (bar['open_time'], bar['close_time']) == (0, 59_999)
+    assert agg.flush(now_ms=100_000) == []
+    assert agg.flush(now_ms=120_000)[0][1]['open_time'] == 60_000
+    assert agg.partial('1m') is None and closed == ['1m', '1m']
+    df = agg.bars('1m')
+    assert list(df['close']) == [99.0, 101.0]
+
+
+def test_volume_and_tick_bars_with_bounded_history():
+    agg = BarAggregator(intervals=(), volume_bars=(3,), tick_bars=(2,),
+                        max_bars=2)
+    for i in range(10):
+        agg.add_trade(100.0 + i, 1.5, i)
+    volume_bars = list(agg.closed['volume:3'])
+    tick_bars = list(agg.closed['tick:2'])
+    assert len(volume_bars) == 2 and len(tick_bars) == 2
+    assert all(b['volume'] == 3.0 for b in volume_bars)
+    assert tick_bars[-1]['open'] == 108.0 and tick_bars[-1]['close'] == 109.0
+
+
+def test_messages_and_duplicate_trades():
+    agg = BarAggregator(intervals=('1h',), tick_bars=(10,))
+    msg = {'e': 'aggTrade', 'a': 7, 'p': '65000.5', 'q': '0.1',
+           'T': 1_700_000_000_000}
+    agg.add_message(json.dumps(msg))
+    agg.add_message({'stream': 'btcusdt@aggTrade', 'data': msg})
+    agg.add_message({'e': 'trade', 't': 8, 'p': '65001', 'q': '0.2',
+                     'T': 1_700_000_000_500})
+    partial = agg.partial('1h')
+    assert partial['number_of_trades'] == 2
+    assert partial['close'] == 65001.0
+    assert agg.bars('1h', include_partial=True)['closed'].tolist() == [False]
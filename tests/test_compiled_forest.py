@@ -0,0 +1,45 @@
+import numpy as np
+
+from src.ai.compiled_forest import CompiledForest
+from src.ai.models import AIModel
+
+
+def _trained_model(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 3))
+    y = (X[:, 0] + 0.5 * rng.normal(size=n) > 0).astype(int)
+    model = AIModel()
+    model.train(X, y, feature_names=['a', 'b', 'c'])
+    return model, rng
+
+
+def test_compiled_forest_matches_sklearn_exactly():
+    model, rng = _trained_model()
+    X = rng.normal(size=(1500, 3))
+    expected = model.model.predict_proba(model.scaler.transform(X))
+    compiled = model.compiled
+    assert isinstance(compiled, CompiledForest)
+    np.testing.assert_array_equal(compiled.predict_proba(X), expected)
+    for i in range(20):
+        np.testing.assert_array_equal(compiled.predict_proba(X[i:i + 1]),
+                                      expected[i:i + 1])
+    preds, _ = model.predict_batch(X)
+    np.testing.assert_array_equal(
+        preds, model.model.predict(model.scaler.transform(X)))
+    assert compiled.predict_proba(X[:0]).shape == (0, 2)
+
+
+def test_export_and_load_compiled(tmp_path):
+    model, rng = _trained_model()
+    directory = str(tmp_path / 'compiled')
+    model.export_compiled(directory)
+    X = rng.normal(size=(50, 3))
+    loaded = AIModel()
+    loaded.load_compiled(directory)
+    assert loaded.is_trained and loaded.feature_names == ['a', 'b', 'c']
+    np.testing.assert_array_equal(loaded.predict_batch(X)[1],
+                                  model.predict_batch(X)[1])
+    mapped = CompiledForest.load(directory, mmap_mode='r')
+    assert isinstance(mapped.threshold, np.memmap)
+    np.testing.assert_array_equal(mapped.predict_proba(X),
+                                  model.predict_batch(X)[1])
@@ -0,0 +1,78 @@
+import threading
+import time
+
+from src.data_ingestion.bar_aggregator import BarAggregator
+from src.event_engine import BAR, BOOK, TICK, EventEngine
+
+
+def test_ticks_and_books_coalesce_to_latest_per_key():
+    engine = EventEngine()
+    seen = []
+    engine.subscribe(TICK, lambda e: seen.append((e.key, e.payload)))
+    engine.subscribe(BOOK, lambda e: seen.append((e.key, e.payload)))
+    for price in (1.0, 2.0, 3.0):
+        engine.publish(TICK, 'BTCUSDT', price)
+    engine.publish(TICK, 'ETHUSDT', 10.0)
+    engine.publish(BOOK, 'BTCUSDT', 7)
+    engine.publish(TICK, 'BTCUSDT', 4.0)
+    assert engine.pending() == 3
+    while engine.run_once():
+        pass
+    # Keys keep the position of their first pending event
+    assert seen == [('BTCUSDT', 4.0), ('ETHUSDT', 10.0), ('BTCUSDT', 7)]
+    assert engine.stats['coalesced'] == 3
+    assert engine.stats['processed'] == 3
+
+
+def test_bar_events_apply_backpressure():
+    engine = EventEngine(max_pending=2, publish_timeout=0.05)
+    assert engine.publish(BAR, '1h', 1) and engine.publish(BAR, '1h', 2)
+    assert not engine.publish(BAR, '1h', 3, block=False)
+    assert not engine.publish(BAR, '1h', 3)
+    assert engine.stats['dropped'] == 2
+
+    # A blocked producer resumes once the consumer catches up
+    done = []
+    producer = threading.Thread(
+        target=lambda: done.append(engine.publish(BAR, '1h', 4)))
+    engine.publish_timeout = 5.0
+    producer.start()
+    time.sleep(0.05)
+    engine.run_once()
+    producer.join(timeout=5)
+    assert done == [True] and engine.pending() == 2
+
+
+def test_stages_chain_and_record_tick_to_order_latency():
+    engine = EventEngine(latency_target=10.0)
+    orders = []
+    engine.subscribe(TICK, lambda e: engine.emit('decision', e.key,
+                                                 'buy', e))
+    engine.subscribe('decision', lambda e: orders.append(
+        (e.payload, engine.record_latency(e))))
+
+    def failing(event):
+        raise RuntimeError("boom")
+    engine.subscribe(TICK, failing)
+    engine.publish(TICK, 'BTCUSDT', 1.0, ts=time.perf_counter() - 0.01)
+    stop = threading.Event()
+    worker = threading.Thread(target=engine.run, args=(stop, 0.01))
+    worker.start()
+    deadline = time.time() + 5
+    while not orders and time.time() < deadline:
+        time.sleep(0.01)
+    stop.set()
+    worker.join(timeout=5)
+    assert orders[0][0] == 'buy' and orders[0][1] >= 0.01
+    stats = engine.snapshot()
+    assert stats['errors'] == 1 and stats['orders'] == 1
+    assert stats['over_target'] == 0
+    assert stats['latency']['count'] == 1
+
+
+def test_aggregator_reports_accepted_trades():
+    trades = []
+    aggregator = BarAggregator(on_trade=lambda *t: trades.append(t))
+    aggregator.add_trade(100.0, 1.0, 1_000, trade_id=5)
+    aggregator.add_trade(101.0, 1.0, 2_000, trade_id=5)  # replayed
+    assert trades == [(100.0, 1.0, 1_000)]
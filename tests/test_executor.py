@@ -14,3 +14,45 @@ def test_get_account_balance():
     balance = executor.get_account_balance()
     assert 'cash' in balance
     assert 'asset_holdings' in balance
+
+
+class _FakeBroker:
+    def __init__(self):
+        self.polls = 0
+
+    def create_order(self, **params):
+        return {'orderId': 7, 'symbol': params['symbol'], 'type': 'MARKET',
+                'status': 'NEW', 'origQty': str(params['quantity']),
+                'executedQty': '0', 'cummulativeQuoteQty': '0',
+                'transactTime': 1700000000000, 'fills': []}
+
+    def get_order(self, symbol, orderId):
+        self.polls += 1
+        return {'orderId': orderId, 'symbol': symbol, 'status': 'FILLED',
+                'executedQty': '0.02', 'cummulativeQuoteQty': '1310',
+                'updateTime': 1700000000500}
+
+
+def test_live_order_returns_pending_handle_without_blocking():
+    executor = TradeExecutor(api_key='dummy', api_secret='dummy', mode='paper')
+    executor.mode, executor.broker_client = 'live', _FakeBroker()
+    executor.orders.poll_interval = 0.01
+    result = executor.execute_trade('BTCUSDT', 'buy', 0.02)
+    assert result['status'] == 'pending'
+    final = result['handle'].result(timeout=5)
+    assert final['status'] == 'success'
+    assert final['price'] == 65500.0
+    assert executor.orders.open_orders() == []
+    executor.orders.close()
+
+
+def test_close_stops_order_poller():
+    executor = TradeExecutor(api_key='dummy', api_secret='dummy', mode='paper')
+    executor.mode, executor.broker_client = 'live', _FakeBroker()
+    executor.orders.poll_interval = 60.0
+    result = executor.execute_trade('BTCUSDT', 'buy', 0.02)
+    poller = executor.orders._poller
+    assert result['status'] == 'pending' and poller.is_alive()
+    executor.close()
+    poller.join(5)
+    assert not poller.is_alive()
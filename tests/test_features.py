@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ai.features import FEATURES, FeaturePipeline
+
+
+def _bars(n=80, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(size=n))
+    volume = rng.uniform(1, 10, size=n)
+    volume[5] = 0.0  # division by zero must match in both modes
+    return pd.DataFrame({'close': close, 'volume': volume},
+                        index=pd.date_range('2024-01-01', periods=n,
+                                            freq='h'))
+
+
+def test_incremental_rows_equal_batch_rows():
+    bars = _bars()
+    pipeline = FeaturePipeline(list(FEATURES))
+    batch = pipeline.transform_batch(bars)
+    assert list(batch.columns) == list(FEATURES)
+    assert np.isfinite(batch.to_numpy()).all()
+    live = FeaturePipeline(list(FEATURES))
+    rows = [live.update_bar(c, v) for c, v in
+            zip(bars['close'], bars['volume'])]
+    np.testing.assert_array_equal(pd.DataFrame(rows).to_numpy(),
+                                  batch.to_numpy())
+
+
+def test_tick_features_match_next_batch_row_and_are_cached():
+    bars = _bars()
+    pipeline = FeaturePipeline(['price_change', 'volume_change',
+                                'sma_ratio', 'rsi', 'ob_imbalance'])
+    pipeline.warm_start(bars.iloc[:-1])
+    last = bars.iloc[-1]
+    ob = {'spread': 1.0, 'imbalance': 0.25}
+    row = pipeline.transform_tick(last['close'], last['volume'], ob, key=1)
+    expected = pipeline.transform_batch(bars).iloc[-1]
+    for name in ('price_change', 'volume_change', 'sma_ratio', 'rsi'):
+        assert row[name] == expected[name]
+    assert row['ob_imbalance'] == 0.25
+    assert pipeline.transform_tick(0.0, 0.0, key=1) is row
+    assert pipeline.transform_batch(bars) is pipeline.transform_batch(bars)
+
+
+def test_unknown_feature_rejected():
+    with pytest.raises(ValueError):
+        FeaturePipeline(['price_change', 'moon_phase'])
+    assert not FeaturePipeline.supports(['f0'])
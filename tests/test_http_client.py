@@ -0,0 +1,90 @@
+import asyncio
+
+from aiohttp import web
+
+import src.data_ingestion as data_ingestion
+from src.data_ingestion import http_client
+from src.data_ingestion.http_client import AsyncBinanceClient, get_session
+
+KLINE = [1700000000000, '1.0', '2.0', '0.5', '1.5', '10.0', 1700003599999,
+         '15.0', 3, '5.0', '7.5', '0']
+
+
+def _make_app(calls):  # type: ignore
+    async def depth(request):  # type: ignore
+        calls.append('depth')
+        if calls.count('depth') == 1:
+            return web.Response(status=503)
+        return web.json_response({'lastUpdateId': 9,
+                                  'bids': [['100.0', '1.0']],
+                                  'asks': [['101.0', '2.0']]})
+
+    async def ticker(request):  # type: ignore
+        calls.append('ticker')
+        return web.json_response({'symbol': request.query['symbol'],
+                                  'lastPrice': '65000.5',
+                                  'volume': '1234.0'})
+
+    async def klines(request):  # type: ignore
+        calls.append(dict(request.query))
+        return web.json_response([KLINE])
+
+    app = web.Application()
+    app.router.add_get('/api/v3/depth', depth)
+    app.router.add_get('/api/v3/ticker/24hr', ticker)
+    app.router.add_get('/api/v3/klines', klines)
+    return app
+
+
+def _serve(scenario):  # type: ignore
+    async def main():  # type: ignore
+        calls = []
+        runner = web.AppRunner(_make_app(calls))
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            return await scenario(f'http://127.0.0.1:{port}', calls)
+        finally:
+            await runner.cleanup()
+    return asyncio.run(main())
+
+
+def test_session_is_pooled_and_reused():
+    session = get_session()
+    assert get_session() is session
+    adapter = session.get_adapter('https://api.binance.com')
+    assert adapter.max_retries.total == http_client.HTTP_MAX_RETRIES
+
+
+def test_fetch_cycle_data_gathers_and_retries():
+    async def scenario(base_url, calls):  # type: ignore
+        data_ingestion.order_book_cache.invalidate()
+        async with AsyncBinanceClient(base_url, backoff_factor=0) as client:
+            result = await data_ingestion.fetch_cycle_data(
+                'BTCUSD', 'BTCUSDT', 10, client=client)
+        return result, calls
+
+    result, calls = _serve(scenario)
+    assert result['market_data']['price'] == 65000.5
+    assert result['order_book_metrics']['spread'] == 1.0
+    assert calls.count('depth') == 2
+    cached = data_ingestion.order_book_cache.get('BTCUSDT', 10)
+    assert cached is result['order_book_metrics']
+
+
+def test_sync_wrappers_use_pooled_session(monkeypatch):  # type: ignore
+    async def scenario(base_url, calls):  # type: ignore
+        monkeypatch.setattr(http_client, 'BINANCE_API_URL', base_url)
+        loop = asyncio.get_running_loop()
+        df = await loop.run_in_executor(
+            None, data_ingestion.get_market_data, 'BTCUSD', 1)
+        tick = await loop.run_in_executor(
+            None, data_ingestion.get_realtime_data, 'BTCUSD')
+        return df, tick, calls
+
+    df, tick, calls = _serve(scenario)
+    assert list(df['close']) == [1.5]
+    assert tick['volume'] == 1234.0
+    assert calls[0] == {'symbol': 'BTCUSD', 'interval': '1h', 'limit': '1'}
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from src.data_ingestion import add_technical_indicators
+from src.data_ingestion.indicators import (INDICATOR_COLUMNS,
+                                           IncrementalIndicators,
+                                           compute_indicators, ema, rsi)
+
+
+def _closes(n=300, seed=7):  # type: ignore
+    rng = np.random.default_rng(seed)
+    return 65000.0 + np.cumsum(rng.normal(0, 50, n))
+
+
+def test_batch_indicator_values():
+    close = np.arange(1.0, 41.0)
+    batch = compute_indicators(close)
+    assert np.isnan(batch['sma_20'][18])
+    assert batch['sma_20'][19] == np.mean(close[:20])
+    assert rsi(close)[14] == 100.0
+    assert np.isnan(rsi(close)[13])
+    assert ema(close, 3)[2] == 2.0
+    assert ema(close, 3)[3] == 0.5 * 4.0 + 0.5 * 2.0
+    assert np.isnan(batch['macd_signal'][32])
+    assert not np.isnan(batch['macd_signal'][33])
+
+
+def test_incremental_matches_batch_exactly():
+    close = _closes()
+    batch = compute_indicators(close)
+    live = IncrementalIndicators()
+    rows = [live.update(c) for c in close]
+    for column in INDICATOR_COLUMNS:
+        np.testing.assert_array_equal([r[column] for r in rows],
+                                      batch[column])
+
+
+def test_warm_start_continues_batch_series():
+    close = _closes(400)
+    live = IncrementalIndicators.from_history(close[:250])
+    rows = [live.update(c) for c in close[250:]]
+    batch = compute_indicators(close)
+    for column in INDICATOR_COLUMNS:
+        np.testing.assert_array_equal([r[column] for r in rows],
+                                      batch[column][250:])
+
+
+def test_add_technical_indicators_adds_columns():
+    df = pd.DataFrame({'close': _closes(60)})
+    out = add_technical_indicators(df)
+    assert {'sma_20', 'rsi_14', 'macd', 'macd_signal'} <= set(out.columns)
+    assert 'sma_20' not in df.columns
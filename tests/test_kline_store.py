@@ -0,0 +1,60 @@
+from src.data_ingestion import _parse_klines
+from src.data_ingestion.kline_store import KlineStore
+
+HOUR = 3_600_000
+T0 = 1_700_000_000_000 - 1_700_000_000_000 % HOUR
+
+
+def _klines(start, count):  # type: ignore
+    rows = []
+    for i in range(count):
+        open_time = start + i * HOUR
+        price = 100.0 + open_time // HOUR % 50
+        rows.append([open_time, str(price), str(price + 1), str(price - 1),
+                     str(price + 0.5), '10.0', open_time + HOUR - 1, '1000.0',
+                     5, '4.0', '400.0', '0'])
+    return _parse_klines(rows)
+
+
+def _fetcher(calls):  # type: ignore
+    def fetch(symbol, limit, interval, start_time):  # type: ignore
+        calls.append(start_time)
+        end = min(start_time + limit * HOUR, NOW)
+        count = max(0, (end - start_time) // HOUR + 1)
+        return _klines(start_time, min(count, limit))
+    return fetch
+
+
+NOW = T0 + 2500 * HOUR + 10
+
+
+def test_sync_is_incremental_and_skips_open_bar(tmp_path):  # type: ignore
+    store = KlineStore(str(tmp_path))
+    calls = []
+    added = store.sync('BTCUSD', '1h', lookback_bars=2500,
+                       fetcher=_fetcher(calls), now_ms=NOW)
+    assert added == 2500
+    assert len(calls) == 3
+    assert store.last_open_time('BTCUSD', '1h') == T0 + 2499 * HOUR
+    calls.clear()
+    assert store.sync('BTCUSD', '1h', fetcher=_fetcher(calls),
+                      now_ms=NOW) == 0
+    assert store.sync('BTCUSD', '1h', fetcher=_fetcher(calls),
+                      now_ms=NOW + HOUR) == 1
+    assert calls == [T0 + 2500 * HOUR]
+
+
+def test_append_dedupes_and_read_ranges(tmp_path):  # type: ignore
+    store = KlineStore(str(tmp_path))
+    assert store.append('ETHUSDT', '1h', _klines(T0, 10)) == 10
+    assert store.append('ETHUSDT', '1h', _klines(T0 + 5 * HOUR, 10)) == 5
+    assert store.rows('ETHUSDT', '1h') == 15
+    df = store.read('ETHUSDT', '1h', start=T0 + 3 * HOUR,
+                    end=T0 + 6 * HOUR)
+    assert len(df) == 4
+    assert df.index[0].value // 1_000_000 == T0 + 3 * HOUR
+    expected = _klines(T0 + 3 * HOUR, 4)
+    assert list(df['close']) == list(expected['close'])
+    tail = store.read('ETHUSDT', '1h', limit=2)
+    assert len(tail) == 2 and tail['number_of_trades'].iloc[-1] == 5
+    assert store.read('XRPUSDT', '1h').empty
@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+import websockets
+
+import src.data_ingestion as data_ingestion
+from src.data_ingestion.local_book import LocalOrderBook, OrderBookEngine
+
+
+def _snapshot(update_id):  # type: ignore
+    return {
+        'lastUpdateId': update_id,
+        'bids': [['100.00', '1.0'], ['99.50', '2.0'], ['99.00', '3.0']],
+        'asks': [['100.50', '1.0'], ['101.00', '2.0']]
+    }
+
+
+def _diff(first, final, bids=(), asks=()):  # type: ignore
+    return {'e': 'depthUpdate', 's': 'BTCUSDT', 'U': first, 'u': final,
+            'b': [list(b) for b in bids], 'a': [list(a) for a in asks]}
+
+
+def test_local_book_applies_diffs_and_detects_gaps():
+    book = LocalOrderBook('btcusdt')
+    assert book.load_snapshot(_snapshot(10))
+    assert book.apply_diff(_diff(5, 9, bids=[('100.00', '0')]))
+    assert book.best_bid() == 100.0
+    assert book.apply_diff(_diff(9, 12, bids=[('100.00', '0'),
+                                              ('99.75', '4.0')],
+                                 asks=[('100.25', '0.5')]))
+    snap = book.snapshot(2)
+    assert snap['bids'] == [['99.75', '4.0'], ['99.50', '2.0']]
+    assert snap['asks'] == [['100.25', '0.5'], ['100.50', '1.0']]
+    assert snap['lastUpdateId'] == 12
+    assert not book.apply_diff(_diff(14, 15))
+    assert not book.synced
+
+
+def test_engine_syncs_from_local_websocket_and_resyncs():
+    events = [
+        _diff(1, 5, bids=[('98.00', '9.0')]),
+        _diff(9, 12, asks=[('100.50', '0')]),
+        _diff(13, 14, bids=[('100.10', '1.5')]),
+        _diff(20, 21),
+        _diff(26, 26, asks=[('100.40', '0.7')]),
+    ]
+    snapshots = [_snapshot(10), _snapshot(25)]
+
+    async def handler(ws):  # type: ignore
+        for event in events:
+            await ws.send(json.dumps(event))
+        await ws.wait_closed()
+
+    async def scenario():  # type: ignore
+        async with websockets.serve(handler, '127.0.0.1', 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            engine = OrderBookEngine(
+                snapshot_fetcher=lambda symbol, depth: snapshots.pop(0),
+                ws_base_url=f'ws://127.0.0.1:{port}')
+            task = asyncio.create_task(engine.run(['BTCUSDT']))
+            for _ in range(200):
+                book = engine.get_book('BTCUSDT')
+                if book is not None and book.last_update_id == 26:
+                    break
+                await asyncio.sleep(0.01)
+            engine.stop()
+            await task
+            return engine
+
+    engine = asyncio.run(scenario())
+    book = engine.books['BTCUSDT']
+    assert engine.resyncs['BTCUSDT'] == 1
+    assert book.last_update_id == 26
+    assert book.snapshot(1)['asks'] == [['100.40', '0.7']]
+
+
+def test_get_order_book_reads_local_book(monkeypatch):  # type: ignore
+    engine = OrderBookEngine()
+    book = engine.books.setdefault('BTCUSDT', LocalOrderBook('BTCUSDT'))
+    book.load_snapshot(_snapshot(42))
+    monkeypatch.setattr(data_ingestion, 'local_order_books', engine)
+    ob = data_ingestion.get_order_book('BTCUSDT', limit=1)
+    assert ob == {'bids': [['100.00', '1.0']], 'asks': [['100.50', '1.0']],
+                  'lastUpdateId': 42}
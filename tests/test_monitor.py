@@ -18,3 +18,18 @@ def test_update_order_book_metrics():
     metrics = monitor.get_current_metrics()
     assert 'order_book_spread' in metrics
     assert 'order_book_imbalance' in metrics
+
+
+def test_failed_balance_adds_no_equity_sample():
+    monitor = TradingMonitor(log_file='test.log')
+    monitor.update_metrics(current_balance={'cash': 0.0,
+                                            'asset_holdings': {},
+                                            'error': 'timeout'},
+                           mark_price=65000.0)
+    monitor.update_metrics(current_balance={'cash': 0.0,
+                                            'asset_holdings': {}},
+                           mark_price=65000.0)
+    monitor.update_metrics(current_balance=100.0, mark_price=65000.0)
+    metrics = monitor.get_current_metrics()
+    assert metrics['current_balance'] == 100.0
+    assert metrics['performance']['max_drawdown'] == 0.0
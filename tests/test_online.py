@@ -0,0 +1,45 @@
+import numpy as np
+
+from src.ai.models import AIModel
+from src.ai.online import OnlineTrainer
+
+
+def _model(rng):
+    X = rng.normal(size=(200, 2))
+    model = AIModel(model_params={'n_estimators': 10})
+    model.train(X, (X[:, 0] > 0).astype(int),
+                feature_names=['price_change', 'volume_change'])
+    return model
+
+
+def test_rolling_refit_swaps_model_in_background():
+    rng = np.random.default_rng(1)
+    model = _model(rng)
+    before = model.compiled
+    trainer = OnlineTrainer(model, window=50, refit_every=10,
+                            min_samples=20)
+    X = rng.normal(size=(60, 2))
+    # Regime change: the label now follows the second feature
+    y = (X[:, 1] > 0).astype(int)
+    trainer.seed(X[:40], y[:40])
+    scheduled = [trainer.add_sample({'price_change': a,
+                                     'volume_change': b}, label)
+                 for (a, b), label in zip(X[40:], y[40:])]
+    assert scheduled.count(True) >= 1
+    trainer._pending.result(timeout=30)
+    trainer.close()
+    assert len(trainer) == 50
+    assert trainer.version >= 1 and trainer.last_error is None
+    assert model.compiled is not before
+    assert model.model.n_estimators == 10
+    preds, _ = model.predict_batch(X[40:])
+    assert (preds == y[40:]).mean() > 0.8
+
+
+def test_refit_needs_enough_samples_of_both_classes():
+    rng = np.random.default_rng(2)
+    trainer = OnlineTrainer(_model(rng), window=30, refit_every=5,
+                            min_samples=10)
+    trainer.seed(rng.normal(size=(30, 2)), np.ones(30, dtype=int))
+    assert trainer.refit() is None
+    trainer.close()
@@ -0,0 +1,55 @@
+import numpy as np
+
+from src.data_ingestion.order_book_analytics import (
+    compute_metrics_batch, compute_order_book_metrics, levels_to_arrays,
+    stack_order_books
+)
+
+BOOK = {
+    'bids': [['100.0', '1.0'], ['99.9', '2.0'], ['99.0', '3.0']],
+    'asks': [['100.1', '3.0'], ['100.2', '1.0']],
+    'lastUpdateId': 7
+}
+
+
+def test_levels_to_arrays_parses_once():
+    px, qty = levels_to_arrays(BOOK['bids'], depth=2)
+    assert px.dtype == np.float64 and px.flags['C_CONTIGUOUS']
+    np.testing.assert_array_equal(px, [100.0, 99.9])
+    np.testing.assert_array_equal(qty, [1.0, 2.0])
+    assert levels_to_arrays([])[0].shape == (0,)
+
+
+def test_single_book_metrics():
+    m = compute_order_book_metrics(BOOK)
+    assert m['best_bid'] == 100.0 and m['best_ask'] == 100.1
+    assert np.isclose(m['spread'], 0.1)
+    assert np.isclose(m['imbalance'], (6.0 - 4.0) / 10.0)
+    assert np.isclose(m['vwap_bid'], (100.0 + 199.8 + 297.0) / 6.0)
+    assert np.isclose(m['microprice'], (100.0 * 3.0 + 100.1 * 1.0) / 4.0)
+    assert (m['depth_bid_10bps'], m['depth_ask_10bps']) == (1.0, 3.0)
+    assert (m['depth_bid_50bps'], m['depth_ask_50bps']) == (3.0, 4.0)
+    assert m['lastUpdateId'] == 7
+
+
+def test_empty_book_metrics_are_none():
+    m = compute_order_book_metrics({'bids': [], 'asks': [],
+                                    'lastUpdateId': None})
+    assert m['spread'] is None
+    assert m['imbalance'] is None
+    assert m['vwap_ask'] is None
+
+
+def test_batch_matches_single_books():
+    other = {'bids': [['50.0', '2.0']], 'asks': [], 'lastUpdateId': 8}
+    arrays = stack_order_books([BOOK, other], depth=3)
+    batch = compute_metrics_batch(arrays['bid_px'], arrays['bid_qty'],
+                                  arrays['ask_px'], arrays['ask_qty'])
+    assert batch['cum_bid_qty'].shape == (2, 3)
+    np.testing.assert_array_equal(batch['cum_bid_qty'][0], [1.0, 3.0, 6.0])
+    for i, book in enumerate((BOOK, other)):
+        single = compute_order_book_metrics(book)
+        for key in ('best_bid', 'spread', 'imbalance', 'vwap_bid',
+                    'microprice'):
+            expected = np.nan if single[key] is None else single[key]
+            np.testing.assert_allclose(batch[key][i], expected)
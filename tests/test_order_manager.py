@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+
+from src.execution.order_manager import OrderHandle, OrderManager
+
+
+def _order(order_id, status, executed='0', quote='0', **extra):
+    return {'orderId': order_id, 'symbol': 'BTCUSDT', 'side': 'BUY',
+            'type': 'MARKET', 'origQty': '0.3', 'status': status,
+            'executedQty': executed, 'cummulativeQuoteQty': quote,
+            'transactTime': 1700000000000, **extra}
+
+
+def _report(order_id, status, last_qty, last_price, cum_qty, cum_quote,
+            trade_id):
+    return {'e': 'executionReport', 'i': order_id, 's': 'BTCUSDT',
+            'x': 'TRADE', 'X': status, 'l': last_qty, 'L': last_price,
+            'z': cum_qty, 'Z': cum_quote, 't': trade_id, 'T': 1700000000001}
+
+
+FILLS = [{'price': '65000', 'qty': '0.1', 'tradeId': 10},
+         {'price': '65000', 'qty': '0.1', 'tradeId': 11},
+         {'price': '65500', 'qty': '0.1', 'tradeId': 12}]
+FILLS_VWAP = (65000 + 65000 + 65500) / 3
+
+
+def test_full_response_resolves_with_vwap_over_all_fills():
+    manager = OrderManager()
+    handle = manager.track(_order(1, 'FILLED', '0.3', '19550',
+                                  fills=FILLS), side='buy')
+    assert handle.done()
+    result = handle.result()
+    assert result['status'] == 'success'
+    assert result['price'] == pytest.approx(FILLS_VWAP)
+    assert result['quantity'] == pytest.approx(0.3)
+    assert result['fills'] == 3
+    assert manager.open_orders() == []
+
+
+def test_vwap_from_fills_without_cumulative_quote():
+    order = _order(5, 'FILLED', '0.3', fills=FILLS)
+    del order['cummulativeQuoteQty']
+    handle = OrderManager().track(order, side='buy')
+    assert handle.result(timeout=0)['price'] == pytest.approx(65166.67)
+    assert handle.executed_qty == pytest.approx(0.3)
+
+
+def test_open_order_is_polled_with_backoff_until_filled():
+    responses = [_order(2, 'PARTIALLY_FILLED', '0.1', '6500'),
+                 _order(2, 'FILLED', '0.3', '19800')]
+    polled = []
+
+    def fetch_order(symbol, order_id):
+        polled.append((symbol, order_id))
+        return responses[min(len(polled), len(responses)) - 1]
+    manager = OrderManager(fetch_order, poll_interval=0.01,
+                           max_poll_interval=0.02)
+    handle = manager.track(_order(2, 'NEW'), side='buy')
+    assert handle.to_result()['status'] == 'pending'
+    assert manager.get(2) is handle
+    assert manager.open_orders('BTCUSDT') == [handle]
+    assert manager.open_orders('ETHUSDT') == []
+    finished = threading.Event()
+    handle.add_done_callback(lambda result: finished.set())
+    result = handle.result(timeout=5)
+    assert finished.wait(5)
+    assert polled[:2] == [('BTCUSDT', 2)] * 2
+    assert result['status'] == 'success'
+    assert result['price'] == pytest.approx(66000.0)
+    assert manager.get(2) is None and manager.open_orders() == []
+    manager.close()
+
+
+def test_execution_reports_update_and_finish_orders():
+    manager = OrderManager()
+    # A report can arrive before create_order has returned
+    manager.on_execution_report(
+        _report(3, 'PARTIALLY_FILLED', '0.1', '64000', '0.1', '6400', 20))
+    handle = manager.track(_order(3, 'NEW'), side='buy')
+    assert handle.executed_qty == pytest.approx(0.1)
+    assert not handle.done()
+    # Duplicate delivery is ignored
+    manager.on_execution_report(
+        _report(3, 'PARTIALLY_FILLED', '0.1', '64000', '0.1', '6400', 20))
+    manager.on_execution_report(
+        _report(3, 'FILLED', '0.2', '65000', '0.3', '19400', 21))
+    result = handle.result(timeout=0)
+    assert len(handle.fills) == 2
+    assert result['price'] == pytest.approx(19400 / 0.3)
+    assert manager.open_orders() == []
+
+
+def test_canceled_order_without_fills_fails():
+    manager = OrderManager()
+    handle = manager.track(_order(4, 'NEW'), side='sell')
+    manager.on_execution_report({'e': 'executionReport', 'i': 4,
+                                 'x': 'CANCELED', 'X': 'CANCELED',
+                                 'z': '0', 'Z': '0', 'E': 1700000000002})
+    assert handle.result(timeout=0)['status'] == 'failed'
+    assert handle.result()['order_status'] == 'CANCELED'
+
+
+def test_resolved_handle_keeps_paper_result():
+    result = {'status': 'success', 'order_id': 'sim_order_1',
+              'symbol': 'BTCUSD', 'type': 'buy', 'quantity': 0.01,
+              'price': 65000.0, 'message': 'ok'}
+    handle = OrderHandle.from_result(result)
+    assert handle.done() and handle.to_result() is result
+    assert handle.vwap == pytest.approx(65000.0)
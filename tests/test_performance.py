@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.monitoring.performance import (PerformanceTracker, backtest_stats,
+                                        equity_stats, period_returns,
+                                        round_trip_pnl, trade_pnl,
+                                        trade_stats)
+from src.strategies.backtest import backtest
+from src.strategies.strategy import TradingStrategy
+
+
+def test_trade_stats_keeps_breakeven_out_of_losses():
+    pnl = trade_pnl(['buy', 'sell', 'buy', 'buy'], [100, 200, 150, 50],
+                    [110, 190, 140, 50], [1, 1, 1, 2])
+    np.testing.assert_allclose(pnl, [10, 10, -10, 0])
+    stats = trade_stats(pnl)
+    assert stats['total_pnl'] == 10
+    assert (stats['wins'], stats['losses'], stats['breakeven']) == (2, 1, 1)
+    assert stats['win_rate'] == pytest.approx(2 / 3)
+    assert stats['profit_factor'] == 2.0
+    assert trade_stats([])['win_rate'] == 0.0
+
+
+def test_equity_stats():
+    equity = np.array([100.0, 110.0, 99.0, 108.9])
+    stats = equity_stats(equity, periods_per_year=4,
+                         position=[0, 1, 1, 0], traded_notional=50.0)
+    returns = np.array([0.1, -0.1, 0.1])
+    assert stats['total_return'] == pytest.approx(0.089)
+    assert stats['max_drawdown'] == pytest.approx(-0.1)
+    assert stats['sharpe'] == pytest.approx(
+        returns.mean() / returns.std(ddof=1) * 2)
+    assert stats['sortino'] == pytest.approx(
+        returns.mean() / np.sqrt(0.01 / 3) * 2)
+    assert stats['exposure'] == 0.5
+    assert stats['turnover'] == pytest.approx(50.0 / equity.mean())
+    flat = equity_stats([100.0, 100.0])
+    assert flat['sharpe'] is None and flat['sortino'] is None
+
+
+def test_period_returns():
+    index = pd.date_range('2024-01-01', periods=48, freq='h')
+    equity = pd.Series(np.r_[np.full(24, 100.0), np.full(24, 110.0)],
+                       index=index)
+    returns = period_returns(equity, 'D')
+    np.testing.assert_allclose(returns.to_numpy(), [0.0, 0.1])
+
+
+def test_streaming_matches_batch_on_a_backtest():
+    rng = np.random.default_rng(3)
+    n = 300
+    close = 65000.0 + np.cumsum(rng.normal(0, 150, size=n))
+    bars = pd.DataFrame({'open': close, 'close': close,
+                         'volume': np.ones(n)})
+    result = backtest(bars, TradingStrategy(ai_model=None),
+                      predictions=rng.integers(0, 2, size=n),
+                      quantity=0.01, fee_rate=0.001)
+    batch = backtest_stats(result, 100000.0, periods_per_year=8760)
+
+    tracker = PerformanceTracker(periods_per_year=8760)
+    tracker.update_equity(100000.0)
+    fills = iter(zip(result.trades['bar'], result.trades['side'],
+                     result.trades['price'], result.trades['fee']))
+    fill = next(fills, None)
+    closed = []
+    for i in range(n):
+        while fill is not None and fill[0] == i:
+            closed += tracker.record_fill('buy' if fill[1] > 0 else 'sell',
+                                          fill[2], 0.01, fill[3])
+            fill = next(fills, None)
+        tracker.update_equity(result.cash[i] + tracker.position * close[i])
+    np.testing.assert_allclose(closed, round_trip_pnl(result.trades))
+    stream = tracker.snapshot()
+    for key in ('trades', 'wins', 'losses', 'breakeven', 'win_rate',
+                'total_pnl', 'total_return', 'max_drawdown', 'sharpe',
+                'sortino', 'volatility', 'turnover'):
+        assert stream[key] == pytest.approx(batch[key]), key
+
+
+def test_tracker_closes_lots_fifo_and_flips_position():
+    tracker = PerformanceTracker()
+    tracker.record_fill('buy', 100.0, 1.0)
+    tracker.record_fill('buy', 110.0, 1.0)
+    assert tracker.record_fill('sell', 120.0, 3.0) == [20.0, 10.0]
+    assert tracker.position == -1.0
+    assert tracker.record_fill('buy', 125.0, 1.0) == [-5.0]
+    assert tracker.snapshot()['win_rate'] == pytest.approx(2 / 3)
+
+
+def test_tracker_skips_returns_from_zero_equity():
+    tracker = PerformanceTracker()
+    tracker.update_equity(0.0)  # e.g. a failed balance call
+    tracker.update_equity(100.0)
+    tracker.update_equity(0.0)
+    tracker.update_equity(50.0)
+    stats = tracker.snapshot()
+    # Only 100 -> 0 has a defined return
+    assert stats['mean_return'] == pytest.approx(-1.0)
+    assert stats['max_drawdown'] == pytest.approx(-1.0)
+    assert stats['total_return'] == 0.0
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+from src.data_ingestion.rate_limiter import (PRIORITY_MARKET_DATA,
+                                             PRIORITY_ORDER,
+                                             RateLimitScheduler,
+                                             request_weight)
+
+
+def test_request_weights():
+    assert request_weight('/api/v3/depth', {'limit': 10}) == 5
+    assert request_weight('/api/v3/depth', {'limit': 1000}) == 50
+    assert request_weight('/api/v3/ticker/24hr', {'symbol': 'BTCUSDT'}) == 2
+    assert request_weight('/api/v3/ticker/24hr') == 80
+    assert request_weight('/api/v3/klines', {'limit': 1000}) == 2
+
+
+def test_market_data_cannot_use_order_reserve():
+    limiter = RateLimitScheduler(weight_per_minute=100, order_reserve=0.2)
+    assert limiter.acquire(80, PRIORITY_MARKET_DATA, timeout=0)
+    assert not limiter.acquire(5, PRIORITY_MARKET_DATA, timeout=0.01)
+    assert limiter.acquire(1, PRIORITY_ORDER, is_order=True, timeout=0)
+    stats = limiter.stats()
+    assert stats['requests'] == 2
+    assert stats['throttled'] == 1
+    assert 80 <= stats['weight_used'] <= 81
+    assert stats['orders_10s_used'] >= 1
+
+
+def test_headers_resync_and_rate_limit_pause():
+    limiter = RateLimitScheduler(weight_per_minute=1000)
+    limiter.observe_response(200, {'X-MBX-USED-WEIGHT-1M': '900'})
+    assert limiter.stats()['weight_remaining'] <= 100.5
+    limiter.observe_response(429, {'Retry-After': '30'})
+    assert limiter.stats()['banned_for_seconds'] > 29
+    assert not limiter.acquire(1, PRIORITY_ORDER, timeout=0.01)
+
+
+def test_async_acquire_waits_for_refill():
+    limiter = RateLimitScheduler(weight_per_minute=6000, order_reserve=0)
+    assert limiter.acquire(6000, timeout=0)
+
+    async def scenario():  # type: ignore
+        started = time.monotonic()
+        await limiter.acquire_async(5)
+        return time.monotonic() - started
+
+    waited = asyncio.run(scenario())
+    assert 0.02 <= waited < 1.0
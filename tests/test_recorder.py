@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from src.data_ingestion import get_realtime_data, http_client
+from src.data_ingestion.recorder import (KIND_REST, KIND_STREAM,
+                                         MarketDataRecorder, ReplayEngine,
+                                         ReplayMiss, read_log, rest_channel)
+
+
+def _ticker(price):
+    return {'symbol': 'BTCUSDT', 'lastPrice': str(price), 'volume': '10'}
+
+
+def test_log_round_trip_and_truncated_tail(tmp_path):
+    path = str(tmp_path / 'md.log')
+    with MarketDataRecorder(path) as recorder:
+        recorder.record_stream('ws/btcusdt@ticker', '{"c":"1"}', recv_ns=5)
+        recorder.record_rest('/api/v3/ticker/24hr', {'symbol': 'BTCUSDT'},
+                             _ticker(1), recv_ns=7)
+    with open(path, 'ab') as f:
+        f.write(b'\x01\x02')  # interrupted write
+    records = list(read_log(path))
+    assert [r.kind for r in records] == [KIND_STREAM, KIND_REST]
+    assert records[0].recv_ns == 5 and records[0].payload == b'{"c":"1"}'
+    assert records[1].channel == '/api/v3/ticker/24hr?symbol=BTCUSDT'
+    assert rest_channel('/x', {'b': 2, 'a': 1}) == '/x?a=1&b=2'
+
+
+def test_replay_feeds_ingestion_and_signals_exhaustion(tmp_path):
+    path = str(tmp_path / 'md.log')
+    with MarketDataRecorder(path) as recorder:
+        for i, price in enumerate([100.0, 101.0]):
+            recorder.record_rest('/api/v3/ticker/24hr',
+                                 {'symbol': 'BTCUSD'}, _ticker(price),
+                                 recv_ns=i)
+    exhausted = []
+    with ReplayEngine(path, on_exhausted=exhausted.append) as replay:
+        assert get_realtime_data('BTCUSD')['price'] == 100.0
+        assert get_realtime_data('BTCUSD')['price'] == 101.0
+        assert get_realtime_data('BTCUSD')['price'] is None
+        assert get_realtime_data('BTCUSD')['price'] is None
+    assert http_client.replay_source is None
+    assert exhausted == ['/api/v3/ticker/24hr']
+    assert replay.stats()['served'] == 2
+
+
+def test_strict_replay_requires_matching_params(tmp_path):
+    path = str(tmp_path / 'md.log')
+    with MarketDataRecorder(path) as recorder:
+        recorder.record_rest('/api/v3/depth', {'symbol': 'BTCUSDT'},
+                             {'lastUpdateId': 1}, recv_ns=0)
+    assert ReplayEngine(path).next_rest(
+        '/api/v3/depth', {'symbol': 'ETHUSDT'}) == {'lastUpdateId': 1}
+    with pytest.raises(ReplayMiss):
+        ReplayEngine(path, strict=True).next_rest('/api/v3/depth',
+                                                  {'symbol': 'ETHUSDT'})
+
+
+def test_stream_replay_filters_channels(tmp_path):
+    path = str(tmp_path / 'md.log')
+    with MarketDataRecorder(path) as recorder:
+        recorder.record_stream('wss://x/ws/btcusdt@ticker', 'a', recv_ns=0)
+        recorder.record_stream('wss://x/ws/ethusdt@ticker', 'b', recv_ns=1)
+        recorder.record_stream('wss://x/ws/btcusdt@ticker', 'c', recv_ns=2)
+    seen = []
+    delivered = asyncio.run(ReplayEngine(path).stream(
+        lambda channel, message: seen.append(message),
+        channel_prefix='wss://x/ws/btcusdt'))
+    assert delivered == 2 and seen == ['a', 'c']
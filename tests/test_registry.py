@@ -0,0 +1,83 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from src.ai.models import AIModel
+from src.ai.registry import ModelRegistry, ModelRegistryError
+
+
+def _trained_model(seed=0, feature_names=('a', 'b')):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(200, 2))
+    model = AIModel(model_params={'n_estimators': 10})
+    model.train(X, (X[:, seed % 2] > 0).astype(int),
+                feature_names=list(feature_names))
+    return model, rng
+
+
+def test_register_and_load_memory_mapped(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    model, rng = _trained_model()
+    version = registry.register(model, training_range={'rows': 200},
+                                metrics={'train_accuracy': 1.0})
+    assert version == 1 and registry.active_version() == 1
+    assert registry.register(model, activate=False) == 2
+    assert registry.versions() == [1, 2] and registry.active_version() == 1
+    manifest = registry.manifest(1)
+    assert manifest['feature_names'] == ['a', 'b']
+    assert manifest['training_range'] == {'rows': 200}
+    assert manifest['params']['n_estimators'] == 10
+    assert 'model.joblib' in manifest['files']
+
+    loaded = registry.load()
+    assert isinstance(loaded.compiled.threshold, np.memmap)
+    X = rng.normal(size=(30, 2))
+    np.testing.assert_array_equal(loaded.predict_batch(X)[1],
+                                  model.predict_batch(X)[1])
+
+
+def test_corrupt_artifact_fails_checksum(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    version = registry.register(_trained_model()[0])
+    path = os.path.join(str(tmp_path), f"v{version}", 'compiled',
+                        'threshold.npy')
+    with open(path, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        f.write(b'\x00')
+    with pytest.raises(ModelRegistryError, match='Checksum'):
+        registry.load()
+    with pytest.raises(ModelRegistryError):
+        registry.load(version=7)
+
+
+def test_hot_swap_updates_served_model_in_place(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    first, rng = _trained_model(0)
+    registry.register(first)
+    second = registry.register(_trained_model(1)[0], activate=False)
+    live = registry.load()
+    registry.serve(live, 1)
+    X = rng.normal(size=(100, 2))
+    manifest = registry.swap(second)
+    assert manifest['version'] == second
+    assert registry.served_version == second
+    assert registry.active_version() == second
+    preds, _ = live.predict_batch(X)
+    assert (preds == (X[:, 1] > 0)).mean() > 0.8
+
+
+def test_swap_rejects_other_feature_schema(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    registry.register(_trained_model()[0])
+    other = registry.register(_trained_model(feature_names=('x', 'y'))[0],
+                              activate=False)
+    with pytest.raises(ModelRegistryError, match='running model'):
+        registry.swap(other)
+    registry.serve(registry.load(1), 1)
+    with pytest.raises(ModelRegistryError, match='features'):
+        registry.swap(other)
+    assert registry.active_version() == 1
+    with open(os.path.join(str(tmp_path), 'v1', 'manifest.json')) as f:
+        assert json.load(f)['feature_names'] == ['a', 'b']
@@ -0,0 +1,115 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import src.data_ingestion as data_ingestion
+import src.data_ingestion.tickers as tickers
+from src.runtime import PipelineSpec, TradingRuntime, parse_symbols
+from src.strategies.strategy import StrategyParams, TradingStrategy
+
+
+class _Model:
+    feature_names = ['price_change', 'volume_change']
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay, self.error = delay, error
+
+    def predict(self, row, order_book_metrics=None):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return 1
+
+
+class _Executor:
+    def __init__(self):
+        self.orders = []
+
+    def execute_trade(self, symbol, order_type, quantity):
+        self.orders.append((symbol, order_type))
+        return {'status': 'success', 'symbol': symbol, 'type': order_type,
+                'quantity': quantity, 'price': 100.0}
+
+
+def _patch_market_data(monkeypatch):
+    def history(symbol, limit=100, interval='1h', **kwargs):
+        index = pd.date_range(end=pd.Timestamp.now(), periods=50, freq='h')
+        return pd.DataFrame({'close': np.linspace(100, 110, 50),
+                             'volume': np.ones(50)}, index=index)
+
+    async def batch(symbols, table):
+        for symbol in symbols:
+            table.update(symbol, 100.0, 1.0, timestamp_ns=time.time_ns())
+        return table
+
+    monkeypatch.setattr(data_ingestion, 'get_market_data', history)
+    monkeypatch.setattr(data_ingestion, 'get_order_book_metrics',
+                        lambda symbol, *a, **k: {'spread': 1.0,
+                                                 'imbalance': 0.1})
+    monkeypatch.setattr(tickers, 'async_get_realtime_data_batch', batch)
+
+
+def test_slow_or_failing_pipelines_do_not_stall_others(monkeypatch):
+    _patch_market_data(monkeypatch)
+    params = StrategyParams(buy_below=1e9)
+    specs = [PipelineSpec(symbol, TradingStrategy(model, params))
+             for symbol, model in (('GOODUSDT', _Model()),
+                                   ('SLOWUSDT', _Model(delay=2.0)),
+                                   ('BADUSDT', _Model(error=ValueError()))
+                                   )]
+    executor = _Executor()
+    runtime = TradingRuntime(specs, executor, step_timeout=0.3,
+                             min_decision_seconds=0.0, poll_interval=0.05)
+    stop = threading.Event()
+    thread = runtime.start_background(stop, stream=False)
+    time.sleep(1.5)
+    stop.set()
+    thread.join(5)
+    assert not thread.is_alive()
+    # Let the slow step run past its 2s delay: it must not trade late
+    runtime._pool.shutdown(wait=True)
+    stats = runtime.snapshot()
+    assert stats['GOODUSDT']['orders'] >= 3
+    assert stats['GOODUSDT']['errors'] == 0
+    assert stats['GOODUSDT']['performance']['position'] > 0
+    assert stats['SLOWUSDT']['timeouts'] == 1
+    assert stats['SLOWUSDT']['orders'] == 0
+    assert stats['BADUSDT']['errors'] >= 1
+    assert stats['BADUSDT']['backoff_seconds'] > 0
+    assert {symbol for symbol, _ in executor.orders} == {'GOODUSDT'}
+
+
+class _LiveExecutor(_Executor):
+    mode = 'live'
+
+    def execute_trade(self, symbol, order_type, quantity):
+        if symbol == 'SLOWUSDT':
+            time.sleep(1.0)  # e.g. waiting on the rate limiter
+        return super().execute_trade(symbol, order_type, quantity)
+
+
+def test_slow_live_order_does_not_block_other_pipelines(monkeypatch):
+    _patch_market_data(monkeypatch)
+    params = StrategyParams(buy_below=1e9)
+    specs = [PipelineSpec(symbol, TradingStrategy(_Model(), params))
+             for symbol in ('GOODUSDT', 'SLOWUSDT')]
+    runtime = TradingRuntime(specs, _LiveExecutor(), step_timeout=0.3,
+                             min_decision_seconds=0.0, poll_interval=0.05)
+    stop = threading.Event()
+    thread = runtime.start_background(stop, stream=False)
+    time.sleep(1.5)
+    stop.set()
+    thread.join(5)
+    runtime._pool.shutdown(wait=True)
+    stats = runtime.snapshot()
+    assert stats['GOODUSDT']['orders'] >= 3
+    assert stats['GOODUSDT']['timeouts'] == 0
+    assert stats['SLOWUSDT']['timeouts'] >= 1
+
+
+def test_parse_symbols():
+    assert parse_symbols('btcusd:btcusdt, ETHUSDT,') == [
+        {'symbol': 'BTCUSD', 'book_symbol': 'BTCUSDT'},
+        {'symbol': 'ETHUSDT', 'book_symbol': 'ETHUSDT'}]
@@ -0,0 +1,55 @@
+import src.data_ingestion as data_ingestion
+from src.data_ingestion.snapshot_cache import OrderBookSnapshotCache
+
+
+def _book(update_id):  # type: ignore
+    return {
+        'bids': [['100.0', '1.0'], ['99.0', '2.0']],
+        'asks': [['101.0', '1.5'], ['102.0', '0.5']],
+        'lastUpdateId': update_id
+    }
+
+
+def test_cache_hit_ttl_and_eviction(monkeypatch):  # type: ignore
+    clock = [0.0]
+    monkeypatch.setattr('src.data_ingestion.snapshot_cache.time.monotonic',
+                        lambda: clock[0])
+    cache = OrderBookSnapshotCache(max_entries=2, ttl_seconds=5.0)
+    cache.put('btcusdt', 10, _book(1))
+    assert cache.get('BTCUSDT', 10)['lastUpdateId'] == 1
+    assert cache.get('BTCUSDT', 10, min_update_id=2) is None
+    cache.put('BTCUSDT', 10, _book(3))
+    cache.put('ETHUSDT', 10, _book(1))
+    cache.put('BNBUSDT', 10, _book(1))
+    assert len(cache) == 2
+    assert cache.get('BTCUSDT', 10) is None
+    clock[0] = 10.0
+    assert cache.get('BNBUSDT', 10) is None
+
+
+def test_put_keeps_newer_snapshot():
+    cache = OrderBookSnapshotCache()
+    cache.put('BTCUSDT', 10, _book(5))
+    kept = cache.put('BTCUSDT', 10, _book(4))
+    assert kept['lastUpdateId'] == 5
+
+
+def test_metrics_share_one_fetch_per_cycle(monkeypatch):  # type: ignore
+    calls = []
+
+    def fake_get_order_book(symbol, limit):  # type: ignore
+        calls.append((symbol, limit))
+        return _book(len(calls))
+
+    monkeypatch.setattr(data_ingestion, 'get_order_book',
+                        fake_get_order_book)
+    data_ingestion.order_book_cache.invalidate()
+    first = data_ingestion.get_order_book_metrics('BTCUSDT', 10)
+    second = data_ingestion.get_order_book_metrics('BTCUSDT', 10)
+    spread = data_ingestion.get_order_book_spread('BTCUSDT', 10)
+    assert first is second
+    assert spread['spread'] == 1.0
+    assert len(calls) == 1
+    data_ingestion.order_book_cache.invalidate('BTCUSDT')
+    data_ingestion.get_order_book_metrics('BTCUSDT', 10)
+    assert len(calls) == 2
@@ -0,0 +1,13 @@
+from src.startup_benchmark import TARGETS, measure
+
+
+def test_server_import_skips_heavy_subsystems():
+    result = measure(TARGETS['server'])
+    assert result['heavy_modules'] == []
+    assert result['import_seconds'] > 0 and result['max_rss_mb'] > 0
+
+
+def test_bot_import_defers_model_and_exchange_client():
+    heavy = measure(TARGETS['bot'])['heavy_modules']
+    assert 'sklearn' not in heavy and 'joblib' not in heavy
+    assert 'binance' not in heavy
@@ -31,3 +31,16 @@ def test_evaluate_performance():
     perf = strategy.evaluate_performance(trades)  # type: ignore
     assert 'profit' in perf
     assert 'win_rate' in perf
+
+
+def test_evaluate_performance_breakeven_is_not_a_loss():
+    strategy = TradingStrategy(ai_model=None)
+    trades = [  # type: ignore
+        {'type': 'buy', 'entry_price': 100, 'exit_price': 110, 'quantity': 1},
+        {'type': 'buy', 'entry_price': 100, 'exit_price': 100, 'quantity': 1},
+        {'type': 'sell', 'entry_price': 100, 'exit_price': 104, 'quantity': 1},
+    ]
+    perf = strategy.evaluate_performance(trades)  # type: ignore
+    assert perf['profit'] == 6
+    assert perf['win_rate'] == 0.5
+    assert perf['breakeven'] == 1
@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.monitoring.performance import backtest_stats
+from src.strategies.backtest import backtest
+from src.strategies.strategy import (BUY, HOLD, SELL, StrategyParams,
+                                     TradingStrategy)
+from src.strategies.sweep import sweep
+
+SPACE = {'buy_below': [64000.0, 66000.0], 'sell_above': [63000.0, 65000.0]}
+
+
+def _history(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 65000.0 + np.cumsum(rng.normal(0, 200, size=n))
+    bars = pd.DataFrame({'open': close, 'close': close,
+                         'volume': np.ones(n)},
+                        index=pd.date_range('2024-01-01', periods=n,
+                                            freq='h'))
+    return bars, rng.integers(0, 2, size=n)
+
+
+def test_params_replace_hardcoded_thresholds():
+    strategy = TradingStrategy(ai_model=None, params=StrategyParams(
+        buy_below=50000.0, max_spread=1.0))
+    assert strategy.make_decision({'price': 60000}, 1,
+                                  order_book_metrics={'spread': 2.0,
+                                                      'imbalance': 1.0}
+                                  ) == 'hold'
+    np.testing.assert_array_equal(
+        strategy.decide_batch([60000.0, 40000.0, 65000.0], [1, 1, 0],
+                              [2.0, 2.0, 0.5], [1.0, 1.0, -1.0]),
+        [HOLD, BUY, SELL])
+
+
+def test_sweep_matches_single_backtests():
+    bars, predictions = _history()
+    table = sweep(bars, SPACE, predictions=predictions, max_workers=2)
+    assert len(table) == 4
+    assert table['total_return'].is_monotonic_decreasing
+    for row in table.to_dict('records'):
+        params = StrategyParams(**{f: row[f]
+                                   for f in StrategyParams._fields})
+        result = backtest(bars, TradingStrategy(None, params),
+                          predictions=predictions)
+        assert row['final_equity'] == pytest.approx(
+            backtest_stats(result, 100000.0)['final_equity'])
+
+
+def test_sweep_resumes_from_checkpoint(tmp_path):
+    bars, predictions = _history()
+    path = str(tmp_path / 'sweep.jsonl')
+    first = sweep(bars, SPACE, predictions=predictions, n_iter=2,
+                  max_workers=1, checkpoint_path=path)
+    assert len(first) == 2
+    with open(path) as f:
+        assert len(f.read().splitlines()) == 3  # header + 2 rows
+    full = sweep(bars, SPACE, predictions=predictions, max_workers=1,
+                 checkpoint_path=path)
+    assert len(full) == 4
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 5  # only the missing two were run
+    assert len({json.dumps(json.loads(line)['params'], sort_keys=True)
+                for line in lines[1:]}) == 4
+    with pytest.raises(ValueError):
+        sweep(bars, SPACE, predictions=predictions, fee_rate=0.001,
+              checkpoint_path=path)
+
+
+def test_sweep_rejects_unknown_parameters():
+    bars, predictions = _history(10)
+    with pytest.raises(ValueError):
+        sweep(bars, {'stop_loss': [0.01]}, predictions=predictions)
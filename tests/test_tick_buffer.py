@@ -0,0 +1,31 @@
+import numpy as np
+
+from src.data_ingestion.tick_buffer import TickRingBuffer, TickStore
+from src.data_ingestion.tickers import TickerTable
+
+
+def test_ring_buffer_wraps_with_contiguous_views():
+    buf = TickRingBuffer(capacity=4)
+    assert buf.latest() is None
+    for i in range(10):
+        buf.append(100.0 + i, float(i), timestamp_ns=i)
+    assert len(buf) == 4 and buf.total_appended == 10
+    ts, price, volume = buf.window()
+    np.testing.assert_array_equal(ts, [6, 7, 8, 9])
+    np.testing.assert_array_equal(price, [106.0, 107.0, 108.0, 109.0])
+    assert price.base is not None and not price.flags.writeable
+    np.testing.assert_array_equal(buf.prices(2), [108.0, 109.0])
+    assert buf.latest() == (9, 109.0, 9.0)
+    assert buf._price.nbytes == 8 * 8
+
+
+def test_tick_store_appends_ticker_table():
+    table = TickerTable()
+    table.update('BTCUSDT', 65000.0, 10.0, timestamp_ns=1)
+    table.update('ETHUSDT', 3000.0, 20.0, timestamp_ns=2)
+    store = TickStore(capacity=8)
+    store.append_table(table)
+    store.append('btcusdt', 65001.0, 11.0, timestamp_ns=3)
+    assert sorted(store) == ['BTCUSDT', 'ETHUSDT']
+    np.testing.assert_array_equal(store.buffer('BTCUSDT').prices(),
+                                  [65000.0, 65001.0])
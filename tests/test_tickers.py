@@ -0,0 +1,57 @@
+import numpy as np
+
+from src.data_ingestion import tickers
+from src.data_ingestion.tickers import TickerTable, get_realtime_data_batch
+
+
+def _rest_row(symbol, price):  # type: ignore
+    return {'symbol': symbol, 'lastPrice': str(price), 'volume': '10.0',
+            'quoteVolume': str(price * 10), 'closeTime': 1700000000000}
+
+
+def test_table_grows_and_filters():
+    table = TickerTable(capacity=2)
+    for i in range(5):
+        table.update(f'SYM{i}USDT', 100.0 + i, 1.0 + i, timestamp_ns=i)
+    assert len(table) == 5 and 'sym3usdt' in table
+    table.update('SYM1USDT', 50.0, 2.0, timestamp_ns=9)
+    assert table.get('SYM1USDT')['price'] == 50.0
+    subset = table.filter(['SYM4USDT', 'SYM1USDT', 'MISSING'])
+    assert subset.symbols == ['SYM4USDT', 'SYM1USDT']
+    np.testing.assert_array_equal(subset.price[:2], [104.0, 50.0])
+    assert list(subset.to_frame().index) == ['SYM4USDT', 'SYM1USDT']
+
+
+def test_stream_messages_update_table():
+    table = TickerTable()
+    combined = {'stream': 'btcusdt@miniTicker',
+                'data': {'e': '24hrMiniTicker', 'E': 1700000000123,
+                         's': 'BTCUSDT', 'c': '65000.1', 'v': '12.5',
+                         'q': '812501.25'}}
+    assert table.update_from_stream(combined) == 1
+    all_market = [{'E': 1, 's': 'ETHUSDT', 'c': '3000', 'v': '5'},
+                  {'E': 1, 's': 'BNBUSDT', 'c': '600', 'v': '7'}]
+    assert table.update_from_stream(all_market) == 2
+    assert table.get('BTCUSDT')['volume'] == 12.5
+    assert table.timestamp_ns[table.index['BTCUSDT']] == \
+        1700000000123 * 1_000_000
+
+
+def test_batch_uses_one_request(monkeypatch):  # type: ignore
+    calls = []
+
+    def fake_get_json(path, params=None):  # type: ignore
+        calls.append((path, params))
+        rows = [_rest_row('BTCUSDT', 65000.0), _rest_row('ETHUSDT', 3000.0),
+                _rest_row('XRPUSDT', 0.5)]
+        return rows if params is None else rows[:2]
+
+    monkeypatch.setattr(tickers, 'get_json', fake_get_json)
+    table = get_realtime_data_batch(['btcusdt', 'ETHUSDT'])
+    assert calls == [('/api/v3/ticker/24hr',
+                      {'symbols': '["BTCUSDT","ETHUSDT"]'})]
+    assert table.get('ETHUSDT')['price'] == 3000.0
+    many = [f'S{i}' for i in range(150)] + ['XRPUSDT']
+    table = get_realtime_data_batch(many)
+    assert calls[-1] == ('/api/v3/ticker/24hr', None)
+    assert table.symbols == ['XRPUSDT']
@@ -0,0 +1,52 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.ai.models import AIModel
+from src.ai.training import (SharedArray, purged_kfold_splits, search,
+                             walk_forward_splits)
+
+
+def test_walk_forward_splits_never_look_ahead():
+    splits = walk_forward_splits(100, n_splits=4, embargo=2)
+    assert [test for _, test in splits] == \
+        [(20, 40), (40, 60), (60, 80), (80, 100)]
+    for train, (start, _) in splits:
+        assert train == [(0, start - 2)]
+    with pytest.raises(ValueError):
+        walk_forward_splits(3, n_splits=5)
+
+
+def test_purged_kfold_drops_rows_around_test_block():
+    splits = purged_kfold_splits(100, n_splits=4, purge=3, embargo=2)
+    assert splits[0] == ([(27, 100)], (0, 25))
+    assert splits[1] == ([(0, 22), (52, 100)], (25, 50))
+    assert splits[3] == ([(0, 72)], (75, 100))
+
+
+def test_shared_array_round_trip():
+    data = np.arange(12.0).reshape(3, 4)
+    with SharedArray(data) as shared:
+        name, shape, dtype = shared.spec
+        assert shape == (3, 4) and np.dtype(dtype) == data.dtype
+        view = np.ndarray(shape, dtype, buffer=shared.shm.buf)
+        np.testing.assert_array_equal(view, data)
+
+
+def test_search_writes_report(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 3))
+    y = (X[:, 0] > 0).astype(int)
+    path = tmp_path / 'report.json'
+    report = search(X, y, param_grid={'n_estimators': [5, 10],
+                                      'max_depth': [2, None]},
+                    n_iter=3, cv='purged_kfold', n_splits=3, purge=1,
+                    max_workers=2, report_path=str(path))
+    assert len(report['candidates']) == 3
+    assert all(len(c['folds']) == 3 for c in report['candidates'])
+    assert report['best_mean_accuracy'] > 0.8
+    assert json.loads(path.read_text())['best_params'] == \
+        report['best_params']
+    model = AIModel(model_params=report['best_params'])
+    assert model.model.n_estimators == report['best_params']['n_estimators']